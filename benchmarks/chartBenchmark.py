@@ -0,0 +1,94 @@
+"""
+Compares the legacy serial chart path (pyplot + PNG on disk) with the in-memory chart renderer.
+
+Run from the repository root:
+    python -m benchmarks.chartBenchmark --locations 60 --tables 2
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from monitoring.chartRenderer import DEFAULT_CHART_PROFILE, render_charts, shutdown_chart_executor
+
+
+AIR_POLLUTANTS = ["CO", "O3", "NO2", "SO2", "PM2.5", "PM10"]
+
+
+def build_specs(num_locations, num_tables):
+    """Builds synthetic air quality chart specs (one per pollutant per table)."""
+    locations = [f"ML-{i:02d}" for i in range(1, num_locations + 1)]
+    specs = []
+    for _ in range(num_tables):
+        for pollutant in AIR_POLLUTANTS:
+            specs.append({
+                "monitoring_type": "Air Quality",
+                "pollutant": pollutant,
+                "locations": locations,
+                "values": [random.uniform(10, 300) for _ in locations],
+                "standard": 200,
+                "y_axis_label": "Concentration (μg/m³)"
+            })
+    return specs
+
+
+def legacy_render(specs, profile):
+    """The original insert_charts path: pyplot figure, savefig to a PNG file, read it back, delete it."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    outputs = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for spec in specs:
+            fig, ax = plt.subplots(figsize=(profile["width"], profile["height"]))
+            ax.bar(spec["locations"], spec["values"], color='#1f77b4', width=0.4, label=f"{spec['pollutant']} Levels")
+            ax.axhline(y=spec["standard"], color='red', linestyle='--', linewidth=2)
+            ax.set_xlabel("Monitoring Locations")
+            ax.set_ylabel(spec["y_axis_label"])
+            ax.set_title(f"{spec['monitoring_type']} - {spec['pollutant']} Levels")
+            ax.legend()
+
+            filename = os.path.join(tmp_dir, f"{spec['pollutant']}_levels.png")
+            plt.savefig(filename, dpi=profile["dpi"], bbox_inches='tight')
+            plt.close(fig)
+            with open(filename, "rb") as file:
+                outputs.append(file.read())
+            os.remove(filename)
+    return outputs
+
+
+def time_it(label, func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:8.3f} s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chart rendering benchmark")
+    parser.add_argument("--locations", type=int, default=60)
+    parser.add_argument("--tables", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--dpi", type=int, default=DEFAULT_CHART_PROFILE["dpi"])
+    args = parser.parse_args()
+
+    profile = dict(DEFAULT_CHART_PROFILE, dpi=args.dpi)
+    specs = build_specs(args.locations, args.tables)
+    print(f"{len(specs)} charts, {args.locations} locations, {args.dpi} dpi, {args.workers} worker(s)")
+
+    legacy = time_it("legacy serial (pyplot + file)", legacy_render, specs, profile)
+    serial = time_it("renderer serial (in-memory)", render_charts, specs, profile, 1)
+
+    # Warm the pool once so worker start-up is not billed to a single report
+    render_charts(specs[:2], profile, args.workers)
+    pooled = time_it(f"renderer pool ({args.workers} workers)", render_charts, specs, profile, args.workers)
+    shutdown_chart_executor()
+
+    print(f"speedup vs legacy: serial x{legacy / serial:.2f}, pool x{legacy / pooled:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Measures module import (start-up) time in fresh interpreters and which heavy dependencies each import pulls in.
+
+Run from the repository root:
+    python -m benchmarks.importBenchmark --repeat 5
+    python -m benchmarks.importBenchmark --baseline HEAD~1    # compare with an earlier commit
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+
+MODULES = ["monitoring.monitoringReport", "monitoring.batchReport", "chlorisUI"]
+HEAVY_MODULES = ["pandas", "numpy", "matplotlib", "docx", "PIL", "gradio"]
+
+# Runs in a fresh interpreter: import one module, report seconds and the heavy modules it loaded
+IMPORT_PROBE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+importlib.import_module({module!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+# Import plus one full report (the cost a CLI run or a fresh worker pays before its first output)
+REPORT_PROBE = """
+import json, os, tempfile, time
+start = time.perf_counter()
+from monitoring.monitoringReport import generate_report
+with tempfile.TemporaryDirectory() as tmp_dir:
+    import contextlib, io
+    with contextlib.redirect_stdout(io.StringIO()):
+        generate_report(None, os.path.join(tmp_dir, "report.docx"))
+print(json.dumps({"seconds": time.perf_counter() - start, "heavy": []}))
+"""
+
+
+def run_probe(code, tree, repeat):
+    """Runs `code` `repeat` times in fresh interpreters rooted at `tree`; returns (median seconds, heavy modules)."""
+    timings = []
+    heavy = []
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, "-c", code], cwd=tree, capture_output=True, text=True,
+                                   env=dict(os.environ, PYTHONPATH=tree))
+        if completed.returncode != 0:
+            return None, completed.stderr.strip().splitlines()[-1:]
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        timings.append(result["seconds"])
+        heavy = result["heavy"]
+    return statistics.median(timings), heavy
+
+
+def measure(tree, repeat, modules, include_report):
+    results = {}
+    for module in modules:
+        results[module] = run_probe(IMPORT_PROBE.format(module=module, heavy=HEAVY_MODULES), tree, repeat)
+    if include_report:
+        results["first report (import + generate)"] = run_probe(REPORT_PROBE, tree, repeat)
+    return results
+
+
+def export_tree(ref, destination):
+    """Extracts the tree at git `ref` into `destination` (untracked sample data is linked in)."""
+    archive = subprocess.run(["git", "archive", "--format=tar", ref], capture_output=True, check=True).stdout
+    with tempfile.TemporaryFile() as file:
+        file.write(archive)
+        file.seek(0)
+        with tarfile.open(fileobj=file) as tar:
+            tar.extractall(destination)
+
+    test_data = os.path.abspath(os.path.join("monitoring", "test_data"))
+    if os.path.isdir(test_data) and not os.path.exists(os.path.join(destination, "monitoring", "test_data")):
+        os.symlink(test_data, os.path.join(destination, "monitoring", "test_data"))
+
+
+def print_results(label, results):
+    print(f"\n{label}")
+    for name, (seconds, heavy) in results.items():
+        if seconds is None:
+            print(f"  {name:<36} failed: {' '.join(heavy)}")
+        else:
+            loaded = ", ".join(heavy) if heavy else "-"
+            print(f"  {name:<36} {seconds * 1000:9.1f} ms   heavy modules: {loaded}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per measurement (median)")
+    parser.add_argument("--baseline", metavar="REF", help="Git ref to compare against, e.g. HEAD~1")
+    parser.add_argument("--no-report", action="store_true", help="Skip the import + first report measurement")
+    args = parser.parse_args()
+
+    tree = os.getcwd()
+    current = measure(tree, args.repeat, MODULES, not args.no_report)
+    print_results(f"current tree ({args.repeat} run(s), median)", current)
+
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as baseline_tree:
+            export_tree(args.baseline, baseline_tree)
+            baseline = measure(baseline_tree, args.repeat, MODULES, not args.no_report)
+        print_results(f"baseline {args.baseline}", baseline)
+
+        print("\nspeedup vs baseline")
+        for name, (seconds, _) in current.items():
+            before = baseline.get(name, (None, None))[0]
+            if seconds and before:
+                print(f"  {name:<36} x{before / seconds:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+End-to-end report generation benchmark on synthetic projects, with per-stage timings and peak memory.
+
+Each case synthesises a project with N monitoring locations, M readings per location (air and noise),
+K site photos and every parameter section, then generates the Word report in a fresh interpreter.
+
+Run from the repository root:
+    python -m benchmarks.reportBenchmark --case 2:4:2 --case 10:96:10 --repeat 3 --output bench.json
+    python -m benchmarks.reportBenchmark --compare before.json after.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+DEFAULT_CASES = ["2:4:2", "10:48:10", "30:96:30"]
+REPORT_PARAMETERS = "Air, Noise"
+
+# Stage -> monitoringReport function whose (exclusive) time is billed to it
+STAGE_FUNCTIONS = {
+    "structure": "get_report_plan",
+    "readings": "bind_raw_readings",
+    "parse": "bind_monitoring_tables",
+    "exceedances": "evaluate_exceedances",
+    "document": "add_table_of_contents",
+    "sections": "add_section",
+    "tables": "insert_tables",
+    "charts": "insert_charts",
+    "images": "insert_images_and_graphs",
+    "package": "deduplicate_media",
+    "save": "save_document",
+}
+
+
+def parse_case(text):
+    locations, readings, photos = (int(part) for part in text.split(":"))
+    return {"locations": locations, "readings": readings, "photos": photos}
+
+
+def synthesize_images(directory, count, seed):
+    """Writes `count` noisy 1600x1200 site photos (JPEG) and a 2000x1400 location map (PNG)."""
+    from PIL import Image
+
+    rng = random.Random(seed)
+    paths = []
+    for index in range(count):
+        path = os.path.join(directory, f"site_{index:03d}.jpg")
+        image = Image.effect_noise((1600, 1200), 64).convert("RGB")
+        image.paste((rng.randrange(256), rng.randrange(256), rng.randrange(256)), (0, 0, 800, 600))
+        image.save(path, quality=90)
+        paths.append(path)
+
+    map_path = os.path.join(directory, "map.png")
+    Image.effect_noise((2000, 1400), 32).convert("RGB").save(map_path)
+    return map_path, paths
+
+
+def synthesize_project(case, directory, seed=0):
+    """Builds report placeholders for a synthetic project described by `case`."""
+    rng = random.Random(seed)
+    locations = [f"ML-{index:02d}" for index in range(1, case["locations"] + 1)]
+    map_path, photo_paths = synthesize_images(directory, case["photos"], seed)
+
+    start = datetime(2024, 12, 1)
+    air = [["Monitoring Location", "Time", "CO", "O3", "NO2", "SO2", "PM2.5", "PM10"]]
+    noise = [["Monitoring Location", "Time", "EQ", "Max", "AE", "10", "50", "90"]]
+    for location in locations:
+        for reading in range(case["readings"]):
+            time_text = (start + timedelta(minutes=30 * reading)).strftime("%d/%m/%Y %H:%M")
+            air.append([location, time_text] + [f"{rng.uniform(5, 400):.1f}" for _ in range(6)])
+            leq = rng.uniform(45, 80)
+            noise.append([location, time_text, f"{leq:.1f}", f"{leq + rng.uniform(5, 20):.1f}",
+                          f"{leq + 30:.1f}", f"{leq + 3:.1f}", f"{leq - 1:.1f}", f"{leq - 6:.1f}"])
+
+    return {
+        "consultancy_name": "Benchmark Consulting",
+        "contractor_name": "Benchmark Contractor",
+        "project_location": "Benchmark Site",
+        "project_name": "Synthetic Project",
+        "project_number": "PR0000001",
+        "reference_number": "BENCH-001",
+        "report_frequency": "Weekly",
+        "report_date": "01 Dec 2024",
+        "report_number": "1st",
+        "report_parameters": REPORT_PARAMETERS,
+        "monitoring_frequency": "30 mins",
+        "monitoring_locations": [["Monitoring Location", "Description", "Latitude", "Longitude"]] +
+                                [[location, f"Location {location}", f"{26 + rng.random():.6f}°",
+                                  f"{36 + rng.random():.6f}°"] for location in locations],
+        "monitoring_location_map": map_path,
+        "monitoring_location_images": {f"ML-{index:02d}": path for index, path in enumerate(photo_paths, start=1)},
+        "air_monitoring_data": air,
+        "noise_monitoring_data": noise,
+    }
+
+
+class StageTimer:
+    """Wraps monitoringReport stage functions; each stage is billed its exclusive (self) time."""
+
+    def __init__(self, module, stage_functions):
+        self.module = module
+        self.totals = dict.fromkeys(stage_functions, 0.0)
+        self._stack = []
+        self._originals = {}
+        for stage, name in stage_functions.items():
+            self._originals[name] = getattr(module, name)
+            setattr(module, name, self._wrap(stage, self._originals[name]))
+
+    def _wrap(self, stage, func):
+        def timed(*args, **kwargs):
+            self._stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                child_time = self._stack.pop()
+                self.totals[stage] += elapsed - child_time
+                if self._stack:
+                    self._stack[-1] += elapsed
+        return timed
+
+    def restore(self):
+        for name, func in self._originals.items():
+            setattr(self.module, name, func)
+
+
+def run_case(case, warm):
+    """Generates one synthetic report in this process and returns its measurements."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        placeholders = synthesize_project(case, tmp_dir)
+
+        import_start = time.perf_counter()
+        from monitoring import monitoringReport
+        from monitoring.reportPlan import _compile_cached
+        import_seconds = time.perf_counter() - import_start
+
+        monitoringReport.CONSTANTS["cache_dir"] = os.path.join(tmp_dir, "cache")
+        if warm:
+            monitoringReport.generate_report(dict(placeholders), os.path.join(tmp_dir, "warmup.docx"))
+        else:
+            _compile_cached.cache_clear()
+
+        timer = StageTimer(monitoringReport, STAGE_FUNCTIONS)
+        report_path = os.path.join(tmp_dir, "report.docx")
+        start = time.perf_counter()
+        monitoringReport.generate_report(dict(placeholders), report_path)
+        total = time.perf_counter() - start
+        timer.restore()
+
+        stages = {stage: round(seconds, 4) for stage, seconds in timer.totals.items()}
+        stages["other"] = round(total - sum(timer.totals.values()), 4)
+        return {
+            "total_seconds": round(total, 4),
+            "import_seconds": round(import_seconds, 4),
+            "stages": stages,
+            "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            "report_bytes": os.path.getsize(report_path),
+            "table_rows": len(placeholders["air_monitoring_data"]) + len(placeholders["noise_monitoring_data"]) - 2,
+        }
+
+
+def run_case_isolated(case, warm):
+    """Runs a case in a fresh interpreter so peak memory and import state are per-case."""
+    completed = subprocess.run([sys.executable, "-m", "benchmarks.reportBenchmark", "--worker",
+                                json.dumps({"case": case, "warm": warm})],
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarise(runs):
+    """Median of each measurement across repeats (peak memory: max)."""
+    return {
+        "total_seconds": round(statistics.median(run["total_seconds"] for run in runs), 4),
+        "import_seconds": round(statistics.median(run["import_seconds"] for run in runs), 4),
+        "stages": {stage: round(statistics.median(run["stages"][stage] for run in runs), 4)
+                   for stage in runs[0]["stages"]},
+        "peak_rss_mb": max(run["peak_rss_mb"] for run in runs),
+        "report_bytes": runs[0]["report_bytes"],
+        "table_rows": runs[0]["table_rows"],
+        "repeats": len(runs),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def case_label(case):
+    return f"{case['locations']}:{case['readings']}:{case['photos']}"
+
+
+def print_summary(label, result):
+    stages = "  ".join(f"{stage} {seconds:.3f}" for stage, seconds in result["stages"].items())
+    print(f"{label:<12} total {result['total_seconds']:7.3f} s  peak {result['peak_rss_mb']:7.1f} MB  "
+          f"rows {result['table_rows']:>7}  | {stages}", flush=True)
+
+
+def compare(before_path, after_path):
+    """Prints per-case, per-stage changes between two result files."""
+    with open(before_path, encoding="utf-8") as file:
+        before = {case["label"]: case for case in json.load(file)["cases"]}
+    with open(after_path, encoding="utf-8") as file:
+        after = json.load(file)["cases"]
+
+    for case in after:
+        old = before.get(case["label"])
+        if old is None:
+            continue
+        print(f"{case['label']}: total {old['total_seconds']:.3f} -> {case['total_seconds']:.3f} s "
+              f"(x{old['total_seconds'] / case['total_seconds']:.2f}), "
+              f"peak {old['peak_rss_mb']:.1f} -> {case['peak_rss_mb']:.1f} MB")
+        for stage, seconds in case["stages"].items():
+            old_seconds = old["stages"].get(stage)
+            if old_seconds is not None:
+                print(f"    {stage:<12} {old_seconds:8.3f} -> {seconds:8.3f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report generation benchmark")
+    parser.add_argument("--case", action="append", metavar="N:M:K",
+                        help=f"locations:readings per location:site photos (default: {' '.join(DEFAULT_CASES)})")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case (median reported)")
+    parser.add_argument("--warm", action="store_true", help="Measure a second report with warm plan/chart/image caches")
+    parser.add_argument("--output", metavar="FILE", help="Write results as JSON")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Compare two result files")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        spec = json.loads(args.worker)
+        print(json.dumps(run_case(spec["case"], spec["warm"])))
+        return
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    cases = [parse_case(text) for text in (args.case or DEFAULT_CASES)]
+    results = []
+    for case in cases:
+        summary = summarise([run_case_isolated(case, args.warm) for _ in range(args.repeat)])
+        summary.update(label=case_label(case), **case)
+        print_summary(summary["label"], summary)
+        results.append(summary)
+
+    document = {
+        "benchmark": "report_generation",
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "warm": args.warm,
+        "cases": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(document, file, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Measures monitoring data store bulk inserts and indexed range queries on a synthetic year of readings.
+
+Run from the repository root:
+    python -m benchmarks.storeBenchmark --locations 10 --weeks 52 --interval 15min
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from monitoring.dataStore import KIND_PARAMETERS, MonitoringStore
+
+
+def synthesize_readings(locations, weeks, interval, seed=0):
+    """Typed air readings frame: `locations` loggers sampling every `interval` for `weeks` weeks."""
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range("2024-01-01", periods=int(pd.Timedelta(weeks=weeks) / pd.Timedelta(interval)),
+                               freq=interval)
+    parameters = list(KIND_PARAMETERS["air"])
+    frames = []
+    for index in range(locations):
+        frame = pd.DataFrame(rng.uniform(5, 400, (len(timestamps), len(parameters))).astype(np.float32),
+                             columns=parameters)
+        frame.insert(0, "timestamp", timestamps)
+        frame.insert(0, "location", f"ML-{index + 1:02d}")
+        frames.append(frame)
+    readings = pd.concat(frames, ignore_index=True)
+    readings["location"] = readings["location"].astype("category")
+    return readings
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monitoring data store benchmark")
+    parser.add_argument("--locations", type=int, default=10)
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--interval", default="15min", help="Sample interval (pandas offset alias)")
+    args = parser.parse_args()
+
+    readings = synthesize_readings(args.locations, args.weeks, args.interval)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = MonitoringStore(os.path.join(tmp_dir, "store.sqlite3"))
+
+        seconds, written = timed(store.insert_readings, "BENCH", "air", readings)
+        print(f"bulk insert      {written:>10} values  {seconds:8.3f} s  ({written / seconds:,.0f} values/s)")
+        seconds, written = timed(store.insert_readings, "BENCH", "air", readings.iloc[:len(readings) // args.weeks])
+        print(f"re-import week   {written:>10} values  {seconds:8.3f} s")
+
+        size_mb = os.path.getsize(store.path) / 1024 / 1024
+        print(f"store size       {size_mb:10.1f} MB")
+
+        middle = readings["timestamp"].iloc[len(readings) // args.locations // 2].normalize()
+        queries = [
+            ("one week", middle, middle + pd.Timedelta(weeks=1)),
+            ("one month", middle, middle + pd.DateOffset(months=1)),
+            ("full range", None, None),
+        ]
+        for label, start, end in queries:
+            seconds, frame = timed(store.query_readings, "BENCH", "air", start, end)
+            print(f"query {label:<10} {len(frame):>10} rows    {seconds:8.3f} s")
+
+        seconds, (timestamps, _) = timed(store.query_series, "BENCH", "ML-01", "PM10")
+        print(f"trend series     {len(timestamps):>10} points  {seconds:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compares the legacy per-cell table fill with the bulk table writer and checks their XML is identical.
+
+Run from the repository root:
+    python -m benchmarks.tableBenchmark --rows 100 200 1000 4000 16000 --legacy-max 200
+"""
+import argparse
+import random
+import time
+
+from docx import Document
+
+from monitoring.tableWriter import add_bulk_table
+
+
+AIR_HEADERS = ["Monitoring Location", "Time", "CO", "O3", "NO2", "SO2", "PM2.5", "PM10"]
+
+
+def build_rows(num_rows):
+    """Synthesises a header plus `num_rows` rows of 15-minute air readings."""
+    rows = [AIR_HEADERS]
+    for i in range(num_rows):
+        minutes = i * 15
+        rows.append([f"ML-{i % 60 + 1:02d}", f"{1 + minutes // 1440:02d}/12/2024 {minutes // 60 % 24:02d}:{minutes % 60:02d}"]
+                    + [f"{random.uniform(1, 400):.1f}" for _ in AIR_HEADERS[2:]])
+    return rows
+
+
+def legacy_table(doc, rows):
+    """The original insert_tables fill: doc.add_table + table.cell(r, c).text for every cell."""
+    table = doc.add_table(rows=len(rows), cols=len(rows[0]))
+    table.style = 'Table Grid'
+    for row_idx, row_data in enumerate(rows):
+        for col_idx, cell_data in enumerate(row_data):
+            table.cell(row_idx, col_idx).text = str(cell_data)
+    return table
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Table emission benchmark")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 200, 1000, 4000, 16000])
+    parser.add_argument("--legacy-max", type=int, default=200,
+                        help="Largest row count to run the quadratic legacy path on")
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'legacy (s)':>12} {'bulk (s)':>10} {'bulk us/row':>12} {'identical':>10}")
+    for num_rows in args.rows:
+        rows = build_rows(num_rows)
+
+        bulk_table, bulk_time = timed(add_bulk_table, Document(), rows)
+
+        if num_rows <= args.legacy_max:
+            legacy, legacy_time = timed(legacy_table, Document(), rows)
+            identical = "yes" if legacy._tbl.xml == bulk_table._tbl.xml else "NO"
+            legacy_column = f"{legacy_time:12.3f}"
+        else:
+            identical = "-"
+            legacy_column = f"{'skipped':>12}"
+
+        print(f"{num_rows:>8} {legacy_column} {bulk_time:10.3f} {bulk_time / num_rows * 1e6:12.1f} {identical:>10}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,87 +1,193 @@
-import gradio as gr
-from monitoring.monitoringReport import generate_report
+import copy
+import os
+import tempfile
+import time
+from functools import partial
+
+from monitoring.monitoringReport import CONSTANTS
+from monitoring.reportJobs import ReportQueueFull, get_report_jobs
+from monitoring.reportTypes import report_type_labels
+
+# Per-session storage for monitoring data (copied into each browser session by gr.State)
+EMPTY_SESSION = {
+    "monitoring_data": [],
+    "air_data": [],
+    "noise_data": [],
+    "location_images": {},
+    "monitoring_location_map": None,
+}
+
+# Seconds between report progress updates
+PROGRESS_INTERVAL = 0.5
+
+# Rows per page in the UI tables (a page is sent to the browser, not the whole list)
+TABLE_PAGE_SIZE = 50
+
+# Session list behind each UI table
+SESSION_TABLES = {"locations": "monitoring_data", "air": "air_data", "noise": "noise_data"}
+
+def build_theme():
+    """Builds the UI theme (gradio is imported when the UI is built, not when this module is imported)."""
+    import gradio as gr
+
+    class OceanDefaultTheme(gr.themes.Default):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.primary_hue = "#047857"  # Set primary color to teal
+            self.button_radius = "lg"  # Larger rounded buttons
+            self.button_shadow = "md"  # Soft button shadow
+            self.button_primary_background_fill = "#047857"  # Custom button fill color
+            self.button_primary_background_fill_hover = "teal"  # Darker hover effect
+            self.button_primary_text_color = "white"  # White text for contrast
+            self.button_primary_border_color = "#047857"  # ✅ Match border color to button
+            self.button_primary_border_color_hover = "#047857"  # ✅ Keep it subtle
+            self.button_primary_focus_ring_color = "#047857"  # ✅ Soft focus glow instead of orange
+
+    return OceanDefaultTheme()
+
+
+def upload_monitoring_map(session, file):
+    """Stores the uploaded Monitoring Location Map image path."""
+    if file:
+        session["monitoring_location_map"] = file
+        return session, "✅ Map uploaded successfully!"
+    return session, "⚠ Please upload a valid image file."
 
-# Global storage for monitoring data
-monitoring_data = []
-air_data = []
-noise_data = []
-location_images = {}
-monitoring_location_map = None
+def table_page(rows, page):
+    """Returns (rows on `page`, the page number clamped to the table, page label); pages start at 1."""
+    pages = max(1, -(-len(rows) // TABLE_PAGE_SIZE))
+    page = min(max(1, int(page or 1)), pages)
+    start = (page - 1) * TABLE_PAGE_SIZE
+    return rows[start:start + TABLE_PAGE_SIZE], page, f"Page {page} of {pages} ({len(rows)} row(s))"
 
-class OceanDefaultTheme(gr.themes.Default):
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.primary_hue = "#047857"  # Set primary color to teal
-        self.button_radius = "lg"  # Larger rounded buttons
-        self.button_shadow = "md"  # Soft button shadow
-        self.button_primary_background_fill = "#047857"  # Custom button fill color
-        self.button_primary_background_fill_hover = "teal"  # Darker hover effect
-        self.button_primary_text_color = "white"  # White text for contrast
-        self.button_primary_border_color = "#047857"  # ✅ Match border color to button
-        self.button_primary_border_color_hover = "#047857"  # ✅ Keep it subtle
-        self.button_primary_focus_ring_color = "#047857"  # ✅ Soft focus glow instead of orange
 
+def show_table_page(table, session, page):
+    """Sends one page of a session table to its Dataframe."""
+    return table_page(session[SESSION_TABLES[table]], page)
 
 
+def turn_table_page(table, step, session, page):
+    """Previous / Next page buttons."""
+    return show_table_page(table, session, int(page or 1) + step)
 
-custom_theme = OceanDefaultTheme()
 
-def upload_monitoring_map(file):
-    """Stores the uploaded Monitoring Location Map image path."""
-    global monitoring_location_map
-    if file:
-        monitoring_location_map = file
-        return "✅ Map uploaded successfully!"
-    return "⚠ Please upload a valid image file."
+def known_locations(session):
+    """Monitoring location IDs entered so far (readings are checked against them)."""
+    return [row[0] for row in session["monitoring_data"]]
+
+
+def add_monitoring_location(session, location, description, latitude, longitude, image):
+    """Validates and adds a monitoring location, then shows the last table page and resets the input fields."""
+    import gradio as gr
+    from monitoring.bulkUpload import LOCATION_HEADERS, describe_errors, entry_frame, validate_locations
 
-def add_monitoring_location(location, description, latitude, longitude, image):
-    """Adds a monitoring location entry to the table and resets input fields."""
-    if location and description and latitude and longitude:
-        monitoring_data.append([location, description, latitude, longitude])
+    rows, errors = validate_locations(entry_frame([location, description, latitude, longitude], LOCATION_HEADERS),
+                                      known_locations(session))
+    if errors:
+        page = show_table_page("locations", session, len(session["monitoring_data"]))
+        return (session, *page, f"⚠ {describe_errors(errors, with_rows=False)}") + (gr.update(),) * 5
 
+    session["monitoring_data"].extend(rows)
     if image:
-        location_images[location] = image
+        session["location_images"][rows[0][0]] = image
 
-    return monitoring_data, "", "", "", "", None  # Resets input fields
+    page = show_table_page("locations", session, len(session["monitoring_data"]))
+    return (session, *page, "") + ("", "", "", "", None)  # Resets input fields
 
 
-def add_air_data(location, datetime, co, o3, no2, so2, pm25, pm10):
-    """Adds air quality monitoring data to the table and resets input fields."""
-    if location and datetime and co and o3 and no2 and so2 and pm25 and pm10:
-        air_data.append([location, datetime, co, o3, no2, so2, pm25, pm10])
+def add_readings(kind, session, *values):
+    """Validates and adds one air / noise reading, then shows the last table page and resets the input fields."""
+    import gradio as gr
+    from monitoring.bulkUpload import describe_errors, entry_frame, validate_readings
+    from monitoring.monitoringTable import KIND_HEADERS
 
-    return air_data, "", "", "", "", "", "", "", ""  # Resets input fields
+    rows, errors, _ = validate_readings(entry_frame(values, KIND_HEADERS[kind]), kind, known_locations(session))
+    duplicate = rows and any(row[:2] == rows[0][:2] for row in session[SESSION_TABLES[kind]])
+    if errors or duplicate:
+        message = describe_errors(errors, with_rows=False) if errors else "a reading for this location and time exists"
+        page = show_table_page(kind, session, len(session[SESSION_TABLES[kind]]))
+        return (session, *page, f"⚠ {message}") + (gr.update(),) * len(values)
 
+    session[SESSION_TABLES[kind]].extend(rows)
+    page = show_table_page(kind, session, len(session[SESSION_TABLES[kind]]))
+    return (session, *page, "") + ("",) * len(values)  # Resets input fields
+
+
+def add_air_data(session, location, datetime, co, o3, no2, so2, pm25, pm10):
+    """Adds air quality monitoring data to the table and resets input fields."""
+    return add_readings("air", session, location, datetime, co, o3, no2, so2, pm25, pm10)
 
-def add_noise_data(location, datetime, eq, max_val, ae, val10, val50, val90):
-    """Adds noise monitoring data to the table and resets input fields."""
-    if location and datetime and eq and max_val and ae and val10 and val50 and val90:
-        noise_data.append([location, datetime, eq, max_val, ae, val10, val50, val90])
 
-    return noise_data, "", "", "", "", "", "", "", ""  # Resets input fields
+def add_noise_data(session, location, datetime, eq, max_val, ae, val10, val50, val90):
+    """Adds noise monitoring data to the table and resets input fields."""
+    return add_readings("noise", session, location, datetime, eq, max_val, ae, val10, val50, val90)
+
+
+def upload_table_file(table, session, file):
+    """
+    Bulk-adds locations or air / noise readings from a CSV/XLSX upload (validated in chunks, see bulkUpload).
+
+    Rejected rows are left out and listed in a downloadable CSV error report.
+    """
+    import gradio as gr
+    from monitoring.bulkUpload import describe_errors, upload_locations, upload_readings, write_error_report
+
+    rows = session[SESSION_TABLES[table]]
+    no_report = gr.update(value=None, visible=False)
+    if not file:
+        return (session, *show_table_page(table, session, 1), "⚠ Please upload a .csv or .xlsx file.", no_report)
+
+    path = getattr(file, "name", file)
+    locations = known_locations(session)
+    try:
+        if table == "locations":
+            result = upload_locations(path, locations)
+        else:
+            result = upload_readings(path, table, locations or None, rows)
+    except (OSError, ValueError) as e:
+        return (session, *show_table_page(table, session, 1),
+                f"⚠ Unable to read {os.path.basename(path)}: {e}", no_report)
+
+    first_new_row = len(rows)
+    rows.extend(result.rows)
+
+    message = result.summary()
+    if table != "locations" and not locations:
+        message += " Location IDs were not checked (no monitoring locations listed yet)."
+    report = no_report
+    if result.errors:
+        message += f" First errors: {describe_errors(result.errors)}"
+        fd, report_path = tempfile.mkstemp(prefix=f"{table}_upload_errors_", suffix=".csv")
+        os.close(fd)
+        report = gr.update(value=write_error_report(result.errors, report_path), visible=True)
+
+    # Show the first page holding the uploaded rows
+    return (session, *show_table_page(table, session, first_new_row // TABLE_PAGE_SIZE + 1), message, report)
 
 
 def toggle_air_section(selected_parameters):
     """Toggles the Air Monitoring input fields visibility based on checkbox selection."""
+    import gradio as gr
     return gr.update(visible="Air" in selected_parameters)
 
 
 def toggle_noise_section(selected_parameters):
     """Toggles the Noise Monitoring input fields visibility based on checkbox selection."""
+    import gradio as gr
     return gr.update(visible="Noise" in selected_parameters)
 
 def show_image():
     return "chloris.png"
 
 
-def generate_and_download_report(contractor_name, project_name, project_number, reference_number, report_frequency,
-                                 report_date, report_number, monitoring_frequency, report_parameters):
-    """Handles report generation and provides a download link."""
+def build_placeholders(session, contractor_name, project_name, project_number, reference_number, report_frequency,
+                       report_date, report_number, monitoring_frequency, report_parameters):
+    """Snapshots the session's data into report placeholders (later edits don't affect a queued report)."""
 
     # Ensure report_parameters is always a string
     parameters_text = ", ".join(report_parameters) if report_parameters else "None"
 
-    placeholders = {
+    return copy.deepcopy({
         "consultancy_name": "Green Fields Environmental Consulting",
         "contractor_name": contractor_name,
         "project_name": project_name,
@@ -92,156 +198,240 @@ def generate_and_download_report(contractor_name, project_name, project_number,
         "report_number": report_number,
         "report_parameters": parameters_text,
         "monitoring_frequency": monitoring_frequency,
-        "monitoring_locations": [["Monitoring Location", "Description", "Latitude", "Longitude"]] + monitoring_data,
-        "monitoring_location_map": monitoring_location_map,
-        "monitoring_location_images": location_images,
-        "air_monitoring_data": [["Monitoring Location", "Time", "CO", "O3", "NO2", "SO2", "PM2.5", "PM10"]] + air_data,
-        "noise_monitoring_data": [["Monitoring Location", "Time", "EQ", "Max", "AE", "10", "50", "90"]] + noise_data,
-    }
+        "monitoring_locations": [["Monitoring Location", "Description", "Latitude", "Longitude"]] + session["monitoring_data"],
+        "monitoring_location_map": session["monitoring_location_map"],
+        "monitoring_location_images": session["location_images"],
+        "air_monitoring_data": [["Monitoring Location", "Time", "CO", "O3", "NO2", "SO2", "PM2.5", "PM10"]] + session["air_data"],
+        "noise_monitoring_data": [["Monitoring Location", "Time", "EQ", "Max", "AE", "10", "50", "90"]] + session["noise_data"],
+    })
+
+
+def generate_and_download_report(session, report_type, *report_details, report_format="docx"):
+    """Queues report generation in the background and streams progress until the download is ready."""
+    import gradio as gr
+
+    placeholders = build_placeholders(session, *report_details)
+    report_jobs = get_report_jobs(CONSTANTS)
+
+    try:
+        # Entered readings are archived to the data store by the worker, so they outlive the session
+        job = report_jobs.submit(placeholders, report_format, archive=True, report_type=report_type)
+    except ReportQueueFull:
+        yield gr.update(visible=False), "⚠ The report queue is full. Please try again in a moment."
+        return
+
+    # ✅ Report builds in a worker process; this handler only reports progress
+    while True:
+        state, message = report_jobs.progress(job)
+        if state == "done":
+            yield gr.update(value=job.future.result()["path"], visible=True), message
+            return
+        if state == "failed":
+            yield gr.update(visible=False), message
+            return
+        yield gr.update(visible=False), message
+        time.sleep(PROGRESS_INTERVAL)
+
+
+def generate_and_download_pdf_report(session, report_type, *report_details):
+    """Same as generate_and_download_report, rendering the report plan straight to PDF."""
+    yield from generate_and_download_report(session, report_type, *report_details, report_format="pdf")
+
+
+def build_table_controls(table, session, dataframe, upload_label):
+    """
+    Adds the pager, bulk upload, status line and error report download under a table.
+
+    :return: (page number, page label, status) components, also updated by the table's Add button.
+    """
+    import gradio as gr
 
-    # ✅ Generate report
-    report_path = generate_report(placeholders)
+    with gr.Row():
+        previous_button = gr.Button("◀ Previous", size="sm")
+        page = gr.Number(value=1, precision=0, minimum=1, label="Page")
+        next_button = gr.Button("Next ▶", size="sm")
+        page_label = gr.Markdown()
+    with gr.Row():
+        upload = gr.File(label=upload_label, file_types=[".csv", ".xlsx"])
+        error_report = gr.File(label="Upload Error Report", visible=False)
+    status = gr.Markdown()
 
-    return report_path, gr.update(visible=True)
+    page_outputs = [dataframe, page, page_label]
+    page.submit(fn=partial(show_table_page, table), inputs=[session, page], outputs=page_outputs)
+    previous_button.click(fn=partial(turn_table_page, table, -1), inputs=[session, page], outputs=page_outputs)
+    next_button.click(fn=partial(turn_table_page, table, 1), inputs=[session, page], outputs=page_outputs)
+    upload.upload(fn=partial(upload_table_file, table), inputs=[session, upload],
+                  outputs=[session, dataframe, page, page_label, status, error_report])
+    return page, page_label, status
 
 
 # ✅ Create UI
-with gr.Blocks(theme=custom_theme) as demo:
+def build_ui():
+    """Builds the Gradio Blocks app."""
+    import gradio as gr
 
-    with gr.Column():
-        with gr.Row():
-            image = gr.Image(value="chloris.png", label="Agent Chloris", interactive=False)
+    with gr.Blocks(theme=build_theme()) as demo:
+        session = gr.State(EMPTY_SESSION)
+
+        with gr.Column():
+            with gr.Row():
+                image = gr.Image(value="chloris.png", label="Agent Chloris", interactive=False)
 
-            with gr.Column():
-                contractor_name = gr.Textbox(label="Contractor Name")
                 with gr.Column():
-                    reference_number = gr.Textbox(label="Reference Number")
+                    contractor_name = gr.Textbox(label="Contractor Name")
+                    with gr.Column():
+                        reference_number = gr.Textbox(label="Reference Number")
+                    with gr.Column():
+                        project_name = gr.Textbox(label="Project Name")
+                        project_number = gr.Textbox(label="Project Number")
+
                 with gr.Column():
-                    project_name = gr.Textbox(label="Project Name")
-                    project_number = gr.Textbox(label="Project Number")
+                    gr.Markdown("Add Report Details")
+                    report_type = gr.Dropdown(report_type_labels(), value=report_type_labels()[0],
+                                              label="Select Report Type")
+                    report_date = gr.Textbox(label="Report Date (e.g., 06Jan2025)")
+                    report_frequency = gr.Dropdown(["Weekly", "Monthly"], label="Report Frequency")
+                    report_number = gr.Textbox(label="Report Number")
 
-            with gr.Column():
-                gr.Markdown("Add Report Details")
-                report_type = gr.Dropdown(["Monitoring", "CESMP"], label="Select Report Type")
-                report_date = gr.Textbox(label="Report Date (e.g., 06Jan2025)")
-                report_frequency = gr.Dropdown(["Weekly", "Monthly"], label="Report Frequency")
-                report_number = gr.Textbox(label="Report Number")
 
 
+            with gr.Column():
+                with gr.Row():
+                    with gr.Column():
+                        report_parameters = gr.CheckboxGroup(
+                            ["Air", "Noise", "Soil Quality", "Ground Water", "Sea Water", "Emission", "Vibration"],
+                            label="Monitoring Parameters"
+                        )
+                        with gr.Column():
+                            monitoring_frequency = gr.Dropdown(["15 mins", "30 mins", "1 hr", "24 hr"],
+                                                           label="Monitoring Frequency")
+                    with gr.Column():
+                        monitoring_map_upload = gr.File(label="Upload Monitoring Location Map")
+                        monitoring_map_status = gr.Markdown()
+                        monitoring_map_upload.change(fn=upload_monitoring_map, inputs=[session, monitoring_map_upload],
+                                                     outputs=[session, monitoring_map_status])
+
 
         with gr.Column():
+            gr.Markdown("### Add Monitoring Location Data")
+
             with gr.Row():
-                with gr.Column():
-                    report_parameters = gr.CheckboxGroup(
-                        ["Air", "Noise", "Soil Quality", "Ground Water", "Sea Water", "Emission", "Vibration"],
-                        label="Monitoring Parameters"
-                    )
-                    with gr.Column():
-                        monitoring_frequency = gr.Dropdown(["15 mins", "30 mins", "1 hr", "24 hr"],
-                                                       label="Monitoring Frequency")
-                with gr.Column():
-                    monitoring_map_upload = gr.File(label="Upload Monitoring Location Map")
-                    monitoring_map_upload.change(fn=upload_monitoring_map, inputs=[monitoring_map_upload])
+                location_image = gr.File(label="Upload Location Image")
 
+            with gr.Row():
+                monitoring_location = gr.Textbox(label="Monitoring Location")
+                monitoring_description = gr.Textbox(label="Description")
+                monitoring_latitude = gr.Textbox(label="Latitude")
+                monitoring_longitude = gr.Textbox(label="Longitude")
+                add_data_button = gr.Button("Add Data", variant='primary')
 
-    with gr.Column():
-        gr.Markdown("### Add Monitoring Location Data")
 
-        with gr.Row():
-            location_image = gr.File(label="Upload Location Image")
 
         with gr.Row():
-            monitoring_location = gr.Textbox(label="Monitoring Location")
-            monitoring_description = gr.Textbox(label="Description")
-            monitoring_latitude = gr.Textbox(label="Latitude")
-            monitoring_longitude = gr.Textbox(label="Longitude")
-            add_data_button = gr.Button("Add Data", variant='primary')
+            monitoring_table = gr.Dataframe(headers=["Monitoring Location", "Description", "Latitude", "Longitude"],
+                                        datatype=["str", "str", "str", "str"],
+                                        label="Monitoring Locations Table")
+        locations_page, locations_page_label, locations_status = build_table_controls(
+            "locations", session, monitoring_table, "Upload Monitoring Locations (CSV/XLSX)")
+        add_data_button.click(fn=add_monitoring_location,
+                              inputs=[session, monitoring_location, monitoring_description, monitoring_latitude,
+                                      monitoring_longitude, location_image],
+                              outputs=[session, monitoring_table, locations_page, locations_page_label,
+                                       locations_status, monitoring_location, monitoring_description, monitoring_latitude,
+                                       monitoring_longitude, location_image])
 
 
+        # ✅ Air Monitoring Section (Hidden by default)
+        with gr.Column(visible=False) as air_section:
+            gr.Markdown("### Add Air Monitoring Data")
+            with gr.Row():
+                air_location = gr.Textbox(label="Monitoring Location")
+                air_datetime = gr.Textbox(label="Date and Time")
+            with gr.Row():
+                air_co = gr.Textbox(label="CO")
+                air_o3 = gr.Textbox(label="O3")
+                air_no2 = gr.Textbox(label="NO2")
+                air_so2 = gr.Textbox(label="SO2")
+                air_pm25 = gr.Textbox(label="PM2.5")
+                air_pm10 = gr.Textbox(label="PM10")
+                add_air_button = gr.Button("Add Air Data", variant='primary')
+
+
+            air_table = gr.Dataframe(
+                headers=["Monitoring Location", "Date and Time", "CO", "O3", "NO2", "SO2", "PM2.5", "PM10"],
+                datatype=["str", "str", "str", "str", "str", "str", "str", "str"],
+                label="Air Monitoring Table"
+            )
+            air_page, air_page_label, air_status = build_table_controls(
+                "air", session, air_table, "Upload Air Monitoring Data (CSV/XLSX)")
+
+            add_air_button.click(fn=add_air_data,
+                                 inputs=[session, air_location, air_datetime, air_co, air_o3, air_no2, air_so2, air_pm25, air_pm10],
+                                 outputs=[session, air_table, air_page, air_page_label, air_status, air_location,
+                                          air_datetime, air_co, air_o3, air_no2, air_so2, air_pm25, air_pm10])
+
+        # ✅ Noise Monitoring Section (Hidden by default)
+        with gr.Column(visible=False) as noise_section:
+            gr.Markdown("### Add Noise Monitoring Data")
+            with gr.Row():
+                noise_location = gr.Textbox(label="Monitoring Location")
+                noise_datetime = gr.Textbox(label="DateTime")
+            with gr.Row():
+                noise_eq = gr.Textbox(label="EQ")
+                noise_max = gr.Textbox(label="Max")
+                noise_ae = gr.Textbox(label="AE")
+                noise_val10 = gr.Textbox(label="10")
+                noise_val50 = gr.Textbox(label="50")
+                noise_val90 = gr.Textbox(label="90")
+                add_noise_button = gr.Button("Add Noise Data", variant='primary')
+
+
+            noise_table = gr.Dataframe(
+                headers=["Monitoring Location", "DateTime", "EQ", "Max", "AE", "10", "50", "90"],
+                datatype=["str", "str", "str", "str", "str", "str", "str", "str"],
+                label="Noise Monitoring Table"
+            )
+            noise_page, noise_page_label, noise_status = build_table_controls(
+                "noise", session, noise_table, "Upload Noise Monitoring Data (CSV/XLSX)")
+
+            add_noise_button.click(fn=add_noise_data,
+                                   inputs=[session, noise_location, noise_datetime, noise_eq, noise_max, noise_ae, noise_val10,
+                                           noise_val50, noise_val90],
+                                   outputs=[session, noise_table, noise_page, noise_page_label, noise_status,
+                                            noise_location, noise_datetime, noise_eq, noise_max, noise_ae, noise_val10,
+                                            noise_val50, noise_val90])
+
+        # ✅ Show Air & Noise Sections Dynamically
+        report_parameters.change(fn=toggle_air_section, inputs=[report_parameters], outputs=[air_section])
+        report_parameters.change(fn=toggle_noise_section, inputs=[report_parameters], outputs=[noise_section])
 
-    with gr.Row():
-        monitoring_table = gr.Dataframe(headers=["Monitoring Location", "Description", "Latitude", "Longitude"],
-                                    datatype=["str", "str", "str", "str"],
-                                    label="Monitoring Locations Table")
-        add_data_button.click(fn=add_monitoring_location,
-                          inputs=[monitoring_location, monitoring_description, monitoring_latitude,
-                                  monitoring_longitude, location_image],
-                          outputs=[monitoring_table, monitoring_location, monitoring_description, monitoring_latitude,
-                                   monitoring_longitude, location_image])
+        with gr.Row():
+            generate_button = gr.Button("Generate Report as Word", variant="primary")
+            generate_button2 = gr.Button("Generate Report as PDF")
 
 
-    # ✅ Air Monitoring Section (Hidden by default)
-    with gr.Column(visible=False) as air_section:
-        gr.Markdown("### Add Air Monitoring Data")
-        with gr.Row():
-            air_location = gr.Textbox(label="Monitoring Location")
-            air_datetime = gr.Textbox(label="Date and Time")
-        with gr.Row():
-            air_co = gr.Textbox(label="CO")
-            air_o3 = gr.Textbox(label="O3")
-            air_no2 = gr.Textbox(label="NO2")
-            air_so2 = gr.Textbox(label="SO2")
-            air_pm25 = gr.Textbox(label="PM2.5")
-            air_pm10 = gr.Textbox(label="PM10")
-            add_air_button = gr.Button("Add Air Data", variant='primary')
-
-
-        air_table = gr.Dataframe(
-            headers=["Monitoring Location", "Date and Time", "CO", "O3", "NO2", "SO2", "PM2.5", "PM10"],
-            datatype=["str", "str", "str", "str", "str", "str", "str", "str"],
-            label="Air Monitoring Table"
-        )
-
-        add_air_button.click(fn=add_air_data,
-                             inputs=[air_location, air_datetime, air_co, air_o3, air_no2, air_so2, air_pm25, air_pm10],
-                             outputs=[air_table, air_location, air_datetime, air_co, air_o3, air_no2, air_so2, air_pm25,
-                                      air_pm10])
-
-    # ✅ Noise Monitoring Section (Hidden by default)
-    with gr.Column(visible=False) as noise_section:
-        gr.Markdown("### Add Noise Monitoring Data")
-        with gr.Row():
-            noise_location = gr.Textbox(label="Monitoring Location")
-            noise_datetime = gr.Textbox(label="DateTime")
-        with gr.Row():
-            noise_eq = gr.Textbox(label="EQ")
-            noise_max = gr.Textbox(label="Max")
-            noise_ae = gr.Textbox(label="AE")
-            noise_val10 = gr.Textbox(label="10")
-            noise_val50 = gr.Textbox(label="50")
-            noise_val90 = gr.Textbox(label="90")
-            add_noise_button = gr.Button("Add Noise Data", variant='primary')
-
-
-        noise_table = gr.Dataframe(
-            headers=["Monitoring Location", "DateTime", "EQ", "Max", "AE", "10", "50", "90"],
-            datatype=["str", "str", "str", "str", "str", "str", "str", "str"],
-            label="Noise Monitoring Table"
-        )
-
-        add_noise_button.click(fn=add_noise_data,
-                               inputs=[noise_location, noise_datetime, noise_eq, noise_max, noise_ae, noise_val10,
-                                       noise_val50, noise_val90],
-                               outputs=[noise_table, noise_location, noise_datetime, noise_eq, noise_max, noise_ae,
-                                        noise_val10, noise_val50, noise_val90])
-
-    # ✅ Show Air & Noise Sections Dynamically
-    report_parameters.change(fn=toggle_air_section, inputs=[report_parameters], outputs=[air_section])
-    report_parameters.change(fn=toggle_noise_section, inputs=[report_parameters], outputs=[noise_section])
+        report_status = gr.Markdown()
+        download_output = gr.File(label="Download Report", visible=False)
 
-    with gr.Row():
-        generate_button = gr.Button("Generate Report as Word", variant="primary")
-        generate_button2 = gr.Button("Generate Report as PDF")
 
 
-    download_output = gr.File(label="Download Report", visible=False)
+        report_inputs = [session, report_type, contractor_name, project_name, project_number, reference_number,
+                         report_frequency, report_date, report_number, monitoring_frequency, report_parameters]
+        report_concurrency = CONSTANTS["report_workers"] + CONSTANTS["report_queue_size"]
 
+        generate_button.click(fn=generate_and_download_report, inputs=report_inputs,
+                              outputs=[download_output, report_status], concurrency_limit=report_concurrency,
+                              concurrency_id="reports")
+        generate_button2.click(fn=generate_and_download_pdf_report, inputs=report_inputs,
+                               outputs=[download_output, report_status], concurrency_limit=report_concurrency,
+                               concurrency_id="reports")
 
+    return demo
 
-    generate_button.click(fn=generate_and_download_report,
-                          inputs=[contractor_name, project_name, project_number, reference_number, report_frequency,
-                                  report_date, report_number, monitoring_frequency, report_parameters],
-                          outputs=[download_output, download_output])
 
 # ✅ Launch UI
-demo.launch(share=True)
+if __name__ == "__main__":
+    demo = build_ui()
+    demo.queue(max_size=CONSTANTS["report_workers"] + CONSTANTS["report_queue_size"] + 16)
+    demo.launch(share=True)
+
@@ -1,19 +1,130 @@
-from monitoring.monitoringReport import generate_report
+import argparse
+import os
 
-def select_report_type():
-    # report_type = input("Select report type (monitoring, CESMP): ").strip().lower()
-    report_type = "monitoring"
-    if report_type not in ["monitoring", "cesmp"]:
-        print("Invalid report type. Please choose monitoring or CESMP.")
+
+def select_report_type(name):
+    from monitoring.reportTypes import get_report_type, report_type_names
+
+    try:
+        return get_report_type(name).name
+    except ValueError:
+        print(f"Invalid report type. Please choose {' or '.join(report_type_names())}.")
         return None
-    return report_type
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Agent Chloris report generator")
+    parser.add_argument("--type", default="monitoring", metavar="TYPE",
+                        help="Report type: monitoring (default) or cesmp")
+    parser.add_argument("--batch", metavar="SOURCE",
+                        help="Directory of project JSON files or a manifest; generates all reports in a process pool")
+    parser.add_argument("--output", metavar="DIR", help="Batch output directory (default: <output_dir>/batch)")
+    parser.add_argument("--workers", type=int, help="Batch worker processes (default: CPU count)")
+    parser.add_argument("--trace", metavar="FILE", help="Write per-stage timings and counters as a JSON trace")
+    parser.add_argument("--chrome-trace", metavar="FILE",
+                        help="Write a Chrome trace-event file (open in chrome://tracing or Perfetto)")
+    parser.add_argument("--trace-memory", action="store_true", help="Add tracemalloc memory deltas to each span")
+    parser.add_argument("--serve", action="store_true",
+                        help="Run the local report HTTP service: submit jobs, poll them and download reports")
+    parser.add_argument("--host", help="Report service host (default: the configured service host)")
+    parser.add_argument("--port", type=int, help="Report service port (default: the configured service port)")
+    parser.add_argument("--trend", metavar="PROJECT", nargs="+",
+                        help="Generate a trend report over the stored readings of these project numbers")
+    parser.add_argument("--start", help="Trend report start date (default: first stored reading)")
+    parser.add_argument("--end", help="Trend report end date, exclusive (default: after the last stored reading)")
+    parser.add_argument("--period", choices=["weekly", "monthly", "quarterly"],
+                        help="Trend statistics period (default: the configured trend period)")
+    parser.add_argument("--import-logs", metavar="FILE", nargs="+",
+                        help="Stream instrument log exports (Pulsar, PTM600 CSV) into the monitoring data store")
+    parser.add_argument("--kind", choices=["air", "noise"], help="Imported logs: air or noise readings")
+    parser.add_argument("--project", help="Imported logs: project number the readings belong to")
+    parser.add_argument("--location",
+                        help="Imported logs: monitoring location of exports without a location (or GPS) column")
+    return parser.parse_args()
+
+
+def run_report(args, generate):
+    """Runs `generate()`, traced and summarised when --trace / --chrome-trace is given."""
+    if not (args.trace or args.chrome_trace):
+        generate()
+        return
+
+    from monitoring.profiling import tracing
+    with tracing(memory=args.trace_memory) as trace:
+        generate()
+    print(trace.summary())
+    if args.trace:
+        trace.save_json(args.trace)
+        print(f"Trace written to {args.trace}")
+    if args.chrome_trace:
+        trace.save_chrome(args.chrome_trace)
+        print(f"Chrome trace written to {args.chrome_trace}")
+
+
+def import_logs(args):
+    """Streams the --import-logs files into the data store; returns the exit status."""
+    from monitoring.dataStore import get_monitoring_store
+    from monitoring.instrumentLogs import import_logs
+    from monitoring.locations import LocationIndex
+    from monitoring.monitoringReport import CONSTANTS
+
+    if not args.kind or not args.project:
+        print("❌ --import-logs needs --kind (air or noise) and --project.")
+        return 1
+    store = get_monitoring_store(CONSTANTS)
+    if store is None:
+        print("❌ Importing logs needs the monitoring data store; set data_store in constants.json.")
+        return 1
+
+    # Stored locations with coordinates, for exports that log a GPS fix instead of a location
+    location_rows = store.locations(args.project)
+    locations = LocationIndex.from_rows(location_rows[:1] + [row for row in location_rows[1:] if row[2] and row[3]])
+    results = import_logs(store, args.project, args.kind, [(path, args.location) for path in args.import_logs],
+                          locations)
+    for path, stats in results.items():
+        print(f"📥 {path}: {stats['rows']} reading(s), {stats['values']} value(s) stored")
+    return 0 if any(stats["rows"] for stats in results.values()) else 1
+
 
 def main():
-    report_type = select_report_type()
-    if report_type == "monitoring":
-        generate_report()
-    elif report_type == "cesmp":
-        print("WIP")
+    args = parse_args()
+
+    if args.batch:
+        from monitoring.batchReport import load_batch_jobs, run_batch
+        from monitoring.monitoringReport import CONSTANTS
+
+        jobs = load_batch_jobs(args.batch)
+        output_dir = args.output or os.path.join(CONSTANTS["output_dir"], "batch")
+        summary = run_batch(jobs, output_dir, args.workers)
+        raise SystemExit(1 if summary["failed"] else 0)
+
+    if args.serve:
+        from monitoring.monitoringReport import CONSTANTS
+        from monitoring.reportService import serve
+
+        serve(CONSTANTS, args.host, args.port)
+        return
+
+    if args.import_logs:
+        raise SystemExit(import_logs(args))
+
+    if args.trend:
+        from monitoring.trendReport import generate_trend_report
+
+        try:
+            run_report(args, lambda: generate_trend_report(args.trend, args.start, args.end, args.period))
+        except ValueError as e:
+            print(f"❌ {e}")
+            raise SystemExit(1)
+        return
+
+    report_type = select_report_type(args.type)
+    if report_type is None:
+        raise SystemExit(1)
+
+    from monitoring.monitoringReport import generate_report
+
+    run_report(args, lambda: generate_report(report_type=report_type))
 
 if __name__ == "__main__":
     main()
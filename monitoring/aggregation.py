@@ -0,0 +1,184 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from monitoring.monitoringTable import KIND_HEADERS, MonitoringTable
+from monitoring.reportPlan import AIR_QUALITY_HEADERS
+
+
+# UI monitoring frequency -> pandas offset alias
+FREQUENCY_ALIASES = {
+    "15 mins": "15min",
+    "30 mins": "30min",
+    "1 hr": "1h",
+    "24 hr": "24h",
+}
+
+READINGS_CHUNK_SIZE = 1_000_000
+
+
+def parse_frequency(monitoring_frequency):
+    """Converts a UI monitoring frequency ('15 mins', '1 hr', ...) into a pandas Timedelta."""
+    alias = FREQUENCY_ALIASES.get(monitoring_frequency.strip().lower() if monitoring_frequency else "")
+    if alias is None:
+        match = re.fullmatch(r"\s*(\d+)\s*(mins?|minutes?|hrs?|hours?)\s*", monitoring_frequency or "", re.I)
+        if not match:
+            raise ValueError(f"Unsupported monitoring frequency: {monitoring_frequency!r}")
+        unit = "min" if match.group(2).lower().startswith("m") else "h"
+        alias = f"{match.group(1)}{unit}"
+    return pd.Timedelta(alias)
+
+
+def frame_from_readings(readings, kind):
+    """
+    Builds a typed readings frame from `instrumentLogs.iter_readings` output.
+
+    Readings are consumed in chunks so peak memory is bounded by the typed arrays, not Python tuples.
+
+    :return: DataFrame with a categorical `location`, datetime64 `timestamp` and float32 channel columns.
+    """
+    channels = list(KIND_HEADERS[kind][2:])
+    frames = []
+    chunk = []
+    for reading in readings:
+        chunk.append(reading)
+        if len(chunk) >= READINGS_CHUNK_SIZE:
+            frames.append(_chunk_frame(chunk, channels))
+            chunk = []
+    if chunk or not frames:
+        frames.append(_chunk_frame(chunk, channels))
+
+    frame = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    frame["location"] = frame["location"].astype("category")
+    return frame
+
+
+def _chunk_frame(chunk, channels):
+    locations = [reading[0] for reading in chunk]
+    timestamps = np.array([reading[1] for reading in chunk], dtype="datetime64[ns]")
+    values = np.array([[np.nan if value is None else value for value in reading[2]] for reading in chunk],
+                      dtype=np.float32).reshape(len(chunk), len(channels))
+    frame = pd.DataFrame(values, columns=channels)
+    frame.insert(0, "timestamp", timestamps)
+    frame.insert(0, "location", locations)
+    return frame
+
+
+def frame_from_rows(rows, kind):
+    """Builds a typed readings frame from `*_monitoring_data` rows (header row first, values as strings)."""
+    return MonitoringTable.from_rows(rows, kind).to_frame()
+
+
+def _sample_durations(frame, interval):
+    """
+    Returns each sample's duration in seconds (gap to the next sample at the same location).
+
+    The last sample of a location, and gaps longer than one interval, take the location's median
+    sample spacing, so a logger pause does not give one sample hours of weight.
+    """
+    timestamps = frame["timestamp"].to_numpy("datetime64[ns]").astype(np.int64)
+    codes = frame["location"].cat.codes.to_numpy()
+
+    durations = np.empty(len(frame), dtype=np.float64)
+    durations[:-1] = (timestamps[1:] - timestamps[:-1]) / 1e9
+    if len(frame):
+        durations[-1] = np.nan
+
+    last_of_location = np.ones(len(frame), dtype=bool)
+    last_of_location[:-1] = codes[1:] != codes[:-1]
+    durations[last_of_location] = np.nan
+    durations[durations > interval.total_seconds()] = np.nan
+    durations[durations <= 0] = np.nan
+
+    median_spacing = pd.Series(durations).groupby(codes).transform("median").to_numpy()
+    durations = np.where(np.isnan(durations), median_spacing, durations)
+    # A location with a single sample has no spacing information: weight it as one full interval
+    return np.where(np.isnan(durations), interval.total_seconds(), durations)
+
+
+def _prepare(frame, monitoring_frequency):
+    interval = parse_frequency(monitoring_frequency)
+    frame = frame.dropna(subset=["timestamp"]).sort_values(["location", "timestamp"], kind="stable")
+    frame = frame.reset_index(drop=True)
+    if not isinstance(frame["location"].dtype, pd.CategoricalDtype):
+        frame["location"] = frame["location"].astype("category")
+    frame["location"] = frame["location"].cat.remove_unused_categories()
+    interval_start = frame["timestamp"].dt.floor(interval)
+    return frame, interval, interval_start, _sample_durations(frame, interval)
+
+
+def aggregate_air(frame, monitoring_frequency):
+    """
+    Time-weighted average of each air pollutant per location and reporting interval.
+
+    :param frame: Typed readings frame (see `frame_from_readings` / `frame_from_rows`).
+    :param monitoring_frequency: UI monitoring frequency, e.g. '30 mins'.
+    :return: DataFrame with location, interval start and one averaged column per pollutant.
+    """
+    frame, _, interval_start, durations = _prepare(frame, monitoring_frequency)
+    pollutants = list(AIR_QUALITY_HEADERS[2:])
+
+    values = frame[pollutants].to_numpy(np.float64)
+    weights = np.where(np.isnan(values), 0.0, durations[:, None])
+    weighted = pd.DataFrame(np.nan_to_num(values) * weights, columns=pollutants)
+    weight_totals = pd.DataFrame(weights, columns=pollutants)
+
+    keys = [frame["location"], interval_start.rename("timestamp")]
+    sums = weighted.groupby(keys, observed=True).sum()
+    totals = weight_totals.groupby(keys, observed=True).sum()
+    averages = sums / totals.where(totals > 0)
+    return averages.reset_index()
+
+
+def aggregate_noise(frame, monitoring_frequency):
+    """
+    Aggregates raw sound level samples per location and reporting interval.
+
+    EQ is the energy-averaged (time-weighted) Leq, Max the highest Lmax, AE the sound exposure
+    level over the samples, and 10/50/90 the statistical levels L10/L50/L90 (levels exceeded
+    10/50/90% of the time) computed from the sample Leq values.
+
+    :param frame: Typed readings frame (see `frame_from_readings` / `frame_from_rows`).
+    :param monitoring_frequency: UI monitoring frequency, e.g. '15 mins'.
+    :return: DataFrame with location, interval start and the EQ/Max/AE/10/50/90 columns.
+    """
+    frame, _, interval_start, durations = _prepare(frame, monitoring_frequency)
+    frame = frame.assign(timestamp=interval_start)
+    valid = frame["EQ"].notna().to_numpy()
+    frame = frame[valid]
+    durations = durations[valid]
+
+    eq = frame["EQ"].to_numpy(np.float64)
+    energy = pd.DataFrame({
+        "location": frame["location"].to_numpy(),
+        "timestamp": frame["timestamp"].to_numpy(),
+        "energy": np.power(10.0, eq / 10.0) * durations,
+        "duration": durations,
+        "max": frame["Max"].fillna(frame["EQ"]).to_numpy(np.float64),
+        "level": eq,
+    })
+    energy["location"] = energy["location"].astype(frame["location"].dtype)
+
+    grouped = energy.groupby(["location", "timestamp"], observed=True)
+    sums = grouped[["energy", "duration"]].sum()
+    result = pd.DataFrame(index=sums.index)
+    result["EQ"] = 10.0 * np.log10(sums["energy"] / sums["duration"])
+    result["Max"] = grouped["max"].max()
+    result["AE"] = 10.0 * np.log10(sums["energy"])
+
+    # Ln = level exceeded n% of the time = (100 - n)th percentile of the samples
+    quantiles = grouped["level"].quantile([0.9, 0.5, 0.1]).unstack()
+    result["10"] = quantiles[0.9]
+    result["50"] = quantiles[0.5]
+    result["90"] = quantiles[0.1]
+    return result.reset_index()
+
+
+def aggregate_monitoring_data(frame, kind, monitoring_frequency):
+    """
+    Aggregates a typed readings frame to the reporting interval and returns it as a MonitoringTable
+    (values rounded to the displayed precision), ready for insert_tables and insert_charts.
+    """
+    aggregate = aggregate_air if kind == "air" else aggregate_noise
+    return MonitoringTable.from_frame(aggregate(frame, monitoring_frequency), kind)
@@ -0,0 +1,229 @@
+"""
+Batch report generation: one report per project input, generated in a pool of worker processes.
+
+Usage (from the repository root):
+    python main.py --batch projects/ --output generated_reports/batch --workers 4
+    python main.py --batch manifest.json
+"""
+import json
+import os
+import re
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+SUMMARY_FILENAME = "batch_summary.json"
+
+# Placeholders holding file paths, resolved relative to the project file
+PATH_PLACEHOLDERS = ("monitoring_location_map", "company_logo")
+
+# Per-job options copied from project files / manifest entries (see `run_report_job`)
+JOB_OPTIONS = ("type", "format", "archive", "period")
+
+
+def _resolve_paths(placeholders, base_dir):
+    for key in PATH_PLACEHOLDERS:
+        value = placeholders.get(key)
+        if value and not os.path.isabs(value):
+            placeholders[key] = os.path.normpath(os.path.join(base_dir, value))
+
+    images = placeholders.get("monitoring_location_images") or {}
+    placeholders["monitoring_location_images"] = {
+        location: path if os.path.isabs(path) else os.path.normpath(os.path.join(base_dir, path))
+        for location, path in images.items()
+    }
+    return placeholders
+
+
+def _job_id(name):
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("._") or "project"
+
+
+def _load_project_file(path, job_id=None):
+    with open(path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+    placeholders = data.get("placeholders", data)
+    job_id = job_id or data.get("id") or os.path.splitext(os.path.basename(path))[0]
+    job = {"id": _job_id(job_id), "placeholders": _resolve_paths(placeholders, os.path.dirname(os.path.abspath(path)))}
+    job.update({key: data[key] for key in JOB_OPTIONS if key in data and "placeholders" in data})
+    return job
+
+
+def load_batch_jobs(source):
+    """
+    Loads batch jobs from a directory of project JSON files or from a manifest.
+
+    A project file holds the report placeholders (optionally under "placeholders", with an "id").
+    A manifest is a JSON list (or {"projects": [...]}) whose entries are project file paths or
+    inline {"id": ..., "placeholders": {...}} objects. Relative paths resolve against the file
+    that declares them. Optional "type", "format", "archive" and "period" entries pass through to the job
+    (see `run_report_job`).
+
+    :return: list of {"id": str, "placeholders": dict}
+    """
+    if os.path.isdir(source):
+        return [_load_project_file(os.path.join(source, name))
+                for name in sorted(os.listdir(source)) if name.lower().endswith(".json")]
+
+    with open(source, "r", encoding="utf-8") as file:
+        manifest = json.load(file)
+    entries = manifest.get("projects", []) if isinstance(manifest, dict) else manifest
+    base_dir = os.path.dirname(os.path.abspath(source))
+
+    jobs = []
+    for index, entry in enumerate(entries, start=1):
+        if isinstance(entry, str):
+            jobs.append(_load_project_file(os.path.join(base_dir, entry)))
+        else:
+            placeholders = _resolve_paths(dict(entry.get("placeholders", {})), base_dir)
+            job = {"id": _job_id(entry.get("id") or f"project_{index:03d}"), "placeholders": placeholders}
+            job.update({key: entry[key] for key in JOB_OPTIONS if key in entry})
+            jobs.append(job)
+
+    # Duplicate ids would share an output folder
+    seen = {}
+    for job in jobs:
+        count = seen.get(job["id"], 0)
+        seen[job["id"]] = count + 1
+        if count:
+            job["id"] = f"{job['id']}_{count + 1}"
+    return jobs
+
+
+def init_report_worker(plan_keys):
+    """
+    Runs once per worker: pays the heavy imports and the structure compiles before the first job.
+
+    :param plan_keys: (report type, report_parameters) pairs whose plans are compiled up front.
+    """
+    from monitoring import monitoringReport
+    from monitoring.reportTypes import get_report_type
+
+    monitoringReport.preload_report_dependencies()
+
+    # Workers are already parallel; nested chart pools would only oversubscribe the CPUs
+    monitoringReport.CONSTANTS["chart_workers"] = 1
+
+    for type_name, report_parameters in plan_keys:
+        try:
+            report_type = get_report_type(type_name)
+        except ValueError:  # Reported by the job itself
+            continue
+        monitoringReport.get_report_plan(monitoringReport.CONSTANTS[report_type.structure_key],
+                                         {"report_parameters": report_parameters}, monitoringReport.CONSTANTS,
+                                         report_type.section_names, monitoringReport.PROJECT_DIR)
+
+
+def _job_report_path(output_dir, job_id, filename):
+    """Joins the job's report path, refusing any name that resolves outside `output_dir/<job id>/`."""
+    job_dir = os.path.realpath(os.path.join(output_dir, job_id))
+    report_path = os.path.realpath(os.path.join(job_dir, filename))
+    if os.path.dirname(report_path) != job_dir:
+        raise ValueError(f"Report file name '{filename}' resolves outside the job folder")
+    return report_path
+
+
+def run_report_job(job, output_dir):
+    """
+    Generates one job's report into `output_dir/<job id>/`; failures are returned, not raised.
+
+    A job's optional "type" selects the report type (see reportTypes; default "monitoring") and "format"
+    the output: "docx" (default) or "pdf". With "archive" the job's locations and readings are saved to
+    the monitoring data store first; with "period" ({"start": ..., "end": ...}) the report's readings
+    are queried from the store for that range.
+    Word reports also record their package size breakdown (see docPackage.package_size_report).
+    """
+    from monitoring.docPackage import package_size_report
+    from monitoring.monitoringReport import CONSTANTS, generate_report, report_filename
+
+    start = time.perf_counter()
+    result = {"id": job["id"], "path": None, "seconds": None, "error": None}
+    try:
+        placeholders = job["placeholders"]
+        if job.get("archive") or job.get("period"):
+            placeholders = _bind_store(job, placeholders, CONSTANTS)
+        extension = ".pdf" if job.get("format", "docx") == "pdf" else ".docx"
+        report_path = _job_report_path(output_dir, job["id"], report_filename(placeholders, extension, job.get("type")))
+        if extension == ".pdf":
+            from monitoring.pdfReport import generate_pdf_report
+            result["path"] = generate_pdf_report(placeholders, report_path, job.get("type"))
+        else:
+            result["path"] = generate_report(placeholders, report_path, job.get("type"))
+            result["package"] = package_size_report(result["path"])
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["traceback"] = traceback.format_exc()
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    result["pid"] = os.getpid()
+    return result
+
+
+def _bind_store(job, placeholders, constants):
+    from monitoring.dataStore import get_monitoring_store
+
+    store = get_monitoring_store(constants)
+    if store is None:
+        return placeholders
+
+    if job.get("archive"):
+        try:
+            store.save_placeholders(placeholders)
+        except Exception as e:  # Archiving must never cost the user their report
+            print(f"⚠ Warning: Unable to archive monitoring data for {job['id']}. Error: {e}")
+    if job.get("period"):
+        placeholders = store.bind_placeholders(placeholders, job["period"].get("start"), job["period"].get("end"))
+    return placeholders
+
+
+def run_batch(jobs, output_dir, max_workers=None):
+    """
+    Generates every job's report in a process pool; each report is written to `output_dir/<job id>/`.
+
+    :return: Summary dict with per-report timings and failures (also written to batch_summary.json).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs) or 1))
+    plan_keys = sorted({(job.get("type") or "monitoring", str(job["placeholders"].get("report_parameters", "")))
+                        for job in jobs})
+
+    # Loaded once here, forked workers inherit the heavy modules instead of each importing them
+    from monitoring.monitoringReport import preload_report_dependencies
+    preload_report_dependencies()
+
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_report_worker,
+                             initargs=(plan_keys,)) as executor:
+        futures = {executor.submit(run_report_job, job, output_dir): job for job in jobs}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:  # Worker crashed (e.g. BrokenProcessPool)
+                result = {"id": futures[future]["id"], "path": None, "seconds": None,
+                          "error": f"{type(e).__name__}: {e}"}
+            results.append(result)
+            status = "✅" if result["error"] is None else "❌"
+            print(f"{status} [{len(results)}/{len(jobs)}] {result['id']} ({result['seconds']} s)"
+                  + (f" - {result['error']}" if result["error"] else ""))
+
+    results.sort(key=lambda result: result["id"])
+    failures = [result for result in results if result["error"]]
+    timings = [result["seconds"] for result in results if result["error"] is None]
+    summary = {
+        "reports": len(jobs),
+        "succeeded": len(jobs) - len(failures),
+        "failed": len(failures),
+        "workers": max_workers,
+        "wall_seconds": round(time.perf_counter() - start, 3),
+        "mean_report_seconds": round(sum(timings) / len(timings), 3) if timings else None,
+        "max_report_seconds": max(timings) if timings else None,
+        "results": results,
+    }
+
+    with open(os.path.join(output_dir, SUMMARY_FILENAME), "w", encoding="utf-8") as file:
+        json.dump(summary, file, indent=2)
+
+    print(f"📦 Batch complete: {summary['succeeded']}/{summary['reports']} report(s) in {summary['wall_seconds']} s "
+          f"with {max_workers} worker(s). Summary: {os.path.join(output_dir, SUMMARY_FILENAME)}")
+    return summary
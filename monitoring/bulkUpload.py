@@ -0,0 +1,358 @@
+"""
+Bulk upload of monitoring locations and air / noise readings from CSV or XLSX files.
+
+Files are read in chunks of UPLOAD_CHUNK_ROWS and each chunk is validated column by column (types, ranges,
+timestamps, known location IDs) rather than row by row. Accepted rows come back in the layout of the UI
+tables (strings, timestamps normalised to TIME_FORMAT so the report parses them on the fast path) and
+every rejected row is listed in a row-level error report.
+"""
+import csv
+import os
+from dataclasses import dataclass, field
+
+from monitoring.instrumentLogs import (AIR_COLUMN_ALIASES, DATETIME_ALIASES, LOCATION_ALIASES, MISSING_VALUES,
+                                       NOISE_COLUMN_ALIASES, TIME_ALIASES, normalise_header)
+from monitoring.monitoringTable import KIND_HEADERS, TIME_FORMAT, parse_times, parse_values
+
+
+UPLOAD_CHUNK_ROWS = 50_000
+
+LOCATION_HEADERS = ("Monitoring Location", "Description", "Latitude", "Longitude")
+
+# Plausible measurement ranges (μg/m³ for air, dB for noise); values outside are rejected as entry errors
+VALUE_RANGES = {
+    "air": (0.0, 100_000.0),
+    "noise": (0.0, 200.0),
+}
+
+COORDINATE_RANGES = {
+    "Latitude": (-90.0, 90.0),
+    "Longitude": (-180.0, 180.0),
+}
+
+ERROR_REPORT_HEADERS = ("Row", "Column", "Value", "Error")
+
+# Header spellings accepted per column (normalised, see `instrumentLogs.normalise_header`)
+UPLOAD_COLUMN_ALIASES = {
+    "locations": {
+        "Monitoring Location": LOCATION_ALIASES,
+        "Description": ("description",),
+        "Latitude": ("latitude", "lat"),
+        "Longitude": ("longitude", "lon", "long", "lng"),
+    },
+    "air": {"Monitoring Location": LOCATION_ALIASES,
+            "Time": ("date and time",) + DATETIME_ALIASES + TIME_ALIASES,
+            **AIR_COLUMN_ALIASES},
+    "noise": {"Monitoring Location": LOCATION_ALIASES,
+              "Time": ("date and time",) + DATETIME_ALIASES + TIME_ALIASES,
+              **NOISE_COLUMN_ALIASES},
+}
+
+
+@dataclass
+class UploadResult:
+    """Outcome of one upload: accepted rows (UI table layout), the row-level error report and counts."""
+    kind: str
+    rows: list = field(default_factory=list)
+    errors: list = field(default_factory=list)     # [spreadsheet row, column, value, message]
+    total_rows: int = 0
+
+    @property
+    def rejected_rows(self):
+        return len({error[0] for error in self.errors})
+
+    def summary(self):
+        label = "location(s)" if self.kind == "locations" else f"{self.kind} reading(s)"
+        message = f"✅ Imported {len(self.rows)} of {self.total_rows} {label}."
+        if self.errors:
+            message += f" ⚠ {self.rejected_rows} row(s) rejected, see the error report."
+        return message
+
+
+def match_columns(headers, kind):
+    """
+    Maps schema columns to the uploaded file's headers (exact names, or any known spelling with units stripped).
+
+    :raises ValueError: when a required column is missing.
+    """
+    normalised = {normalise_header(str(header)).replace(" ", ""): header for header in headers}
+    columns = {}
+    for name, aliases in UPLOAD_COLUMN_ALIASES[kind].items():
+        for alias in (name.lower(),) + tuple(aliases):
+            header = normalised.get(alias.replace(" ", ""))
+            if header is not None:
+                columns[name] = header
+                break
+
+    required = LOCATION_HEADERS if kind == "locations" else KIND_HEADERS[kind]
+    missing = [name for name in required if name not in columns and name != "Description"]
+    if missing:
+        raise ValueError(f"The file has no column for {', '.join(missing)}")
+    return columns
+
+
+def iter_upload_chunks(path, chunk_rows=UPLOAD_CHUNK_ROWS):
+    """
+    Reads a CSV or XLSX upload in frames of at most `chunk_rows` rows, every cell as stripped text.
+    `frame.attrs["decimal_comma"]` is set for semicolon/tab separated CSVs.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".xlsx", ".xlsm"):
+        yield from _iter_xlsx_chunks(path, chunk_rows)
+    elif extension in (".csv", ".txt"):
+        yield from _iter_csv_chunks(path, chunk_rows)
+    else:
+        raise ValueError(f"Unsupported file type '{extension or path}'. Upload a .csv or .xlsx file.")
+
+
+def _iter_csv_chunks(path, chunk_rows):
+    import pandas as pd
+
+    with open(path, "r", encoding="utf-8-sig", errors="replace", newline="") as file:
+        first_line = file.readline()
+    counts = {delimiter: first_line.count(delimiter) for delimiter in (",", ";", "\t")}
+    delimiter = max(counts, key=counts.get)
+
+    for chunk in pd.read_csv(path, sep=delimiter, dtype=str, keep_default_na=False, encoding="utf-8-sig",
+                             encoding_errors="replace", chunksize=chunk_rows):
+        chunk = chunk.apply(lambda column: column.str.strip())
+        chunk.attrs["decimal_comma"] = delimiter != ","
+        yield chunk
+
+
+def _iter_xlsx_chunks(path, chunk_rows):
+    import pandas as pd
+
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise ValueError("Reading .xlsx files requires openpyxl (pip install openpyxl), or upload a .csv") from e
+
+    # Streaming (read-only) workbook: rows are materialised one chunk at a time
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        headers = [_cell_text(cell) for cell in next(rows, ())]
+        width = len(headers)
+        chunk = []
+        for row in rows:
+            chunk.append([_cell_text(cell) for cell in row[:width]] + [""] * (width - len(row)))
+            if len(chunk) == chunk_rows:
+                yield pd.DataFrame(chunk, columns=headers)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=headers)
+    finally:
+        workbook.close()
+
+
+def _cell_text(value):
+    """Spreadsheet cell -> text as it would have been typed (dates in TIME_FORMAT, numbers without '.0')."""
+    from datetime import datetime
+
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.strftime(TIME_FORMAT if value.second == 0 else TIME_FORMAT + ":%S")
+    if isinstance(value, float):
+        return f"{value:.15g}"
+    return str(value).strip()
+
+
+class _Rejections:
+    """Collects rejected cells for one chunk as boolean masks, expanded to error rows once."""
+
+    def __init__(self, size, first_row):
+        import numpy as np
+
+        self.rejected = np.zeros(size, dtype=bool)
+        self.first_row = first_row
+        self.errors = []
+
+    def add(self, mask, column, values, message):
+        import numpy as np
+
+        indices = np.flatnonzero(mask)
+        if len(indices):
+            self.rejected[indices] = True
+            self.errors.extend([int(index) + self.first_row, column, str(values[index]), message]
+                               for index in indices)
+
+
+def validate_readings(frame, kind, known_locations=None, first_row=2):
+    """
+    Validates one chunk of uploaded air / noise readings in a vectorised pass.
+
+    Blank measurement cells (or MISSING_VALUES spellings) are kept as missing; a reading needs a location,
+    a readable timestamp and at least one measurement, and every measurement must be a number in
+    VALUE_RANGES. With `known_locations`, location IDs must be among them.
+
+    :param first_row: Spreadsheet row number of the chunk's first row (the header is row 1).
+    :return: (accepted rows, errors, spreadsheet row numbers of the accepted rows)
+    """
+    import numpy as np
+    import pandas as pd
+
+    columns = match_columns(frame.columns, kind)
+    headers = KIND_HEADERS[kind]
+    text = {name: frame[columns[name]].to_numpy(dtype=object).astype(str) for name in headers}
+
+    blank = np.logical_and.reduce([text[name] == "" for name in headers])
+    checks = _Rejections(len(frame), first_row)
+
+    locations = text["Monitoring Location"]
+    checks.add(~blank & (locations == ""), "Monitoring Location", locations, "missing location")
+    if known_locations:
+        checks.add((locations != "") & ~np.isin(locations, list(known_locations)), "Monitoring Location", locations,
+                   "unknown location (add it to the locations table first)")
+
+    times = text["Time"]
+    timestamp = parse_times(times.astype(object))
+    checks.add(~blank & (times == ""), "Time", times, "missing timestamp")
+    checks.add((times != "") & pd.isna(timestamp), "Time", times, "unreadable timestamp (use DD/MM/YYYY HH:MM)")
+
+    low, high = VALUE_RANGES[kind]
+    cleaned = {}
+    measured = np.zeros(len(frame), dtype=bool)
+    for name in headers[2:]:
+        raw = text[name]
+        cells = np.where(np.isin(np.char.lower(raw), list(MISSING_VALUES)), "", raw)
+        if frame.attrs.get("decimal_comma"):
+            cells = np.char.replace(cells, ",", ".")
+        values = parse_values(cells.astype(object))
+        checks.add(np.isnan(values) & (cells != ""), name, raw, "not a number")
+        checks.add((values < low) | (values > high), name, raw, f"outside the range {low:g} to {high:g}")
+        cleaned[name] = cells
+        measured |= ~np.isnan(values)
+    checks.add(~blank & ~measured & ~checks.rejected, "", locations, "no measurements")
+
+    keep = ~blank & ~checks.rejected
+    display_times = _format_times(timestamp[keep])
+    value_rows = np.column_stack([cleaned[name][keep] for name in headers[2:]]).tolist()
+    rows = [[location, time] + values
+            for location, time, values in zip(locations[keep].tolist(), display_times, value_rows)]
+    return rows, checks.errors, (np.flatnonzero(keep) + first_row).tolist()
+
+
+def _format_times(timestamp):
+    """datetime64 array -> TIME_FORMAT strings (with seconds where a reading has them)."""
+    import numpy as np
+    import pandas as pd
+
+    index = pd.DatetimeIndex(timestamp)
+    return np.where(index.second == 0, index.strftime(TIME_FORMAT), index.strftime(TIME_FORMAT + ":%S")).tolist()
+
+
+def validate_locations(frame, existing_locations=(), first_row=2):
+    """
+    Validates one chunk of uploaded monitoring locations: an ID that isn't already listed, and latitude /
+    longitude in range (decimal or degrees / minutes / seconds, see `locations.parse_coordinates`; the
+    text is kept as entered).
+
+    :return: (accepted rows, errors)
+    """
+    import numpy as np
+    import pandas as pd
+    from monitoring.locations import parse_coordinates
+
+    columns = match_columns(frame.columns, "locations")
+    text = {name: (frame[columns[name]].to_numpy(dtype=object).astype(str) if name in columns
+                   else np.full(len(frame), "", dtype=object).astype(str)) for name in LOCATION_HEADERS}
+
+    blank = np.logical_and.reduce([text[name] == "" for name in LOCATION_HEADERS])
+    checks = _Rejections(len(frame), first_row)
+
+    codes = text["Monitoring Location"]
+    checks.add(~blank & (codes == ""), "Monitoring Location", codes, "missing location")
+    checks.add((codes != "") & np.isin(codes, list(existing_locations)), "Monitoring Location", codes,
+               "location is already listed")
+    checks.add((codes != "") & pd.Series(codes).duplicated().to_numpy(), "Monitoring Location", codes,
+               "duplicate location in the file")
+
+    for name, (low, high) in COORDINATE_RANGES.items():
+        raw = text[name]
+        values = parse_coordinates(raw)
+        checks.add(~blank & (raw == ""), name, raw, f"missing {name.lower()}")
+        checks.add((raw != "") & np.isnan(values), name, raw, "not a coordinate")
+        checks.add((values < low) | (values > high), name, raw, f"outside the range {low:g} to {high:g}")
+
+    keep = ~blank & ~checks.rejected
+    rows = np.column_stack([text[name][keep] for name in LOCATION_HEADERS]).tolist()
+    return rows, checks.errors
+
+
+def upload_readings(path, kind, known_locations=None, existing_rows=(), chunk_rows=UPLOAD_CHUNK_ROWS):
+    """
+    Reads and validates an air / noise readings file.
+
+    Readings repeating a location and time (within the file, or already in `existing_rows`) are rejected.
+
+    :return: UploadResult with the accepted rows in UI table layout.
+    """
+    import numpy as np
+    import pandas as pd
+
+    result = UploadResult(kind)
+    seen = {(row[0], row[1]) for row in existing_rows}
+    first_row = 2
+    for chunk in iter_upload_chunks(path, chunk_rows):
+        rows, errors, row_numbers = validate_readings(chunk, kind, known_locations, first_row)
+        result.errors.extend(errors)
+
+        # Duplicate check on the accepted rows' (location, normalised time) keys
+        keys = pd.MultiIndex.from_arrays([[row[0] for row in rows], [row[1] for row in rows]])
+        duplicate = keys.duplicated() | np.array([key in seen for key in keys], dtype=bool)
+        for index in np.flatnonzero(duplicate):
+            result.errors.append([row_numbers[index], "Time", rows[index][1],
+                                  "duplicate reading (same location and time)"])
+        seen.update(keys[~duplicate])
+        result.rows.extend(row for row, is_duplicate in zip(rows, duplicate) if not is_duplicate)
+        result.total_rows += len(rows) + len({error[0] for error in errors})
+        first_row += len(chunk)
+
+    result.errors.sort(key=lambda error: error[0])
+    return result
+
+
+def upload_locations(path, existing_locations=(), chunk_rows=UPLOAD_CHUNK_ROWS):
+    """Reads and validates a monitoring locations file. :return: UploadResult."""
+    result = UploadResult("locations")
+    existing = set(existing_locations)
+    first_row = 2
+    for chunk in iter_upload_chunks(path, chunk_rows):
+        rows, errors = validate_locations(chunk, existing, first_row)
+        result.rows.extend(rows)
+        result.errors.extend(errors)
+        existing.update(row[0] for row in rows)
+        result.total_rows += len(rows) + len({error[0] for error in errors})
+        first_row += len(chunk)
+
+    result.errors.sort(key=lambda error: error[0])
+    return result
+
+
+def write_error_report(errors, path):
+    """Writes the row-level error report as CSV (Row, Column, Value, Error)."""
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(ERROR_REPORT_HEADERS)
+        writer.writerows(errors)
+    return path
+
+
+def entry_frame(values, headers):
+    """One manually entered row as a frame, so single entries go through the same validation as uploads."""
+    import pandas as pd
+
+    return pd.DataFrame([["" if value is None else str(value).strip() for value in values]], columns=list(headers))
+
+
+def describe_errors(errors, limit=5, with_rows=True):
+    """Short text for the first `limit` errors, e.g. 'row 6, CO: not a number (abc)'."""
+    lines = []
+    for row, column, value, message in errors[:limit]:
+        where = ", ".join(part for part in (f"row {row}" if with_rows else "", column) if part)
+        lines.append(f"{where + ': ' if where else ''}{message}" + (f" ({value})" if value else ""))
+    if len(errors) > limit:
+        lines.append(f"… and {len(errors) - limit} more")
+    return "; ".join(lines)
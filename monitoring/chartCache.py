@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+import tempfile
+
+
+DEFAULT_CACHE_DIR = ".chloris_cache"
+DEFAULT_CHART_CACHE_MB = 256
+# Puts between directory rescans; in between, the size written by this process is tracked instead
+EVICT_SCAN_INTERVAL = 64
+
+_caches = {}
+
+
+def chart_cache_key(spec, profile, style_version):
+    """Hashes everything that affects a chart's pixels: series, locations, standard line, style and profile."""
+    payload = json.dumps({"spec": spec, "profile": profile, "style": style_version},
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    Persistent, size-bounded disk cache (rendered charts, report sections, prepared images).
+
+    Entries are stored as `<key><suffix>` files (e.g. `.png` for charts; `suffix` may be a tuple when entries
+    come in several formats, the first being the default for `put`); a hit refreshes the file's mtime,
+    and the least recently used files are evicted once the directory exceeds `max_bytes`. The directory
+    is only rescanned when this process's running size estimate passes `max_bytes`, or every
+    EVICT_SCAN_INTERVAL puts to pick up what other processes wrote.
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_CHART_CACHE_MB * 1024 * 1024, suffix=".png"):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.suffixes = (suffix,) if isinstance(suffix, str) else tuple(suffix)
+        self.suffix = self.suffixes[0]
+        self.hits = 0
+        self.misses = 0
+        self._estimated_bytes = None  # Unknown until the first scan
+        self._puts_since_scan = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key, suffix=None):
+        return os.path.join(self.cache_dir, f"{key}{suffix or self.suffix}")
+
+    def get(self, key):
+        """Returns the cached bytes for `key`, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return data
+
+    def lookup(self, key):
+        """Returns the path of the cached entry for `key` (any suffix), or None on a miss."""
+        for suffix in self.suffixes:
+            path = self._path(key, suffix)
+            try:
+                os.utime(path)  # Mark as recently used
+            except OSError:
+                continue
+            self.hits += 1
+            return path
+
+        self.misses += 1
+        return None
+
+    def put(self, key, data):
+        """
+        Stores bytes under `key` (atomically, so concurrent reports never read partial files); returns the
+        entry's path, or None when it could not be stored.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+        except OSError as e:
+            print(f"⚠ Warning: Unable to write cache entry in {self.cache_dir}. Error: {e}")
+            os.remove(tmp_path)
+            return None
+        return self.put_file(key, tmp_path)
+
+    def put_file(self, key, tmp_path, suffix=None):
+        """
+        Moves a file written in `cache_dir` (e.g. by `tempfile.mkstemp(dir=cache.cache_dir)`) into the
+        cache under `key`; returns the entry's path, or None when it could not be stored.
+        """
+        path = self._path(key, suffix)
+        try:
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠ Warning: Unable to write cache entry in {self.cache_dir}. Error: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+
+        self._puts_since_scan += 1
+        if self._estimated_bytes is not None:
+            self._estimated_bytes += size
+        if (self._estimated_bytes is None or self._estimated_bytes > self.max_bytes
+                or self._puts_since_scan >= EVICT_SCAN_INTERVAL):
+            self.evict(keep=path)
+        return path
+
+    def evict(self, keep=None):
+        """
+        Removes least recently used entries until the cache fits within `max_bytes`, never removing
+        `keep` (the entry just stored, which the caller is about to use).
+        """
+        entries = []
+        total_bytes = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(self.suffixes):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:  # Evicted by another report or chart worker since the scan
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_bytes += stat.st_size
+
+        self._puts_since_scan = 0
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_bytes -= size
+        self._estimated_bytes = total_bytes
+
+    def stats(self):
+        """Returns hit/miss counters for this process."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+
+def get_disk_cache(cache_dir, max_mb, suffix=".png"):
+    """
+    Returns the process-wide cache for (`cache_dir`, `max_mb`, `suffix`), or None when `max_mb` is 0.
+
+    Instances are keyed on their settings, so a changed cache directory or size limit gets its own cache
+    instead of silently reusing the first one created.
+    """
+    if not max_mb:
+        return None
+
+    key = (os.path.abspath(cache_dir), int(max_mb * 1024 * 1024), suffix)
+    cache = _caches.get(key)
+    if cache is None:
+        cache = _caches[key] = DiskCache(cache_dir, max_bytes=key[1], suffix=suffix)
+    return cache
+
+
+def get_chart_cache(constants):
+    """Returns the chart cache configured in constants.json, or None when disabled."""
+    return get_disk_cache(os.path.join(constants.get("cache_dir", DEFAULT_CACHE_DIR), "charts"),
+                          constants.get("chart_cache_max_mb", DEFAULT_CHART_CACHE_MB))
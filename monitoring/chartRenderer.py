@@ -0,0 +1,263 @@
+import io
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
+
+from monitoring.chartCache import chart_cache_key
+
+# Default chart profile (matches the original 6x4in @ 300 dpi charts placed at 4in wide)
+DEFAULT_CHART_PROFILE = {
+    "dpi": 300,
+    "width": 6,
+    "height": 4,
+    "display_width": 4
+}
+
+# Bump whenever render_chart's styling changes so cached charts are invalidated
+CHART_STYLE_VERSION = 3
+
+_executor = None
+_executor_workers = None
+
+
+def resolve_chart_profile(constants, profile_name=None):
+    """Returns the chart profile selected in constants.json, falling back to the default profile."""
+    profiles = constants.get("chart_profiles", {})
+    profile_name = profile_name or constants.get("chart_profile")
+
+    profile = dict(DEFAULT_CHART_PROFILE)
+    if profile_name:
+        if profile_name in profiles:
+            profile.update(profiles[profile_name])
+        else:
+            print(f"⚠ Warning: Chart profile '{profile_name}' not found. Using default profile.")
+
+    return profile
+
+
+def render_chart(spec, profile):
+    """
+    Renders a single pollutant bar chart into PNG bytes (`"chart": "trend"` and `"chart": "location_map"`
+    specs dispatch to `render_trend_chart` / `render_location_map`).
+
+    Uses a bare matplotlib Figure (no pyplot state) so it is safe to call from worker processes.
+
+    :param spec: Chart spec with monitoring_type, pollutant, locations, values, standard, standard_label and
+                 y_axis_label.
+    :param profile: Chart profile with dpi, width and height.
+    :return: PNG image bytes.
+    """
+    if spec.get("chart") == "trend":
+        return render_trend_chart(spec, profile)
+    if spec.get("chart") == "location_map":
+        return render_location_map(spec, profile)
+
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(profile["width"], profile["height"]))
+    ax = fig.subplots()
+
+    pollutant = spec["pollutant"]
+    y_axis_label = spec["y_axis_label"]
+
+    # ✅ Plot bars
+    ax.bar(spec["locations"], spec["values"], color='#1f77b4', width=0.4, label=f"{pollutant} Levels")
+
+    # ✅ Add a horizontal benchmark line if applicable
+    standard = spec.get("standard")
+    if standard is not None:
+        ax.axhline(y=standard, color='red', linestyle='--', linewidth=2,
+                   label=f"{spec.get('standard_label') or 'Standard'} ({standard:g} {y_axis_label})")
+
+    # ✅ Labels and title
+    ax.set_xlabel("Monitoring Locations")
+    ax.set_ylabel(y_axis_label)
+    ax.set_title(f"{spec['monitoring_type']} - {pollutant} Levels")
+    ax.legend()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=profile["dpi"], bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def render_trend_chart(spec, profile):
+    """
+    Renders one location / parameter time series: the (decimated) readings, their rolling mean and the
+    standard line, into PNG bytes.
+
+    :param spec: Trend spec (see `trendReport.trend_chart_specs`): timestamps as epoch seconds, values,
+                 rolling, rolling_label, location, pollutant, standard, standard_label, monitoring_type and
+                 y_axis_label.
+    """
+    import numpy as np
+    from matplotlib.dates import AutoDateLocator, ConciseDateFormatter
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(profile["width"], profile["height"]))
+    ax = fig.subplots()
+
+    pollutant = spec["pollutant"]
+    y_axis_label = spec["y_axis_label"]
+    timestamps = np.array(spec["timestamps"], dtype="datetime64[s]")
+
+    # ✅ Readings as a thin line, the rolling mean on top
+    ax.plot(timestamps, spec["values"], color='#1f77b4', linewidth=0.6, label=f"{pollutant} Levels")
+    if spec.get("rolling"):
+        ax.plot(timestamps, spec["rolling"], color='#ff7f0e', linewidth=1.5, label=spec["rolling_label"])
+
+    standard = spec.get("standard")
+    if standard is not None:
+        ax.axhline(y=standard, color='red', linestyle='--', linewidth=1.5,
+                   label=f"{spec.get('standard_label') or 'Standard'} ({standard:g} {y_axis_label})")
+
+    locator = AutoDateLocator()
+    ax.xaxis.set_major_locator(locator)
+    ax.xaxis.set_major_formatter(ConciseDateFormatter(locator))
+    ax.set_ylabel(y_axis_label)
+    ax.set_title(f"{spec['monitoring_type']} - {spec['location']} - {pollutant} Trend")
+    ax.legend(loc="upper right", fontsize="small")
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=profile["dpi"], bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def _scale_bar_length(span_m):
+    """Round scale bar length (1, 2 or 5 x 10^n metres) of about a quarter of the map width."""
+    target = max(span_m / 4, 1.0)
+    magnitude = 10 ** math.floor(math.log10(target))
+    return max(step * magnitude for step in (1, 2, 5) if step * magnitude <= target)
+
+
+def render_location_map(spec, profile):
+    """
+    Renders the monitoring locations as labelled points on a plain lat/long grid (no map tiles, so it
+    works offline), with a scale bar and north arrow, into PNG bytes.
+
+    :param spec: Location map spec (see `locations.location_map_spec`): names, descriptions, latitudes
+                 and longitudes in decimal degrees.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import MaxNLocator
+
+    latitudes, longitudes = spec["latitudes"], spec["longitudes"]
+    mid_lat = (min(latitudes) + max(latitudes)) / 2
+    lon_scale = max(math.cos(math.radians(mid_lat)), 0.01)
+
+    # Extent: the points plus a margin, at least ~500 m across, in the figure's aspect ratio
+    aspect = profile["width"] / profile["height"]
+    lat_span = max(max(latitudes) - min(latitudes), 0.0045) * 1.3
+    lon_span = max(max(longitudes) - min(longitudes), 0.0045 / lon_scale) * 1.3
+    if lon_span * lon_scale / lat_span < aspect:
+        lon_span = lat_span * aspect / lon_scale
+    else:
+        lat_span = lon_span * lon_scale / aspect
+    mid_lon = (min(longitudes) + max(longitudes)) / 2
+
+    fig = Figure(figsize=(profile["width"], profile["height"]))
+    ax = fig.subplots()
+    ax.set_facecolor('#eef3f7')
+    ax.set_xlim(mid_lon - lon_span / 2, mid_lon + lon_span / 2)
+    ax.set_ylim(mid_lat - lat_span / 2, mid_lat + lat_span / 2)
+    ax.set_aspect(1 / lon_scale)
+    ax.grid(True, color='white', linewidth=1)
+    ax.xaxis.set_major_locator(MaxNLocator(5))
+    ax.ticklabel_format(useOffset=False, style='plain')
+    ax.tick_params(labelsize='small')
+    ax.set_xlabel("Longitude (°)")
+    ax.set_ylabel("Latitude (°)")
+
+    ax.scatter(longitudes, latitudes, marker='^', s=70, color='#d62728', edgecolors='black', linewidths=0.6,
+               zorder=3)
+    for name, description, lat, lon in zip(spec["names"], spec["descriptions"], latitudes, longitudes):
+        label = f"{name}\n{description}" if description else name
+        ax.annotate(label, (lon, lat), xytext=(6, 6), textcoords='offset points', fontsize='small', zorder=4,
+                    bbox={"boxstyle": "round,pad=0.2", "facecolor": 'white', "edgecolor": '#999999', "alpha": 0.9})
+
+    # ✅ Scale bar (lower left) and north arrow (upper right)
+    span_m = lon_span * lon_scale * 111_320
+    bar_m = _scale_bar_length(span_m)
+    x0, y0 = mid_lon - lon_span * 0.45, mid_lat - lat_span * 0.43
+    ax.plot([x0, x0 + bar_m / (111_320 * lon_scale)], [y0, y0], color='black', linewidth=3, solid_capstyle='butt')
+    ax.text(x0, y0 + lat_span * 0.02, f"{bar_m / 1000:g} km" if bar_m >= 1000 else f"{bar_m:g} m",
+            fontsize='small', va='bottom')
+    ax.annotate("N", xy=(0.95, 0.95), xytext=(0.95, 0.82), xycoords='axes fraction', textcoords='axes fraction',
+                ha='center', va='center', fontweight='bold',
+                arrowprops={"arrowstyle": '-|>', "color": 'black', "linewidth": 1.5})
+
+    ax.set_title("Environmental Monitoring Locations")
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=profile["dpi"], bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def get_chart_executor(max_workers=None):
+    """Returns the shared chart process pool, creating it on first use so workers are reused across reports."""
+    global _executor, _executor_workers
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if _executor is None or _executor_workers != max_workers:
+        shutdown_chart_executor()
+        _executor = ProcessPoolExecutor(max_workers=max_workers)
+        _executor_workers = max_workers
+
+    return _executor
+
+
+def shutdown_chart_executor():
+    """Shuts down the shared chart process pool (if running)."""
+    global _executor, _executor_workers
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+    _executor = None
+    _executor_workers = None
+
+
+def render_charts(specs, profile=None, max_workers=None, cache=None):
+    """
+    Renders all chart specs into PNG bytes, in a process pool when more than one worker is available.
+
+    :param specs: List of chart specs (see `render_chart`).
+    :param profile: Chart profile; defaults to DEFAULT_CHART_PROFILE.
+    :param max_workers: Worker process count; defaults to the CPU count. 1 forces serial rendering.
+    :param cache: Optional DiskCache; cached charts are returned without invoking matplotlib.
+    :return: List of PNG bytes in the same order as `specs`.
+    """
+    profile = profile or DEFAULT_CHART_PROFILE
+    max_workers = max_workers or os.cpu_count() or 1
+
+    results = [None] * len(specs)
+    keys = [None] * len(specs)
+    pending = []
+
+    # ✅ Serve unchanged charts straight from cache
+    for index, spec in enumerate(specs):
+        if cache is not None:
+            keys[index] = chart_cache_key(spec, profile, CHART_STYLE_VERSION)
+            results[index] = cache.get(keys[index])
+        if results[index] is None:
+            pending.append(index)
+
+    pending_specs = [specs[index] for index in pending]
+    for index, chart_png in zip(pending, _render_uncached(pending_specs, profile, max_workers)):
+        results[index] = chart_png
+        if cache is not None:
+            cache.put(keys[index], chart_png)
+
+    return results
+
+
+def _render_uncached(specs, profile, max_workers):
+    if len(specs) <= 1 or max_workers <= 1:
+        return [render_chart(spec, profile) for spec in specs]
+
+    try:
+        executor = get_chart_executor(max_workers)
+        return list(executor.map(render_chart, specs, repeat(profile)))
+    except BrokenProcessPool as e:
+        print(f"⚠ Warning: Chart process pool failed ({e}). Rendering charts serially.")
+        shutdown_chart_executor()
+        return [render_chart(spec, profile) for spec in specs]
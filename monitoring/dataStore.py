@@ -0,0 +1,348 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from itertools import repeat
+
+from monitoring.reportPlan import AIR_QUALITY_HEADERS, NOISE_QUALITY_HEADERS
+
+
+DEFAULT_STORE_FILE = "monitoring_data.sqlite3"
+
+KIND_PARAMETERS = {
+    "air": AIR_QUALITY_HEADERS[2:],
+    "noise": NOISE_QUALITY_HEADERS[2:],
+}
+
+# Readings are keyed (project, location, parameter, timestamp): the primary key is the index every
+# range query walks, and WITHOUT ROWID stores the rows in that order (no separate index b-tree)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    number TEXT NOT NULL UNIQUE,
+    name TEXT,
+    location TEXT
+);
+CREATE TABLE IF NOT EXISTS locations (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL REFERENCES projects(id),
+    code TEXT NOT NULL,
+    description TEXT,
+    latitude TEXT,
+    longitude TEXT,
+    UNIQUE (project_id, code)
+);
+CREATE TABLE IF NOT EXISTS parameters (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    UNIQUE (kind, name)
+);
+CREATE TABLE IF NOT EXISTS readings (
+    project_id INTEGER NOT NULL,
+    location_id INTEGER NOT NULL,
+    parameter_id INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (project_id, location_id, parameter_id, timestamp)
+) WITHOUT ROWID;
+"""
+
+# Typed row of a readings query (see `MonitoringStore.query_readings`)
+READING_DTYPE = [("location", "i8"), ("parameter", "i8"), ("timestamp", "i8"), ("value", "f8")]
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def _epoch_seconds(value):
+    """datetime / date string / numpy or pandas timestamp -> epoch seconds (naive site-local time)."""
+    import pandas as pd
+
+    if value is None:
+        return None
+    return int(pd.Timestamp(value).value // 1_000_000_000)
+
+
+class MonitoringStore:
+    """
+    Embedded SQLite store for projects, monitoring locations and typed readings.
+
+    Readings are stored long-format (one row per location, parameter and timestamp) with epoch-second
+    timestamps, so a month of one project or a year-long trend of one parameter is a primary-key range
+    scan. Query results come back as typed readings frames (see `aggregation.frame_from_readings`),
+    which `bind_raw_readings` aggregates like any other raw readings.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")   # Readers don't block the writer (UI + batch)
+            connection.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per call: safe from UI handler threads and forked workers
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    # ---- Projects and locations ----
+
+    @staticmethod
+    def _project_id(connection, project_number, name=None, location=None):
+        number = project_number.strip()
+        connection.execute(
+            "INSERT INTO projects (number, name, location) VALUES (?, ?, ?) "
+            "ON CONFLICT (number) DO UPDATE SET name = coalesce(excluded.name, name), "
+            "location = coalesce(excluded.location, location)",
+            (number, name, location))
+        return connection.execute("SELECT id FROM projects WHERE number = ?", (number,)).fetchone()[0]
+
+    def add_project(self, project_number, name=None, location=None):
+        """Creates (or updates) a project keyed by its project number; returns its id."""
+        with self._connect() as connection:
+            return self._project_id(connection, project_number, name, location)
+
+    def add_locations(self, project_number, monitoring_locations):
+        """
+        Upserts monitoring locations from a `monitoring_locations` placeholder
+        (header row, then [code, description, latitude, longitude] rows).
+        """
+        with self._connect() as connection:
+            project_id = self._project_id(connection, project_number)
+            connection.executemany(
+                "INSERT INTO locations (project_id, code, description, latitude, longitude) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (project_id, code) DO UPDATE SET description = excluded.description, "
+                "latitude = excluded.latitude, longitude = excluded.longitude",
+                [(project_id, str(row[0]).strip(), *(list(row[1:4]) + [None] * (4 - len(row)))[:3])
+                 for row in monitoring_locations[1:] if row and str(row[0]).strip()])
+
+    def locations(self, project_number):
+        """Returns the project's `monitoring_locations` rows (header row first)."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT l.code, l.description, l.latitude, l.longitude FROM locations l "
+                "JOIN projects p ON p.id = l.project_id WHERE p.number = ? ORDER BY l.code",
+                (project_number.strip(),)).fetchall()
+        return [["Monitoring Location", "Description", "Latitude", "Longitude"]] + \
+            [["" if value is None else value for value in row] for row in rows]
+
+    @staticmethod
+    def _location_ids(connection, project_id, codes):
+        connection.executemany("INSERT OR IGNORE INTO locations (project_id, code) VALUES (?, ?)",
+                               [(project_id, code) for code in codes])
+        return dict(connection.execute("SELECT code, id FROM locations WHERE project_id = ?", (project_id,)))
+
+    @staticmethod
+    def _parameter_ids(connection, kind):
+        connection.executemany("INSERT OR IGNORE INTO parameters (kind, name) VALUES (?, ?)",
+                               [(kind, name) for name in KIND_PARAMETERS[kind]])
+        return dict(connection.execute("SELECT name, id FROM parameters WHERE kind = ?", (kind,)))
+
+    # ---- Readings ----
+
+    def insert_readings(self, project_number, kind, frame):
+        """
+        Bulk-inserts a typed readings frame (location, timestamp, one float column per parameter).
+
+        Missing values are skipped; a reading already stored for the same location, parameter and
+        timestamp is replaced, so re-importing a week is idempotent.
+
+        :return: Number of values written.
+        """
+        import numpy as np
+        import pandas as pd
+
+        parameters = [name for name in KIND_PARAMETERS[kind] if name in frame.columns]
+        frame = frame[frame["timestamp"].notna()]
+        if frame.empty or not parameters:
+            return 0
+
+        locations = frame["location"].astype(str).to_numpy()
+        timestamps = frame["timestamp"].to_numpy("datetime64[ns]").astype(np.int64) // 1_000_000_000
+        values = frame[parameters].to_numpy(np.float64)
+
+        written = 0
+        with self._connect() as connection:
+            project_id = self._project_id(connection, project_number)
+            location_ids = self._location_ids(connection, project_id, pd.unique(locations).tolist())
+            parameter_ids = self._parameter_ids(connection, kind)
+            location_column = pd.Series(locations).map(location_ids).to_numpy(np.int64)
+
+            # Long format, one parameter column at a time: a vectorised mask drops the missing values and
+            # executemany streams the zipped columns (no per-row tuples built up front)
+            for index, name in enumerate(parameters):
+                column = values[:, index]
+                present = ~np.isnan(column)
+                connection.executemany(
+                    "INSERT OR REPLACE INTO readings VALUES (?, ?, ?, ?, ?)",
+                    zip(repeat(project_id), location_column[present].tolist(), repeat(parameter_ids[name]),
+                        timestamps[present].tolist(), column[present].tolist()))
+                written += int(present.sum())
+        return written
+
+    def insert_rows(self, project_number, kind, rows):
+        """Bulk-inserts a MonitoringTable or `*_monitoring_data` rows (header row first, values as strings)."""
+        from monitoring.monitoringTable import as_monitoring_table
+
+        table = as_monitoring_table(rows, kind)
+        if table is None:
+            return 0
+        return self.insert_readings(project_number, kind, table.to_frame())
+
+    def query_readings(self, project_number, kind, start=None, end=None, locations=None, parameters=None):
+        """
+        Returns the readings of one project and kind in [start, end) as a typed readings frame
+        (categorical `location`, datetime64 `timestamp`, float32 parameter columns), sorted by
+        location and time.
+
+        Every (location, parameter) pair is an index range seek, so the cost is proportional to the
+        rows returned, not to the size of the store.
+        """
+        import numpy as np
+        import pandas as pd
+
+        parameters = [name for name in (parameters or KIND_PARAMETERS[kind]) if name in KIND_PARAMETERS[kind]]
+        with self._connect() as connection:
+            project = connection.execute("SELECT id FROM projects WHERE number = ?",
+                                         (project_number.strip(),)).fetchone()
+            location_ids = {} if project is None else dict(connection.execute(
+                "SELECT id, code FROM locations WHERE project_id = ?", (project[0],)))
+            parameter_ids = dict(connection.execute("SELECT id, name FROM parameters WHERE kind = ?", (kind,)))
+
+            if locations is not None:
+                wanted = {str(code).strip() for code in locations}
+                location_ids = {id_: code for id_, code in location_ids.items() if code in wanted}
+            parameter_ids = {id_: name for id_, name in parameter_ids.items() if name in parameters}
+
+            data = np.empty(0, dtype=READING_DTYPE)
+            if project is not None and location_ids and parameter_ids:
+                # Explicit IN lists on the leading key columns let SQLite seek each (location, parameter) range
+                clauses = [f"location_id IN ({','.join('?' * len(location_ids))})",
+                           f"parameter_id IN ({','.join('?' * len(parameter_ids))})"]
+                arguments = [project[0], *location_ids, *parameter_ids]
+                if start is not None:
+                    clauses.append("timestamp >= ?")
+                    arguments.append(_epoch_seconds(start))
+                if end is not None:
+                    clauses.append("timestamp < ?")
+                    arguments.append(_epoch_seconds(end))
+                cursor = connection.execute(
+                    "SELECT location_id, parameter_id, timestamp, value FROM readings "
+                    f"WHERE project_id = ? AND {' AND '.join(clauses)}", arguments)
+                # Rows stream straight into typed arrays (no intermediate list of tuples)
+                data = np.fromiter(cursor, dtype=READING_DTYPE)
+
+        # Long rows -> wide frame: (location, timestamp) index, one column per parameter
+        location_keys = sorted(location_ids)
+        parameter_keys = sorted(parameter_ids)
+        index = pd.MultiIndex.from_arrays([
+            pd.Categorical.from_codes(np.searchsorted(location_keys, data["location"]),
+                                      [location_ids[key] for key in location_keys]),
+            (data["timestamp"] * 1_000_000_000).astype("datetime64[ns]"),
+            pd.Categorical.from_codes(np.searchsorted(parameter_keys, data["parameter"]),
+                                      [parameter_ids[key] for key in parameter_keys]),
+        ], names=["location", "timestamp", "parameter"])
+        frame = pd.Series(data["value"].astype(np.float32), index=index).unstack("parameter")
+        frame = frame.reindex(columns=parameters).astype(np.float32).sort_index().reset_index()
+        frame.columns.name = None
+        frame["location"] = frame["location"].astype(str).astype("category")
+        return frame
+
+    def query_series(self, project_number, location, parameter, start=None, end=None):
+        """
+        One parameter at one location in [start, end) as (datetime64 timestamps, float64 values) arrays:
+        the single-range query behind trend charts.
+        """
+        import numpy as np
+
+        # Scalar subqueries resolve the ids first, so the readings lookup is a single primary-key range
+        clauses = ["project_id = (SELECT id FROM projects WHERE number = ?)",
+                   "location_id = (SELECT l.id FROM locations l JOIN projects p ON p.id = l.project_id "
+                   "WHERE p.number = ? AND l.code = ?)",
+                   "parameter_id IN (SELECT id FROM parameters WHERE name = ?)"]
+        arguments = [project_number.strip(), project_number.strip(), location, parameter]
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            arguments.append(_epoch_seconds(start))
+        if end is not None:
+            clauses.append("timestamp < ?")
+            arguments.append(_epoch_seconds(end))
+        with self._connect() as connection:
+            rows = connection.execute(
+                f"SELECT timestamp, value FROM readings WHERE {' AND '.join(clauses)} ORDER BY timestamp",
+                arguments).fetchall()
+
+        data = np.array(rows, dtype=np.float64).reshape(len(rows), 2)
+        return (data[:, 0].astype(np.int64) * 1_000_000_000).astype("datetime64[ns]"), data[:, 1]
+
+    def time_range(self, project_number, kind=None):
+        """(first, last) reading timestamps of a project (optionally one kind) as datetimes, or None."""
+        from datetime import datetime, timezone
+
+        query = ("SELECT min(r.timestamp), max(r.timestamp) FROM readings r "
+                 "JOIN projects p ON p.id = r.project_id WHERE p.number = ?")
+        arguments = [project_number.strip()]
+        if kind is not None:
+            query += " AND r.parameter_id IN (SELECT id FROM parameters WHERE kind = ?)"
+            arguments.append(kind)
+        with self._connect() as connection:
+            first, last = connection.execute(query, arguments).fetchone()
+        if first is None:
+            return None
+        return tuple(datetime.fromtimestamp(value, timezone.utc).replace(tzinfo=None) for value in (first, last))
+
+    # ---- Report placeholders ----
+
+    def save_placeholders(self, placeholders):
+        """
+        Archives a report's project, monitoring locations and `*_monitoring_data` readings, so later
+        reports (monthly, trend) can query them instead of re-entering data.
+
+        :return: Number of values written.
+        """
+        project_number = (placeholders.get("project_number") or "").strip()
+        if not project_number:
+            return 0
+
+        self.add_project(project_number, placeholders.get("project_name"), placeholders.get("project_location"))
+        if placeholders.get("monitoring_locations"):
+            self.add_locations(project_number, placeholders["monitoring_locations"])
+        return sum(self.insert_rows(project_number, kind, placeholders.get(f"{kind}_monitoring_data"))
+                   for kind in KIND_PARAMETERS)
+
+    def bind_placeholders(self, placeholders, start, end, kinds=None):
+        """
+        Returns a copy of `placeholders` whose `air_readings` / `noise_readings` are the stored readings of
+        the project in [start, end); `bind_raw_readings` then aggregates them at the report's monitoring
+        frequency (e.g. a monthly report from four weekly reports' data).
+        """
+        bound = dict(placeholders)
+        project_number = placeholders["project_number"]
+        for kind in kinds or KIND_PARAMETERS:
+            frame = self.query_readings(project_number, kind, start, end)
+            if len(frame):
+                bound[f"{kind}_readings"] = frame
+        if not placeholders.get("monitoring_locations"):
+            bound["monitoring_locations"] = self.locations(project_number)
+        return bound
+
+
+def get_monitoring_store(constants):
+    """Returns the process-wide monitoring store configured in constants.json, or None when disabled."""
+    path = constants.get("data_store", DEFAULT_STORE_FILE)
+    if not path:
+        return None
+
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = MonitoringStore(path)
+        return _stores[path]
@@ -0,0 +1,112 @@
+"""
+Packaging of generated .docx files: media deduplication before save and the package size breakdown after.
+
+python-docx only reuses an image part when a picture is added with byte-identical content; parts that
+arrive another way (the template's own media, restored section fragments, headers) can still end up
+stored twice. `deduplicate_media` relates every part to one image part per content hash so the copies
+are never written. `package_size_report` reads the saved package back and breaks its (compressed) size
+down by media format and XML, for keeping emailed reports under attachment limits.
+"""
+import hashlib
+import os
+import zipfile
+
+
+DEFAULT_PACKAGE_SIZE_LIMIT_MB = 10
+
+# Largest media parts listed in a size report
+TOP_MEDIA_PARTS = 5
+
+
+def deduplicate_media(document):
+    """
+    Keeps one image part per content hash: each part's relationships to a duplicate are replaced by
+    one to the kept part, and the `r:embed` / `r:link` / `r:id` references in its XML renamed to match.
+    Run it just before saving (pictures added afterwards may still match a dropped duplicate).
+
+    :return: Number of duplicate image parts dropped from the package.
+    """
+    from docx.opc.part import XmlPart
+    from docx.oxml.ns import nsmap
+    from docx.parts.image import ImagePart
+
+    package = document.part.package
+    parts = list(package.iter_parts())
+    canonical = {}
+    duplicates = {}
+    for part in parts:
+        if isinstance(part, ImagePart):
+            digest = hashlib.sha256(part.blob).hexdigest()
+            kept = canonical.setdefault(digest, part)
+            if kept is not part:
+                duplicates[part] = kept
+    if not duplicates:
+        return 0
+
+    relationship_ns = f"{{{nsmap['r']}}}"
+    for part in parts:
+        if not isinstance(part, XmlPart):  # Only XML parts hold references to retarget
+            continue
+        renamed = {}
+        for rId, relationship in list(part.rels.items()):
+            if not relationship.is_external and relationship.target_part in duplicates:
+                renamed[rId] = part.relate_to(duplicates[relationship.target_part], relationship.reltype)
+        if not renamed:
+            continue
+        for element in part.element.iter():
+            for name, value in element.attrib.items():
+                if name.startswith(relationship_ns) and value in renamed:
+                    element.set(name, renamed[value])
+        for rId in renamed:
+            del part.rels[rId]  # Only parts still reachable through relationships are written
+    return len(duplicates)
+
+
+def package_size_report(path):
+    """
+    Breaks a saved .docx down by compressed size.
+
+    :return: {"total_bytes", "media_bytes", "media_parts", "xml_bytes", "other_bytes",
+              "media_formats": {extension: bytes}, "largest_media": [[part name, bytes], ...]}
+    """
+    report = {"total_bytes": os.path.getsize(path), "media_bytes": 0, "media_parts": 0, "xml_bytes": 0,
+              "other_bytes": 0, "media_formats": {}, "largest_media": []}
+    media = []
+    with zipfile.ZipFile(path) as package:
+        for entry in package.infolist():
+            name = entry.filename
+            if name.startswith("word/media/"):
+                extension = os.path.splitext(name)[1].lstrip(".").lower() or "bin"
+                report["media_bytes"] += entry.compress_size
+                report["media_parts"] += 1
+                report["media_formats"][extension] = report["media_formats"].get(extension, 0) + entry.compress_size
+                media.append([name, entry.compress_size])
+            elif name.endswith((".xml", ".rels")):
+                report["xml_bytes"] += entry.compress_size
+            else:
+                report["other_bytes"] += entry.compress_size
+    report["largest_media"] = sorted(media, key=lambda item: item[1], reverse=True)[:TOP_MEDIA_PARTS]
+    return report
+
+
+def format_size(size):
+    """Human-readable byte count (B / KB / MB)."""
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / 1024 / 1024:.2f} MB"
+
+
+def print_package_summary(report, constants):
+    """Prints the package size line, warning when it exceeds package_size_limit_mb."""
+    formats = ", ".join(f"{extension} {format_size(size)}"
+                        for extension, size in sorted(report["media_formats"].items()))
+    print(f"📦 Package: {format_size(report['total_bytes'])} (media {format_size(report['media_bytes'])} in "
+          f"{report['media_parts']} part(s){': ' + formats if formats else ''}; "
+          f"xml {format_size(report['xml_bytes'])})")
+
+    limit_mb = constants.get("package_size_limit_mb", DEFAULT_PACKAGE_SIZE_LIMIT_MB)
+    if limit_mb and report["total_bytes"] > limit_mb * 1024 * 1024:
+        largest = ", ".join(f"{os.path.basename(name)} {format_size(size)}" for name, size in report["largest_media"])
+        print(f"⚠ Warning: Report is larger than the {limit_mb} MB attachment limit. Largest media: {largest}")
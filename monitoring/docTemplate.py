@@ -0,0 +1,166 @@
+"""
+Template-based Word document assembly.
+
+The styled base document (the configured template, or python-docx's default, plus the footer page
+number and the contents/tables/figures fields) is built once per process and copied per report from
+its saved package bytes (python-docx objects can't be deep-copied: lxml elements ignore the memo, so
+a copied Document and its body would no longer share one tree).
+Static plan sections (no placeholders, no bound data, no images) are rendered once into XML fragments
+and spliced into each report instead of being rebuilt through python-docx calls. Other sections can be
+serialised with their images (`dump_fragment`) and restored into a later report (`load_fragment`), for
+incremental regeneration.
+"""
+import base64
+import copy
+import io
+import json
+import os
+import threading
+
+from monitoring.chartCache import DEFAULT_CACHE_DIR, get_disk_cache
+
+# Fragments kept per template (distinct static sections across the parameter combinations in use)
+MAX_FRAGMENTS = 512
+
+DEFAULT_SECTION_CACHE_MB = 128
+
+# Relationship attributes that point at image parts
+_EMBED_ATTRIBUTES = ("{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed",
+                     "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}link")
+_DOC_PR = "{http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing}docPr"
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+class DocumentTemplate:
+    """A prepared base document plus the static section fragments rendered against it."""
+
+    def __init__(self, template_path, prepare):
+        from docx import Document
+
+        self.template_path = template_path
+        document = Document(template_path) if template_path and os.path.exists(template_path) else Document()
+        prepare(document)
+        buffer = io.BytesIO()
+        document.save(buffer)
+        self._package = buffer.getvalue()
+        self._fragments = {}
+
+    def new_document(self):
+        """Returns an independent copy of the base document for one report."""
+        from docx import Document
+
+        return Document(io.BytesIO(self._package))
+
+    def fragment(self, key, render):
+        """
+        Returns the body elements `render(document)` appends to a copy of the base, rendering them only
+        the first time `key` is seen.
+        """
+        elements = self._fragments.get(key)
+        if elements is None:
+            scratch = self.new_document()
+            body = scratch.element.body
+            start = body_end(scratch)
+            render(scratch)
+            elements = tuple(element for element in list(body)[start:] if element is not body.sectPr)
+            if len(self._fragments) >= MAX_FRAGMENTS:
+                self._fragments.clear()
+            self._fragments[key] = elements
+        return elements
+
+    @staticmethod
+    def splice(document, elements):
+        """Appends copies of fragment elements to the document body (before the final section properties)."""
+        body = document.element.body
+        section_properties = body.sectPr
+        for element in elements:
+            if section_properties is not None:
+                section_properties.addprevious(copy.deepcopy(element))
+            else:
+                body.append(copy.deepcopy(element))
+
+
+def get_document_template(template_path, prepare):
+    """
+    Returns the process-wide DocumentTemplate for `template_path`, rebuilt when the template file changes.
+
+    :param prepare: Callable applying the report-independent parts to a fresh base document.
+    """
+    mtime = os.path.getmtime(template_path) if template_path and os.path.exists(template_path) else None
+    key = (template_path, mtime, prepare)
+    with _templates_lock:
+        template = _templates.get(key)
+        if template is None:
+            _templates.clear()
+            template = _templates[key] = DocumentTemplate(template_path, prepare)
+        return template
+
+
+def body_end(document):
+    """Index in the body where python-docx appends new content (before the trailing sectPr)."""
+    body = document.element.body
+    return len(body) - (1 if body.sectPr is not None else 0)
+
+
+def dump_fragment(document, start):
+    """
+    Serialises the body elements added since `body_end(document)` returned `start`, together with the
+    images they embed, so the fragment can be restored into another document.
+    """
+    from lxml import etree
+
+    body = document.element.body
+    elements = [element for element in list(body)[start:] if element is not body.sectPr]
+    images = {}
+    for element in elements:
+        for node in element.iter():
+            for attribute in _EMBED_ATTRIBUTES:
+                rel_id = node.get(attribute)
+                if rel_id and rel_id not in images:
+                    images[rel_id] = base64.b64encode(document.part.related_parts[rel_id].blob).decode("ascii")
+    return json.dumps({
+        "elements": [etree.tostring(element, encoding="unicode") for element in elements],
+        "images": images,
+    }).encode("utf-8")
+
+
+def load_fragment(document, data):
+    """Appends a fragment from `dump_fragment` to the document, re-adding its images to this package."""
+    from docx.oxml import parse_xml
+
+    fragment = json.loads(data)
+    rel_ids = {old_id: document.part.get_or_add_image(io.BytesIO(base64.b64decode(blob)))[0]
+               for old_id, blob in fragment["images"].items()}
+    elements = [parse_xml(xml) for xml in fragment["elements"]]
+
+    next_id = None
+    for element in elements:
+        for node in element.iter():
+            for attribute in _EMBED_ATTRIBUTES:
+                if node.get(attribute) in rel_ids:
+                    node.set(attribute, rel_ids[node.get(attribute)])
+            if node.tag == _DOC_PR:
+                # Drawing ids must stay unique within the document
+                if next_id is None:
+                    next_id = max((int(value) for value in document.element.xpath("//@id") if value.isdigit()),
+                                  default=0) + 1
+                if node.get("name") == f"Picture {node.get('id')}":
+                    node.set("name", f"Picture {next_id}")  # python-docx's default name follows the id
+                node.set("id", str(next_id))
+                next_id += 1
+
+    body = document.element.body
+    section_properties = body.sectPr
+    for element in elements:
+        if section_properties is not None:
+            section_properties.addprevious(element)
+        else:
+            body.append(element)
+
+
+def get_section_cache(constants):
+    """Returns the rendered-section cache configured in constants.json, or None when disabled."""
+    return get_disk_cache(os.path.join(constants.get("cache_dir", DEFAULT_CACHE_DIR), "sections"),
+                          constants.get("section_cache_max_mb", DEFAULT_SECTION_CACHE_MB), suffix=".json")
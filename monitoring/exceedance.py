@@ -0,0 +1,381 @@
+import re
+from dataclasses import dataclass
+from types import MappingProxyType
+
+
+# Defaults for the "exceedance" block of constants.json
+DEFAULT_EXCEEDANCE_CONFIG = {
+    "air_limit_column": "Time Weighted Average (μg/m3)",
+    "air_reference_averaging_times": {
+        "O3": "8 hours (Daily Maximum)",
+        "SO2": "1 hour",
+        "PM2.5": "Daily",
+        "PM10": "Daily"
+    },
+    "noise_reference": ["NCEC", "Industrial & Road Side"],
+    "noise_day_hours": [7, 20]
+}
+
+_NUMBER = re.compile(r"^\s*(\d[\d,]*(?:\.\d+)?)")
+_COUNT_WORDS = {"once": 1, "twice": 2}
+_AVERAGING_TIME = re.compile(r"^\s*(\d+)\s*(mins?|minutes?|hrs?|hours?)\b", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class AirStandard:
+    pollutant: str
+    averaging_time: str
+    limit: float
+    allowed_exceedances: int = None
+    allowed_text: str = ""
+    source: str = ""            # Standards table column the limit was read from, e.g. "Time Weighted Average"
+
+
+@dataclass(frozen=True)
+class NoiseStandard:
+    authority: str
+    area: str
+    day: float
+    night: float
+
+
+@dataclass(frozen=True)
+class StandardsIndex:
+    air: MappingProxyType      # (pollutant, averaging time) -> AirStandard
+    noise: MappingProxyType    # (authority, area) -> NoiseStandard
+
+
+def parse_limit(text):
+    """Parses a limit cell ('40,000', '125 (Interim Target-1)') into a float; '-' and relative '+10' give None."""
+    match = _NUMBER.match(str(text))
+    return float(match.group(1).replace(",", "")) if match else None
+
+
+def parse_allowed_exceedances(text):
+    """Parses 'Twice per year' / '12 times per year' into an int; '-' gives None."""
+    text = str(text).strip().lower()
+    for word, count in _COUNT_WORDS.items():
+        if text.startswith(word):
+            return count
+    match = _NUMBER.match(text)
+    return int(float(match.group(1).replace(",", ""))) if match else None
+
+
+def parse_standards(structure, air_limit_column=DEFAULT_EXCEEDANCE_CONFIG["air_limit_column"]):
+    """
+    Parses the `regulatory_standards` tables of a loaded structure into a StandardsIndex.
+
+    Air tables are recognised by their Pollutant / Averaging Time columns; noise tables by a
+    day and a night limit in the last two columns.
+    """
+    structure = {key.lower(): value for key, value in structure.items()}
+    air = {}
+    noise = {}
+
+    for subsection in structure.get("regulatory_standards", {}).get("subsections", {}).values():
+        tables = [subsection["table"]] if "table" in subsection else subsection.get("tables", [])
+        for table in tables:
+            rows = table.get("data") or []
+            if not rows:
+                continue
+            header = [str(cell).strip() for cell in rows[0]]
+
+            if header[:2] == ["Pollutant", "Averaging Time"]:
+                limit_index = header.index(air_limit_column) if air_limit_column in header else 2
+                source = re.sub(r"\s*\(.*\)\s*$", "", header[limit_index])  # Without the unit
+                allowed_index = next((i for i, name in enumerate(header) if "exceedance" in name.lower()), None)
+                for row in rows[1:]:
+                    limit = parse_limit(row[limit_index])
+                    if limit is None:
+                        continue
+                    allowed_text = row[allowed_index] if allowed_index is not None else ""
+                    air[(row[0], row[1])] = AirStandard(row[0], row[1], limit,
+                                                        parse_allowed_exceedances(allowed_text), allowed_text,
+                                                        source)
+            elif len(header) >= 4:
+                for row in rows[1:]:
+                    day, night = parse_limit(row[-2]), parse_limit(row[-1])
+                    if day is None or night is None or str(row[-2]).strip().startswith("+"):
+                        continue
+                    noise.setdefault((row[0], row[1]), NoiseStandard(row[0], row[1], day, night))
+
+    return StandardsIndex(air=MappingProxyType(air), noise=MappingProxyType(noise))
+
+
+def exceedance_config(constants):
+    config = dict(DEFAULT_EXCEEDANCE_CONFIG)
+    config.update(constants.get("exceedance", {}))
+    return config
+
+
+def reference_limits(standards, constants):
+    """
+    Selects the limit each charted parameter is judged against.
+
+    :return: {"air": {pollutant: AirStandard}, "noise": {"EQ": NoiseStandard}}
+    """
+    config = exceedance_config(constants)
+
+    air = {}
+    for pollutant, averaging_time in config["air_reference_averaging_times"].items():
+        standard = standards.air.get((pollutant, averaging_time))
+        if standard is None:
+            print(f"⚠ Warning: No {pollutant} standard for averaging time '{averaging_time}' in the standards tables.")
+            continue
+        air[pollutant] = standard
+
+    noise = {}
+    noise_standard = standards.noise.get(tuple(config["noise_reference"]))
+    if noise_standard is None:
+        print(f"⚠ Warning: Noise standard {config['noise_reference']} not found in the standards tables.")
+    else:
+        noise["EQ"] = noise_standard
+
+    return {"air": air, "noise": noise}
+
+
+def chart_limits(limits, chart_type):
+    """Benchmark line value per charted parameter (noise uses the daytime limit)."""
+    if chart_type == "noise":
+        return {parameter: standard.day for parameter, standard in limits["noise"].items()}
+    return {parameter: standard.limit for parameter, standard in limits["air"].items()}
+
+
+def chart_limit_labels(limits, chart_type):
+    """Legend label per benchmark line, naming where the limit comes from."""
+    if chart_type == "noise":
+        return {parameter: f"{standard.authority} day limit" for parameter, standard in limits["noise"].items()}
+    return {parameter: f"{standard.source} {standard.averaging_time.lower()} limit".strip()
+            for parameter, standard in limits["air"].items()}
+
+
+def averaging_window(averaging_time):
+    """
+    Reads a standard's averaging time into (reporting interval, rolling window, daily maximum):
+    '1 hour' -> ('1 hr', None, False), '8 hours (Daily Maximum)' -> ('1 hr', 8 hours, True),
+    'Daily' -> ('24 hr', None, False). Raises ValueError for periods a report's readings can't
+    be averaged over ('Annual', 'Three months').
+    """
+    import pandas as pd
+
+    text = str(averaging_time).strip().lower()
+    if text.startswith("daily"):
+        return "24 hr", None, False
+    match = _AVERAGING_TIME.match(text)
+    if match is None:
+        raise ValueError(f"Unsupported averaging time '{averaging_time}'")
+    amount, daily_maximum = int(match.group(1)), "daily max" in text
+    if match.group(2).startswith("m"):
+        return f"{amount} mins", None, daily_maximum
+    if amount == 1:
+        return "1 hr", None, daily_maximum
+    return "1 hr", pd.Timedelta(hours=amount), daily_maximum
+
+
+@dataclass
+class ExceedanceResult:
+    limits: dict
+    counts: object              # pandas DataFrame: kind, location, period, parameter, readings, exceedances, max_value, limit
+                                # (readings, exceedances and max_value are over averaged values, see _evaluate_frame)
+
+    @property
+    def total_exceedances(self):
+        return int(self.counts["exceedances"].sum()) if len(self.counts) else 0
+
+    def allowed_exceedances(self, kind, parameter):
+        """Exceedances the standard allows (its 'Number of Allowable Exceedances'; 0 when it lists none)."""
+        standard = self.limits["air"].get(parameter) if kind == "air" else None
+        return (standard.allowed_exceedances or 0) if standard is not None else 0
+
+    @property
+    def compliant(self):
+        """
+        True when no location exceeds a standard more often than it allows. The allowances are per
+        year, so this is checked against the reporting period's count.
+        """
+        summary = self.by_location()
+        return not len(summary) or bool((summary["exceedances"] <= summary["allowed"]).all())
+
+    def by_location(self):
+        """Exceedance counts summed over periods, with the allowance: (kind, location, parameter) rows."""
+        if not len(self.counts):
+            return self.counts
+        summary = (self.counts.groupby(["kind", "location", "parameter"], observed=True, sort=False)
+                   .agg(readings=("readings", "sum"), exceedances=("exceedances", "sum"),
+                        max_value=("max_value", "max"), limit=("limit", "max"))
+                   .reset_index())
+        summary["allowed"] = [self.allowed_exceedances(kind, parameter)
+                              for kind, parameter in zip(summary["kind"], summary["parameter"])]
+        return summary
+
+
+def _air_averages(frame, pollutant, averaging_time, aggregates):
+    """
+    Averages one pollutant over its standard's averaging time: time-weighted means per reporting
+    interval (see aggregation.aggregate_air), then the rolling window and daily maximum if the
+    standard has them ('8 hours (Daily Maximum)' is the highest rolling 8-hour mean of each day).
+
+    :param aggregates: Interval -> aggregate_air result, shared between pollutants.
+    :return: DataFrame with location, timestamp and the averaged pollutant column.
+    """
+    from monitoring.aggregation import aggregate_air
+
+    interval, rolling, daily_maximum = averaging_window(averaging_time)
+    if interval not in aggregates:
+        aggregates[interval] = aggregate_air(frame, interval)
+    averages = aggregates[interval][["location", "timestamp", pollutant]].dropna(subset=[pollutant])
+
+    if rolling is not None:
+        averages = (averages.set_index("timestamp").groupby("location", observed=True)[pollutant]
+                    .rolling(rolling).mean().reset_index())
+    if daily_maximum:
+        averages = (averages.assign(timestamp=averages["timestamp"].dt.floor("D"))
+                    .groupby(["location", "timestamp"], observed=True)[pollutant].max().reset_index())
+    return averages
+
+
+def _noise_averages(frame, day_hours):
+    """
+    Energy-averaged EQ per location and day / night period (hourly Leq from aggregation.aggregate_noise,
+    each hour weighted equally). A night is dated by the evening it starts on.
+
+    :return: DataFrame with location, timestamp (period date), is_day and EQ.
+    """
+    import numpy as np
+    import pandas as pd
+
+    from monitoring.aggregation import aggregate_noise
+
+    hourly = aggregate_noise(frame, "1 hr").dropna(subset=["EQ"])
+    hours = hourly["timestamp"].dt.hour
+    periods = pd.DataFrame({
+        "location": hourly["location"],
+        "timestamp": (hourly["timestamp"] - pd.Timedelta(hours=day_hours[0])).dt.floor("D"),
+        "is_day": (hours >= day_hours[0]) & (hours < day_hours[1]),
+        "energy": np.power(10.0, hourly["EQ"].to_numpy(np.float64) / 10.0),
+    })
+    energy = periods.groupby(["location", "timestamp", "is_day"], observed=True)["energy"].mean().reset_index()
+    return energy.assign(EQ=10.0 * np.log10(energy.pop("energy")))
+
+
+def averaged_values(frame, kind, limits, day_hours):
+    """
+    Averages a readings frame over each standard's averaging time, so e.g. a short PM10 spike only
+    counts if it lifts the daily mean over the daily limit; readings without a timestamp can't be
+    averaged and are left out.
+
+    :return: Long DataFrame with location, timestamp (start of the averaging period; the date of a noise
+        day or night), parameter, value and the limit it is judged against, or None when nothing is averaged.
+    """
+    import numpy as np
+    import pandas as pd
+
+    frame = frame.dropna(subset=["timestamp"])
+    parts = []
+    if kind == "air":
+        aggregates = {}
+        for pollutant, standard in limits["air"].items():
+            if pollutant not in frame.columns:
+                continue
+            try:
+                averages = _air_averages(frame, pollutant, standard.averaging_time, aggregates)
+            except ValueError as e:
+                print(f"⚠ Warning: Unable to evaluate {pollutant} exceedances. Error: {e}")
+                continue
+            parts.append(pd.DataFrame({"location": averages["location"].astype(str).to_numpy(),
+                                       "timestamp": averages["timestamp"].to_numpy(), "parameter": pollutant,
+                                       "value": averages[pollutant].to_numpy(np.float64),
+                                       "limit": standard.limit}))
+    elif len(frame) and limits["noise"]:
+        averages = _noise_averages(frame, day_hours)
+        for parameter, standard in limits["noise"].items():
+            if parameter not in averages.columns:
+                continue
+            parts.append(pd.DataFrame({"location": averages["location"].astype(str).to_numpy(),
+                                       "timestamp": averages["timestamp"].to_numpy(), "parameter": parameter,
+                                       "value": averages[parameter].to_numpy(np.float64),
+                                       "limit": np.where(averages["is_day"], standard.day, standard.night)}))
+
+    long = pd.concat(parts, ignore_index=True) if parts else None
+    if long is None or not len(long):
+        return None
+    return long
+
+
+def _evaluate_frame(frame, kind, limits, day_hours):
+    """Counts exceedances of a readings frame per location, day and parameter (see `averaged_values`)."""
+    long = averaged_values(frame, kind, limits, day_hours)
+    if long is None:
+        return None
+
+    long["period"] = long.pop("timestamp").dt.strftime("%d/%m/%Y")
+    long["exceedances"] = long["value"] > long["limit"]
+    counts = (long.groupby(["location", "period", "parameter"], sort=False)
+              .agg(readings=("value", "size"), exceedances=("exceedances", "sum"),
+                   max_value=("value", "max"), limit=("limit", "max"))
+              .reset_index())
+    counts.insert(0, "kind", kind)
+    return counts
+
+
+def evaluate_exceedances(placeholders, limits, constants):
+    """
+    Evaluates all bound air and noise readings against the reference limits (vectorised).
+
+    :return: ExceedanceResult with exceedance counts per location, period (day) and parameter.
+    """
+    import pandas as pd
+
+    from monitoring.monitoringTable import as_monitoring_table
+
+    day_hours = exceedance_config(constants)["noise_day_hours"]
+    frames = []
+    for kind in ("air", "noise"):
+        try:
+            table = as_monitoring_table(placeholders.get(f"{kind}_monitoring_data"), kind)
+            if table is None:
+                continue
+            counts = _evaluate_frame(table.to_frame(), kind, limits, day_hours)
+        except (KeyError, ValueError) as e:
+            print(f"⚠ Warning: Unable to evaluate {kind} exceedances. Error: {e}")
+            continue
+        if counts is not None:
+            frames.append(counts)
+
+    columns = ["kind", "location", "period", "parameter", "readings", "exceedances", "max_value", "limit"]
+    counts = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+    return ExceedanceResult(limits=limits, counts=counts)
+
+
+def describe_exceedances(result):
+    """Builds the conclusion sentences listing each exceeded parameter per location."""
+    summary = result.by_location()
+    lines = []
+    for row in summary[summary["exceedances"] > 0].itertuples(index=False):
+        if row.kind == "air":
+            standard = result.limits["air"][row.parameter]
+            allowance = f"; allowable exceedances: {standard.allowed_text}" if standard.allowed_text not in ("", "-") else ""
+            lines.append(f"{row.parameter} at {row.location} exceeded the {standard.source} "
+                         f"{standard.averaging_time.lower()} limit of {standard.limit:g} μg/m³ in "
+                         f"{int(row.exceedances)} of {int(row.readings)} averaging period(s) "
+                         f"(maximum {row.max_value:.1f} μg/m³{allowance}).")
+        else:
+            standard = result.limits["noise"][row.parameter]
+            lines.append(f"Noise (LAeq) at {row.location} exceeded the {standard.authority} {standard.area} limit "
+                         f"({standard.day:g} dB(A) day / {standard.night:g} dB(A) night) in {int(row.exceedances)} "
+                         f"of {int(row.readings)} day/night period(s) (maximum {row.max_value:.1f} dB(A)).")
+    return lines
+
+
+def conclusion_verdict(result, compliant_text):
+    """
+    Returns the verdict paragraph: the compliance statement (followed by any exceedances the
+    standards allow), or the list of computed exceedances when a location exceeds its allowance.
+    """
+    if result is None or not result.total_exceedances:
+        return compliant_text
+    lines = describe_exceedances(result)
+    if result.compliant:
+        return f"{compliant_text} Exceedances within the allowable number of the standards: " + " ".join(lines)
+    return ("This analysis revealed that the observed monitoring parameter(s) exceeded the national standards "
+            "on the following occasions: " + " ".join(lines))
@@ -0,0 +1,172 @@
+import hashlib
+import io
+import os
+import tempfile
+
+from monitoring.chartCache import DEFAULT_CACHE_DIR, get_disk_cache
+
+
+DEFAULT_IMAGE_DPI = 200
+DEFAULT_IMAGE_QUALITY = 85
+DEFAULT_IMAGE_CACHE_MB = 512
+
+# Figure classes with their own encoding settings (constants.json "image_classes")
+FIGURE_CLASSES = ("map", "photo", "chart", "logo")
+
+# Encodings a figure class can ask for; "auto" keeps PNG for transparent/palette images, JPEG otherwise
+IMAGE_FORMATS = ("auto", "jpeg", "png")
+
+# Bump whenever prepare_image's output changes so prepared images are regenerated
+IMAGE_PIPELINE_VERSION = 2
+
+# (abs path, size, mtime_ns) -> content hash, so unchanged source files are hashed once per process
+_content_hashes = {}
+
+
+def file_content_hash(path):
+    """Returns the sha256 of a file's content, memoised on its size and mtime."""
+    stat = os.stat(path)
+    stat_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if stat_key not in _content_hashes:
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+        _content_hashes[stat_key] = digest.hexdigest()
+    return _content_hashes[stat_key]
+
+
+def image_settings(constants, figure_class):
+    """
+    Returns the (format, dpi, quality) used for a figure class: its "image_classes" entry in
+    constants.json, falling back to the global image_dpi / image_quality and "auto" encoding.
+    """
+    settings = (constants.get("image_classes") or {}).get(figure_class) or {}
+    image_format = str(settings.get("format", "auto")).lower()
+    if image_format not in IMAGE_FORMATS:
+        print(f"⚠ Warning: Unknown image format '{image_format}' for {figure_class} figures. Using auto.")
+        image_format = "auto"
+    return (image_format,
+            settings.get("dpi", constants.get("image_dpi", DEFAULT_IMAGE_DPI)),
+            settings.get("quality", constants.get("image_quality", DEFAULT_IMAGE_QUALITY)))
+
+
+def image_cache_dir(constants):
+    return os.path.join(constants.get("cache_dir", DEFAULT_CACHE_DIR), "images")
+
+
+def get_image_cache(constants):
+    """Returns the prepared-image cache configured in constants.json, or None when disabled."""
+    return get_disk_cache(image_cache_dir(constants), constants.get("image_cache_max_mb", DEFAULT_IMAGE_CACHE_MB),
+                          suffix=(".png", ".jpg"))
+
+
+def prepare_image(image_path, display_width, constants, figure_class="photo"):
+    """
+    Returns a report-ready copy of `image_path`, downsampled to the width it is placed at in the docx
+    and encoded as configured for its figure class.
+
+    The source file is never modified. Prepared images are stored in a content-hashed, size-bounded LRU
+    cache so repeat reports reuse them (and the same figure placed twice resolves to one media part); on
+    any failure, or with image_cache_max_mb set to 0, the original path is returned.
+
+    :param image_path: Source image (photo, map, instrument picture, logo).
+    :param display_width: Placed width in inches.
+    :param constants: Loaded constants.json (image_classes, image_dpi, image_quality, cache_dir,
+        image_cache_max_mb).
+    :param figure_class: One of FIGURE_CLASSES.
+    :return: Path to the prepared image.
+    """
+    cache = get_image_cache(constants)
+    if cache is None:
+        return image_path
+
+    image_format, target_dpi, quality = image_settings(constants, figure_class)
+
+    try:
+        content_hash = file_content_hash(image_path)
+    except OSError as e:
+        print(f"⚠ Warning: Unable to read image {image_path}. Error: {e}")
+        return image_path
+
+    params = f"{content_hash}:{display_width}:{image_format}:{target_dpi}:{quality}:{IMAGE_PIPELINE_VERSION}"
+    cache_key = hashlib.sha256(params.encode("utf-8")).hexdigest()
+
+    cached_path = cache.lookup(cache_key)
+    if cached_path is not None:
+        return cached_path
+
+    try:
+        return _prepare_uncached(image_path, display_width, image_format, target_dpi, quality, cache,
+                                 cache_key) or image_path
+    except Exception as e:
+        print(f"⚠ Warning: Unable to prepare image {image_path}. Using original. Error: {e}")
+        return image_path
+
+
+def _prepare_uncached(image_path, display_width, image_format, target_dpi, quality, cache, cache_key):
+    from PIL import Image, ImageOps
+
+    with Image.open(image_path) as source:
+        img = ImageOps.exif_transpose(source)
+
+        # ✅ Downsample to the pixel width actually needed at the placed size
+        target_width = max(1, int(round(display_width * target_dpi)))
+        if img.width > target_width:
+            target_height = max(1, int(round(img.height * target_width / img.width)))
+            img = img.resize((target_width, target_height), Image.LANCZOS)
+
+        img, extension, save_kwargs = _encoding(img, image_format, quality)
+
+        fd, tmp_path = tempfile.mkstemp(dir=cache.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                img.save(file, dpi=(target_dpi, target_dpi), **save_kwargs)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    return cache.put_file(cache_key, tmp_path, extension)
+
+
+def _encoding(img, image_format, quality):
+    """Returns (image ready to save, file extension, PIL save kwargs) for the requested encoding."""
+    from PIL import Image
+
+    has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+    if image_format == "auto":
+        # ✅ Photos become JPEG; images with transparency or palettes (maps, logos) stay PNG
+        image_format = "png" if has_alpha or img.mode == "P" else "jpeg"
+
+    if image_format == "png":
+        return img, ".png", {"format": "PNG", "optimize": True}
+
+    if has_alpha:
+        # JPEG has no alpha channel: flatten onto the white page
+        rgba = img.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        img = background
+    return img.convert("RGB"), ".jpg", {"format": "JPEG", "quality": quality, "optimize": True, "progressive": True}
+
+
+def encode_image_bytes(data, figure_class, constants):
+    """
+    Re-encodes in-memory PNG figures (rendered charts) when their figure class asks for another format;
+    returns `data` unchanged for "png" / "auto" (chart resolution is set by the chart profile).
+    """
+    image_format, _, quality = image_settings(constants, figure_class)
+    if image_format != "jpeg":
+        return data
+
+    from PIL import Image
+
+    try:
+        with Image.open(io.BytesIO(data)) as source:
+            img, _, save_kwargs = _encoding(source, image_format, quality)
+            buffer = io.BytesIO()
+            img.save(buffer, dpi=source.info.get("dpi", (DEFAULT_IMAGE_DPI, DEFAULT_IMAGE_DPI)), **save_kwargs)
+        return buffer.getvalue()
+    except Exception as e:
+        print(f"⚠ Warning: Unable to re-encode {figure_class} image. Using PNG. Error: {e}")
+        return data
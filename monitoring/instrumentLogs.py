@@ -0,0 +1,344 @@
+import csv
+import re
+from datetime import datetime
+from decimal import Decimal
+from itertools import islice
+
+from monitoring.reportPlan import AIR_QUALITY_HEADERS, NOISE_QUALITY_HEADERS
+
+
+# Schema column -> header spellings found in instrument exports (normalised, see `normalise_header`)
+AIR_COLUMN_ALIASES = {
+    "CO": ("co",),
+    "O3": ("o3", "ozone"),
+    "NO2": ("no2",),
+    "SO2": ("so2",),
+    "PM2.5": ("pm2.5", "pm25", "pm2_5"),
+    "PM10": ("pm10",),
+}
+
+NOISE_COLUMN_ALIASES = {
+    "EQ": ("laeq", "leq", "eq", "lzeq", "lceq"),
+    "Max": ("lamax", "lafmax", "lasmax", "max", "lmax"),
+    "AE": ("lae", "sel", "ae"),
+    "10": ("la10", "l10", "10"),
+    "50": ("la50", "l50", "50"),
+    "90": ("la90", "l90", "90"),
+}
+
+DATETIME_ALIASES = ("datetime", "date/time", "date time", "timestamp", "time stamp")
+DATE_ALIASES = ("date",)
+TIME_ALIASES = ("time", "start time")
+LOCATION_ALIASES = ("monitoring location", "location", "site")
+LATITUDE_ALIASES = ("latitude", "lat", "gps latitude", "gps lat")
+LONGITUDE_ALIASES = ("longitude", "lon", "long", "lng", "gps longitude", "gps lon")
+
+# Formats tried (in order) until one parses; the winner is reused for the rest of the file
+TIMESTAMP_FORMATS = (
+    "%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M",
+    "%d-%m-%Y %H:%M:%S", "%d.%m.%Y %H:%M:%S", "%m/%d/%Y %H:%M:%S", "%Y/%m/%d %H:%M:%S",
+)
+
+MISSING_VALUES = {"", "-", "--", "---", "n/a", "na", "nan", "null", "over", "under"}
+
+# Lines inspected for the header row (exports start with a block of instrument metadata)
+MAX_PREAMBLE_LINES = 100
+
+# Readings converted to a typed frame and written to the data store at a time by `import_logs`
+IMPORT_CHUNK_READINGS = 200_000
+
+_UNIT_SUFFIX = re.compile(r"\s*[\(\[][^\)\]]*[\)\]]\s*$")
+
+INSTRUMENT_SCHEMAS = {
+    "air": (AIR_QUALITY_HEADERS, AIR_COLUMN_ALIASES),
+    "noise": (NOISE_QUALITY_HEADERS, NOISE_COLUMN_ALIASES),
+}
+
+
+def normalise_header(name):
+    """Lowercases a header cell and strips units, e.g. 'LAeq (dB)' -> 'laeq', 'PM2.5 [ug/m3]' -> 'pm2.5'."""
+    name = name.strip().strip('"').lower()
+    name = _UNIT_SUFFIX.sub("", name)
+    return re.sub(r"[\s_]+", " ", name).strip()
+
+
+def _find_column(headers, aliases):
+    for alias in aliases:
+        if alias in headers:
+            return headers.index(alias)
+        compact = alias.replace(" ", "")
+        for index, header in enumerate(headers):
+            if header.replace(" ", "") == compact:
+                return index
+    return None
+
+
+def _sniff_delimiter(line):
+    counts = {delimiter: line.count(delimiter) for delimiter in (",", ";", "\t")}
+    return max(counts, key=counts.get)
+
+
+class _ColumnMap:
+    """Resolved column indices for one export file."""
+
+    def __init__(self, headers, aliases):
+        self.measurements = {column: _find_column(headers, column_aliases)
+                             for column, column_aliases in aliases.items()}
+        self.datetime = _find_column(headers, DATETIME_ALIASES)
+        self.date = _find_column(headers, DATE_ALIASES)
+        self.time = _find_column(headers, TIME_ALIASES)
+        self.location = _find_column(headers, LOCATION_ALIASES)
+        self.latitude = _find_column(headers, LATITUDE_ALIASES)
+        self.longitude = _find_column(headers, LONGITUDE_ALIASES)
+
+    def matched(self):
+        return sum(index is not None for index in self.measurements.values())
+
+    def has_timestamp(self):
+        return self.datetime is not None or self.time is not None
+
+    def has_gps(self):
+        return self.latitude is not None and self.longitude is not None
+
+
+class _FixSnapper:
+    """Snaps GPS fixes to the nearest monitoring location, reusing the last answer for a repeated fix."""
+
+    def __init__(self, locations, max_distance_m=None):
+        from monitoring.locations import DEFAULT_SNAP_DISTANCE_M
+
+        self.locations = locations
+        self.max_distance_m = DEFAULT_SNAP_DISTANCE_M if max_distance_m is None else max_distance_m
+        self._last = (None, None)
+
+    def __call__(self, latitude_text, longitude_text):
+        fix = (latitude_text.strip(), longitude_text.strip())
+        if fix != self._last[0]:
+            from monitoring.locations import parse_coordinates
+
+            latitude, longitude = parse_coordinates(fix)
+            self._last = (fix, self.locations.snap([latitude], [longitude], self.max_distance_m)[0])
+        return self._last[1]
+
+
+def _open_header(lines, aliases):
+    """Consumes preamble lines until a header row with a timestamp and measurement columns is found."""
+    for line_number, line in enumerate(lines, start=1):
+        if line_number > MAX_PREAMBLE_LINES:
+            break
+        if not line.strip():
+            continue
+
+        delimiter = _sniff_delimiter(line)
+        headers = [normalise_header(cell) for cell in next(csv.reader([line], delimiter=delimiter))]
+        column_map = _ColumnMap(headers, aliases)
+        if column_map.has_timestamp() and column_map.matched():
+            return delimiter, column_map, line_number
+
+    return None, None, 0
+
+
+_DAY_FIRST = re.compile(r"(\d{1,2})[/.-](\d{1,2})[/.-](\d{4})[ T](\d{1,2}):(\d{2})(?::(\d{2}))?")
+
+
+def _parse_day_first(text):
+    match = _DAY_FIRST.fullmatch(text)
+    if not match:
+        raise ValueError(text)
+    day, month, year, hour, minute, second = match.groups()
+    return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second or 0))
+
+
+class _TimestampParser:
+    """Parses timestamps, remembering the first format that works so later lines take the fast path."""
+
+    def __init__(self, formats=TIMESTAMP_FORMATS):
+        self.formats = formats
+        self.current = None
+
+    def _candidates(self):
+        yield datetime.fromisoformat
+        yield _parse_day_first
+        for fmt in self.formats:
+            yield lambda text, fmt=fmt: datetime.strptime(text, fmt)
+
+    def __call__(self, text):
+        text = text.strip()
+        if self.current:
+            try:
+                return self.current(text)
+            except ValueError:
+                pass
+        for parse in self._candidates():
+            try:
+                value = parse(text)
+            except ValueError:
+                continue
+            self.current = parse
+            return value
+        return None
+
+
+def iter_readings(path, kind, location=None, stats=None, locations=None, max_snap_distance_m=None):
+    """
+    Stream-parses an instrument log export, yielding one typed reading per data line.
+
+    Files are read line by line (constant memory). Preamble lines before the header row are
+    skipped, the delimiter is sniffed and columns are matched by name, so column order and extra
+    channels in the export do not matter.
+
+    :param path: Path to the CSV/text export (Pulsar 45 / Pulsar 105 sound meters, PTM600 gas monitor).
+    :param kind: "air" or "noise".
+    :param location: Monitoring location ID; required unless the export has a location column (or GPS
+                     columns and `locations`). With GPS snapping it is the fallback for unmatched fixes.
+    :param stats: Optional dict updated with "rows", "skipped" and "unsnapped" counts.
+    :param locations: Optional locations.LocationIndex; exports without a location column but with
+                      latitude / longitude columns are assigned the nearest location per line.
+    :param max_snap_distance_m: Fixes further than this from every location are not snapped
+                                (default: locations.DEFAULT_SNAP_DISTANCE_M).
+    :return: Generator of (location, timestamp, values) where values is a tuple of floats
+             (None for channels the export, or that line, does not record) in schema column order.
+    """
+    schema_headers, aliases = INSTRUMENT_SCHEMAS[kind]
+    columns = schema_headers[2:]
+    stats = stats if stats is not None else {}
+    stats.setdefault("rows", 0)
+    stats.setdefault("skipped", 0)
+    stats.setdefault("unsnapped", 0)
+
+    with open(path, "r", encoding="utf-8-sig", errors="replace", newline="") as file:
+        delimiter, column_map, header_line = _open_header(file, aliases)
+        if column_map is None:
+            print(f"⚠ Warning: No {kind} header row found in {path}. Skipping file.")
+            return
+        snap_fix = None
+        if column_map.location is None and locations is not None and len(locations) and column_map.has_gps():
+            snap_fix = _FixSnapper(locations, max_snap_distance_m)
+        if location is None and column_map.location is None and snap_fix is None:
+            print(f"⚠ Warning: No monitoring location given for {path}. Skipping file.")
+            return
+
+        missing = [column for column in columns if column_map.measurements[column] is None]
+        if missing:
+            print(f"⚠ Warning: {path} has no column for {', '.join(missing)}.")
+
+        parse_timestamp = _TimestampParser()
+        value_indices = [column_map.measurements[column] for column in columns]
+
+        for cells in csv.reader(file, delimiter=delimiter):
+            if not cells or not any(cell.strip() for cell in cells):
+                continue
+
+            try:
+                if column_map.datetime is not None:
+                    timestamp = parse_timestamp(cells[column_map.datetime])
+                elif column_map.date is not None:
+                    timestamp = parse_timestamp(f"{cells[column_map.date]} {cells[column_map.time]}")
+                else:
+                    timestamp = parse_timestamp(cells[column_map.time])
+
+                values = []
+                for index in value_indices:
+                    if index is None:
+                        values.append(None)
+                        continue
+                    cell = cells[index].strip()
+                    if cell.lower() in MISSING_VALUES:  # Channel not recorded on this line, keep the others
+                        values.append(None)
+                        continue
+                    # Semicolon/tab separated exports use a decimal comma
+                    values.append(float(cell.replace(",", ".")) if delimiter != "," else float(cell))
+            except (IndexError, ValueError):
+                stats["skipped"] += 1
+                continue
+
+            if timestamp is None or all(value is None for value in values):
+                stats["skipped"] += 1
+                continue
+
+            if column_map.location is not None:
+                row_location = cells[column_map.location].strip()
+            elif snap_fix is not None:
+                row_location = snap_fix(cells[column_map.latitude], cells[column_map.longitude]) or location
+                if row_location is None:
+                    stats["unsnapped"] += 1
+                    continue
+            else:
+                row_location = location
+            stats["rows"] += 1
+            yield row_location, timestamp, tuple(values)
+
+    if stats["skipped"]:
+        print(f"⚠ Warning: Skipped {stats['skipped']} unreadable line(s) in {path} (after header line {header_line}).")
+    if stats["unsnapped"]:
+        print(f"⚠ Warning: Skipped {stats['unsnapped']} line(s) in {path} with a GPS fix more than "
+              f"{snap_fix.max_distance_m:g} m from every monitoring location.")
+
+
+def format_value(value):
+    """Shortest text that reads back as exactly `value`, never in exponent notation ("60", "1234567.891")."""
+    text = repr(float(value))
+    if "e" in text:
+        text = format(Decimal(text), "f")
+    return text[:-2] if text.endswith(".0") else text
+
+
+def format_reading_row(location, timestamp, values):
+    """Formats a typed reading as a `*_monitoring_data` row (strings, same layout as rows entered in the UI)."""
+    time_format = "%d/%m/%Y %H:%M" if timestamp.second == 0 else "%d/%m/%Y %H:%M:%S"
+    return [location, timestamp.strftime(time_format)] + ["" if value is None else format_value(value)
+                                                           for value in values]
+
+
+def iter_monitoring_rows(path, kind, location=None, stats=None, locations=None, max_snap_distance_m=None):
+    """Streams an export as `air_monitoring_data` / `noise_monitoring_data` rows (without the header row)."""
+    for row_location, timestamp, values in iter_readings(path, kind, location, stats, locations,
+                                                         max_snap_distance_m):
+        yield format_reading_row(row_location, timestamp, values)
+
+
+def load_monitoring_data(sources, kind, locations=None, max_snap_distance_m=None):
+    """
+    Loads several exports into a `*_monitoring_data` placeholder value (header row + rows).
+
+    Every reading is held as a row of strings, so this is meant for the few thousand lines a weekly report
+    shows; long logger histories go through `import_logs`, which streams them into the data store.
+
+    :param sources: Iterable of (path, location) pairs; location may be None for exports with a location column
+                    (or with GPS columns when `locations` is given).
+    :param kind: "air" or "noise".
+    :param locations: Optional locations.LocationIndex for snapping GPS fixes (see `iter_readings`).
+    :return: list of rows, header first.
+    """
+    schema_headers = INSTRUMENT_SCHEMAS[kind][0]
+    data = [list(schema_headers)]
+    for path, location in sources:
+        data.extend(iter_monitoring_rows(path, kind, location, locations=locations,
+                                         max_snap_distance_m=max_snap_distance_m))
+    return data
+
+
+def import_logs(store, project_number, kind, sources, locations=None, max_snap_distance_m=None,
+                chunk_size=IMPORT_CHUNK_READINGS):
+    """
+    Streams exports into the monitoring data store, `chunk_size` readings at a time: each chunk becomes a
+    typed frame (see `aggregation.frame_from_readings`) and is written with `MonitoringStore.insert_readings`,
+    so memory stays bounded however many lines the logs have.
+
+    :param store: MonitoringStore.
+    :param project_number: Project the readings belong to.
+    :param kind: "air" or "noise".
+    :param sources: Iterable of (path, location) pairs, as for `load_monitoring_data`.
+    :param locations: Optional locations.LocationIndex for snapping GPS fixes (see `iter_readings`).
+    :return: Per-file stats: {path: {"rows", "skipped", "unsnapped", "values"}}.
+    """
+    from monitoring.aggregation import frame_from_readings
+
+    results = {}
+    for path, location in sources:
+        stats = {"values": 0}
+        readings = iter_readings(path, kind, location, stats, locations, max_snap_distance_m)
+        for chunk in iter(lambda: list(islice(readings, chunk_size)), []):
+            stats["values"] += store.insert_readings(project_number, kind, frame_from_readings(chunk, kind))
+        results[path] = stats
+    return results
@@ -0,0 +1,264 @@
+"""
+Monitoring location geometry: coordinate parsing, a nearest-location index and the generated location map.
+
+`monitoring_locations` rows carry coordinates as text ('26.636180°', '26°38'10.2"N', '-36.2245'), as
+entered in the UI or uploaded. They are parsed once into float arrays; the index keeps the locations as
+unit vectors on the sphere, so nearest-location lookups for a whole block of GPS fixes are one matrix
+product (a project has tens of locations, where this beats a tree).
+
+When a report has locations but no uploaded map, `bind_location_map` renders an offline map of the
+labelled points (see chartRenderer.render_location_map). The figure goes through the chart cache, so an
+unchanged location set is never drawn twice.
+"""
+import hashlib
+import os
+import re
+
+import numpy as np
+
+
+EARTH_RADIUS_M = 6_371_008.8
+
+DEFAULT_LOCATION_MAP_CONFIG = {
+    "auto": True,                 # Generate the map when none was uploaded
+    "width": 6,
+    "height": 4.5,
+    "dpi": 200,
+}
+
+# GPS fixes further than this from every monitoring location are not snapped to one
+DEFAULT_SNAP_DISTANCE_M = 250
+
+# Bump whenever render_location_map's styling changes so cached maps are invalidated
+LOCATION_MAP_STYLE_VERSION = 1
+
+# Fixes x locations compared per block in `nearest` (bounds the distance matrix's memory)
+NEAREST_BLOCK_CELLS = 1_000_000
+
+COORDINATE_COLUMNS = ("Latitude", "Longitude")
+
+_DMS = re.compile(
+    r"^\s*([NSEW])?\s*([+-]?\d+(?:[.,]\d+)?)\s*[°º:]?\s*"
+    r"(?:(\d+(?:[.,]\d+)?)\s*['′:]?\s*)?"
+    r"(?:(\d+(?:[.,]\d+)?)\s*(?:\"|″|'')?\s*)?"
+    r"([NSEW])?\s*$",
+    re.IGNORECASE)
+
+
+def location_map_config(constants):
+    """The `location_map` block of constants.json over the defaults."""
+    config = dict(DEFAULT_LOCATION_MAP_CONFIG)
+    config.update(constants.get("location_map", {}))
+    return config
+
+
+def _parse_dms(text):
+    match = _DMS.match(text)
+    if match is None:
+        return np.nan
+    prefix, degrees, minutes, seconds, suffix = match.groups()
+    if prefix and suffix:
+        return np.nan
+    minutes = float(minutes.replace(",", ".")) if minutes else 0.0
+    seconds = float(seconds.replace(",", ".")) if seconds else 0.0
+    if minutes >= 60 or seconds >= 60:
+        return np.nan
+
+    value = abs(float(degrees.replace(",", "."))) + minutes / 60 + seconds / 3600
+    hemisphere = (prefix or suffix or "").upper()
+    return -value if degrees.startswith("-") or hemisphere in ("S", "W") else value
+
+
+def parse_coordinates(values):
+    """
+    Parses coordinate text into decimal degrees (float64 array, NaN where unreadable).
+
+    Plain decimals (with or without a trailing '°') take the vectorised path; degrees / minutes /
+    seconds and hemisphere letters ('26°38'10.2"N', 'E 36.2245') are parsed per value.
+    """
+    import pandas as pd
+
+    text = pd.Series(values, dtype=object).astype(str).str.strip()
+    parsed = pd.to_numeric(text.str.rstrip("°º").str.strip(), errors="coerce")
+    parsed = parsed.to_numpy(dtype=np.float64, copy=True)
+    retry = np.isnan(parsed) & (text != "").to_numpy()
+    if retry.any():
+        parsed[retry] = [_parse_dms(value) for value in text[retry]]
+    return parsed
+
+
+def parse_coordinate(value):
+    """Parses one coordinate into decimal degrees; raises ValueError when unreadable."""
+    parsed = parse_coordinates([value])[0]
+    if np.isnan(parsed):
+        raise ValueError(f"Unable to read coordinate '{value}'")
+    return float(parsed)
+
+
+def haversine_m(latitudes1, longitudes1, latitudes2, longitudes2):
+    """Great-circle distance in metres between (arrays of) points in decimal degrees."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(values, dtype=np.float64))
+                              for values in (latitudes1, longitudes1, latitudes2, longitudes2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _unit_vectors(latitudes, longitudes):
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+    return np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+
+
+class LocationIndex:
+    """
+    Monitoring locations with numeric coordinates, indexed for nearest-location lookups.
+
+    :param names: Location IDs, e.g. ["ML-01", "ML-02"].
+    :param latitudes: Decimal degrees (same order as `names`).
+    :param longitudes: Decimal degrees.
+    :param descriptions: Optional location descriptions.
+    """
+
+    def __init__(self, names, latitudes, longitudes, descriptions=None):
+        self.names = [str(name) for name in names]
+        self.latitudes = np.asarray(latitudes, dtype=np.float64)
+        self.longitudes = np.asarray(longitudes, dtype=np.float64)
+        self.descriptions = [str(text) for text in descriptions] if descriptions is not None else [""] * len(names)
+        if not (len(self.names) == len(self.latitudes) == len(self.longitudes) == len(self.descriptions)):
+            raise ValueError("Location names, coordinates and descriptions differ in length")
+        self._vectors = _unit_vectors(self.latitudes, self.longitudes)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Builds the index from `monitoring_locations` rows (header row first). Locations whose
+        coordinates can't be read are left out with a warning.
+        """
+        if not rows or len(rows) < 2:
+            return cls([], [], [])
+        header = [str(cell).strip() for cell in rows[0]]
+        missing = [column for column in ("Monitoring Location",) + COORDINATE_COLUMNS if column not in header]
+        if missing:
+            raise ValueError(f"Monitoring locations have no {', '.join(missing)} column")
+
+        body = [list(row) + [""] * (len(header) - len(row)) for row in rows[1:]]
+        columns = {name: [row[header.index(name)] for row in body] for name in header}
+        latitudes = parse_coordinates(columns["Latitude"])
+        longitudes = parse_coordinates(columns["Longitude"])
+        valid = (np.abs(latitudes) <= 90) & (np.abs(longitudes) <= 180)  # False for NaN
+
+        skipped = [str(name) for name, ok in zip(columns["Monitoring Location"], valid) if not ok]
+        if skipped:
+            print(f"⚠ Warning: Unreadable coordinates for location(s) {', '.join(skipped)}. Left off the map.")
+
+        names = [name for name, ok in zip(columns["Monitoring Location"], valid) if ok]
+        descriptions = [text for text, ok in zip(columns.get("Description", [""] * len(body)), valid) if ok]
+        return cls(names, latitudes[valid], longitudes[valid], descriptions)
+
+    def __len__(self):
+        return len(self.names)
+
+    def nearest(self, latitudes, longitudes):
+        """
+        Nearest location to each point.
+
+        :return: (location indices, distances in metres) as arrays matching the inputs.
+        """
+        if not len(self):
+            raise ValueError("No monitoring locations to search")
+        latitudes = np.atleast_1d(np.asarray(latitudes, dtype=np.float64))
+        longitudes = np.atleast_1d(np.asarray(longitudes, dtype=np.float64))
+        points = _unit_vectors(latitudes, longitudes)
+
+        # Largest dot product = smallest great-circle angle; the exact distance is taken for the winner only
+        indices = np.empty(len(points), dtype=np.intp)
+        block = max(1, NEAREST_BLOCK_CELLS // len(self))
+        for start in range(0, len(points), block):
+            indices[start:start + block] = np.argmax(points[start:start + block] @ self._vectors.T, axis=1)
+
+        distances = haversine_m(latitudes, longitudes, self.latitudes[indices], self.longitudes[indices])
+        return indices, distances
+
+    def snap(self, latitudes, longitudes, max_distance_m=DEFAULT_SNAP_DISTANCE_M):
+        """
+        Snaps GPS fixes to monitoring locations.
+
+        :return: List of location names, None for fixes that are unreadable (NaN) or further than
+                 `max_distance_m` from every location.
+        """
+        indices, distances = self.nearest(latitudes, longitudes)
+        return [self.names[index] if distance <= max_distance_m else None
+                for index, distance in zip(indices, distances)]
+
+    def fingerprint(self):
+        """Hash of the location set (names and coordinates), for caching derived figures."""
+        payload = repr([self.names, self.descriptions, self.latitudes.round(7).tolist(),
+                        self.longitudes.round(7).tolist()])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def location_map_spec(index):
+    """Chart spec for `chartRenderer.render_location_map` (plain lists, so it hashes into a chart cache key)."""
+    return {
+        "chart": "location_map",
+        "style": LOCATION_MAP_STYLE_VERSION,
+        "names": index.names,
+        "descriptions": index.descriptions,
+        "latitudes": index.latitudes.round(7).tolist(),
+        "longitudes": index.longitudes.round(7).tolist(),
+    }
+
+
+def get_location_map(index, constants):
+    """
+    Renders (or fetches from the chart cache) the map of `index` and returns the path of the PNG,
+    stored content-hashed in the image cache directory.
+    """
+    from monitoring.chartCache import get_chart_cache
+    from monitoring.chartRenderer import render_charts
+    from monitoring.imagePipeline import get_image_cache, image_cache_dir
+
+    config = location_map_config(constants)
+    profile = {"width": config["width"], "height": config["height"], "dpi": config["dpi"]}
+    map_png = render_charts([location_map_spec(index)], profile, max_workers=1, cache=get_chart_cache(constants))[0]
+
+    key = f"map-{hashlib.sha256(map_png).hexdigest()}"
+    image_cache = get_image_cache(constants)
+    if image_cache is not None:
+        path = image_cache.lookup(key) or image_cache.put(key, map_png)
+        if path is not None:
+            return path
+
+    cache_dir = image_cache_dir(constants)
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"{key}.png")
+    if not os.path.exists(path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(map_png)
+        os.replace(tmp_path, path)
+    return path
+
+
+def bind_location_map(placeholders, constants):
+    """
+    Fills `monitoring_location_map` with a generated map when no map was uploaded and the monitoring
+    locations have readable coordinates (and `location_map.auto` is on).
+    """
+    if placeholders.get("monitoring_location_map") or not location_map_config(constants)["auto"]:
+        return placeholders
+
+    try:
+        index = LocationIndex.from_rows(placeholders.get("monitoring_locations"))
+    except ValueError as e:
+        print(f"⚠ Warning: Unable to read monitoring locations for the location map. Error: {e}")
+        return placeholders
+    if not len(index):
+        return placeholders
+
+    try:
+        map_path = get_location_map(index, constants)
+    except (OSError, ValueError) as e:
+        print(f"⚠ Warning: Unable to generate the monitoring location map. Error: {e}")
+        return placeholders
+    return {**placeholders, "monitoring_location_map": map_path}
@@ -1,32 +1,67 @@
+import io
 import os
-import json
-from docx import Document
-from docx.oxml.ns import qn
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-from docx.shared import Inches
-from PIL import Image
-from docx.shared import Pt
-import pandas as pd
-import matplotlib.pyplot as plt
-from docx.oxml import OxmlElement, ns
-from docx.enum.text import WD_ALIGN_PARAGRAPH
 import re
+import json
+import hashlib
+import tempfile
+from functools import lru_cache
+from monitoring.chartRenderer import CHART_STYLE_VERSION, render_charts, resolve_chart_profile
+from monitoring.chartCache import get_chart_cache
+from monitoring.docTemplate import body_end, dump_fragment, get_document_template, get_section_cache, load_fragment
+from monitoring.docPackage import deduplicate_media, package_size_report, print_package_summary
+from monitoring.imagePipeline import IMAGE_PIPELINE_VERSION, encode_image_bytes, file_content_hash, prepare_image
+from monitoring.tableWriter import add_bulk_table
+from monitoring.templateEngine import (compile_template, render_template, render_text, reset_template_warnings,
+                                       template_placeholders)
+from monitoring.reportPlan import get_report_plan
+from monitoring.reportTypes import get_report_type
+from monitoring.exceedance import (chart_limit_labels, chart_limits, conclusion_verdict, evaluate_exceedances,
+                                   reference_limits)
+from monitoring.profiling import count, is_tracing, span
+from monitoring.monitoringTable import MonitoringTable, as_monitoring_table
+
+# python-docx, PIL, pandas and matplotlib are imported by the stage that needs them, so importing this
+# module (CLI start-up, UI start-up, pool workers) stays cheap.
+
+
+# Package and project roots (config paths resolve against these, not the working directory)
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(PACKAGE_DIR)
 
+# Constants file path
+CONFIG_PATH = os.path.join(PACKAGE_DIR, "config", "constants.json")
 
+# Config entries resolved against the project root when relative: project files, the shared cache and
+# the monitoring data store (`output_dir` stays relative to the working directory, like any CLI output)
+PROJECT_PATH_KEYS = ("structure_file", "cesmp_structure_file", "template_dir", "cache_dir", "data_store")
 
 
+def load_constants(config_path=CONFIG_PATH):
+    with open(config_path, 'r', encoding="utf-8") as file:
+        constants = json.load(file)
 
+    for key in PROJECT_PATH_KEYS:
+        if constants.get(key) and not os.path.isabs(constants[key]):
+            constants[key] = os.path.join(PROJECT_DIR, constants[key])
+    return constants
 
-# Constants file path
-CONFIG_PATH = "monitoring/config/constants.json"
+
+CONSTANTS = load_constants()
 
 
-def load_constants():
-    with open(CONFIG_PATH, 'r') as file:
-        return json.load(file)
+def preload_report_dependencies():
+    """
+    Imports the heavy report dependencies and builds the base document up front (for long-lived
+    workers about to generate reports).
+    """
+    import docx  # noqa: F401
+    import matplotlib.figure  # noqa: F401
+    import pandas  # noqa: F401
+    import PIL.Image  # noqa: F401
+    import monitoring.aggregation  # noqa: F401
 
+    get_report_template()
 
-CONSTANTS = load_constants()
 
 def set_document_theme(doc):
     """
@@ -34,6 +69,8 @@ def set_document_theme(doc):
 
     :param doc: The Word Document object.
     """
+    from docx.oxml.ns import qn
+    from docx.shared import Pt
 
     normal_style = doc.styles["Normal"]
     normal_font = normal_style.font
@@ -123,8 +160,11 @@ def set_document_theme(doc):
 
 
 
-def add_header(doc, placeholders):
+def add_header(doc, placeholders, report_type=None):
     """Adds a header with report details on the left and the company logo on the right, without using a table."""
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Inches, Length, Pt
+    from PIL import Image
 
     # Ensure we access the first section's header
     section = doc.sections[0]  # Default section
@@ -135,7 +175,7 @@ def add_header(doc, placeholders):
         header.add_paragraph()
 
     # Extract placeholders
-    report_frequency = placeholders.get("report_frequency", None)
+    report_title = get_report_type(report_type).report_title(placeholders)
     report_number = placeholders.get("report_number", None)
 
     project_location = placeholders.get("project_location", "Project Location")
@@ -146,7 +186,7 @@ def add_header(doc, placeholders):
     # ✅ Left-aligned text: Report details
     paragraph_left = header.add_paragraph()
     run_left = paragraph_left.add_run(
-        f"{report_frequency} Environmental Monitoring Report ({report_number})\n"
+        f"{report_title} ({report_number})\n"
         f"{project_location}\n"
         f"Project No. {project_number}\n"
     )
@@ -174,7 +214,9 @@ def add_header(doc, placeholders):
                     width = max_width
                     height = max_width * aspect_ratio
 
-            run_right.add_picture(company_logo_path, width=width, height=height)
+            # Embed a copy downsampled to the placed size, not the full-resolution logo file
+            run_right.add_picture(prepare_image(company_logo_path, Length(int(width)).inches, CONSTANTS, "logo"),
+                                  width=width, height=height)
         except Exception as e:
             print(f"⚠ Warning: Unable to load company logo. Error: {e}")
 
@@ -184,6 +226,10 @@ def add_header(doc, placeholders):
 
 def add_page_number(doc):
     """Adds page numbers to the footer of the document."""
+    from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+
     for section in doc.sections:
         footer = section.footer
         paragraph = footer.paragraphs[0] if footer.paragraphs else footer.add_paragraph()
@@ -212,6 +258,10 @@ def add_title_page(doc, report_frequency):
 
 def add_table_of_contents(doc):
     """Adds a TOC field that updates when `F9` is pressed in Word."""
+    from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+
     doc.add_paragraph("Contents", "TOC Heading")
 
     paragraph = doc.add_paragraph()
@@ -240,6 +290,9 @@ def add_table_of_contents(doc):
 
 def add_list_of_tables_and_figures(doc):
     """Adds separate 'List of Tables' and 'List of Figures' sections to the document."""
+    from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
 
     # 📌 List of Tables
     doc.add_page_break()
@@ -315,572 +368,556 @@ def add_list_of_figures(doc):
 
 
 
-def replace_placeholders(text, placeholders):
-    """Replaces placeholders in text dynamically."""
-    if not text:
-        return ""
+def replace_placeholders(text, placeholders, context=""):
+    """Replaces placeholders in text dynamically (single pass over the compiled template)."""
+    return render_text(text, placeholders, context=context)
 
-    for key, value in placeholders.items():
-        text = text.replace(f"{{{key}}}", str(value))
 
-    return text
+def add_section(doc, plan_section, placeholders, template=None):
+    """
+    Emits one compiled plan section: heading, text, special content, bullets, tables, charts and images.
 
+    With a DocumentTemplate, static sections are spliced in from its prerendered XML fragments, and
+    (when the section cache is enabled) other sections are restored from the fragment rendered for
+    the same inputs by an earlier report, so regenerating after a small edit only re-emits the
+    sections whose inputs changed.
+    """
+    with span("section", key=plan_section.key, number=plan_section.number):
+        count("sections")
 
-def add_section(doc, section_title, section_data, section_number, placeholders, numbering_tracker):
-    """Recursively adds sections, subsections, and sub-subsections, while managing numbering of tables and figures at the section level."""
+        if template is not None and is_static_section(plan_section):
+            count("static_sections")
+            template.splice(doc, template.fragment(
+                plan_section, lambda scratch: emit_section(scratch, plan_section, placeholders)))
+            return
 
-    # Determine section heading level
-    heading_level = section_number.count(".") + 1
+        section_cache = get_section_cache(CONSTANTS) if template is not None else None
+        if section_cache is None:
+            emit_section(doc, plan_section, placeholders)
+            return
 
-    # Add a page break only for main sections (level 1 heading)
-    if heading_level == 1:
-        doc.add_page_break()
+        key = section_fingerprint(plan_section, placeholders)
+        fragment = section_cache.get(key)
+        if fragment is not None:
+            count("cached_sections")
+            load_fragment(doc, fragment)
+            return
 
-    # Fetch the correct section title from JSON (fallback to formatted key name if not found)
-    json_title = section_data.get("title", section_title.replace("_", " ").title())
+        start = body_end(doc)
+        emit_section(doc, plan_section, placeholders)
+        section_cache.put(key, dump_fragment(doc, start))
 
-    # Add section heading
-    doc.add_heading(f"{section_number}. {json_title}", level=heading_level)
 
-    # Precompute table and figure numbers
-    computed_table_numbers, computed_figure_numbers = precompute_numbers(section_data, section_number, numbering_tracker)
+# Bump whenever emit_section's output changes for the same inputs, so cached sections are re-rendered
+SECTION_RENDER_VERSION = 1
 
-    # Replace placeholders and add section text
-    process_section_text(doc, section_data, placeholders, computed_table_numbers, computed_figure_numbers)
+# Config entries that never change a section's output (paths, worker counts, cache sizes)
+SECTION_INDEPENDENT_CONSTANTS = ("output_dir", "cache_dir", "data_store", "chart_workers", "report_workers",
+                                 "report_queue_size", "chart_cache_max_mb", "section_cache_max_mb",
+                                 "package_size_limit_mb", "trend", "service", "location_map")
 
-    # Handle special sections: Scope of Work, Regulatory Standards
-    filtered_subsections = process_special_sections(section_title, section_data, placeholders, doc)
 
-    # Add bullet lists
-    add_bullet_list(doc, section_data, placeholders)
+def section_fingerprint(plan_section, placeholders):
+    """
+    Hashes everything a section's output depends on: its compiled plan (structure subtree, numbering and
+    captions), the placeholders it references, its bound table rows, image contents, the verdict and the
+    configuration (chart profile, image settings).
+    """
+    names = set()
+    for template in (plan_section.text,) + plan_section.bullets + tuple(table.title for table in plan_section.tables):
+        names |= template_placeholders(template)
+
+    tables = []
+    for plan_table in plan_section.tables:
+        rows = bind_table_rows(plan_table, placeholders)
+        for row in rows:
+            for cell in row:
+                if "{" in str(cell):
+                    names |= template_placeholders(compile_template(str(cell)))
+        limits = None
+        if plan_table.chart_type and placeholders.get("exceedances") is not None:
+            exceedance_limits = placeholders["exceedances"].limits
+            limits = (chart_limits(exceedance_limits, plan_table.chart_type),
+                      chart_limit_labels(exceedance_limits, plan_table.chart_type))
+        tables.append((rows, limits))
+
+    images = []
+    for plan_image in plan_section.images:
+        image_path, image_description = bind_image(plan_image, placeholders)
+        content = file_content_hash(image_path) if image_path and os.path.exists(image_path) else None
+        images.append((image_description, content))
+
+    verdict = None
+    if plan_section.verdict:
+        verdict = conclusion_verdict(placeholders.get("exceedances"), plan_section.verdict)
+
+    payload = json.dumps({
+        "version": [SECTION_RENDER_VERSION, CHART_STYLE_VERSION, IMAGE_PIPELINE_VERSION],
+        "constants": {key: value for key, value in CONSTANTS.items() if key not in SECTION_INDEPENDENT_CONSTANTS},
+        "section": repr(plan_section),
+        "placeholders": {name: placeholders.get(name) for name in sorted(names)},
+        "tables": tables,
+        "images": images,
+        "verdict": verdict,
+    }, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=1024)
+def is_static_section(plan_section):
+    """True when a section's output depends on the plan alone (no placeholders, bound data, verdict or images)."""
+    if plan_section.verdict or plan_section.images:
+        return False
+
+    templates = (plan_section.text,) + plan_section.bullets + tuple(table.title for table in plan_section.tables)
+    if any(template_placeholders(template) for template in templates):
+        return False
+
+    return all(table.binding is None and not table.chart_type
+               and not any("{" in str(cell) for row in table.rows for cell in row)
+               for table in plan_section.tables)
+
+
+def emit_section(doc, plan_section, placeholders):
+    """Builds a section's content through python-docx (see `add_section`)."""
+    # Add a page break only for main sections (level 1 heading)
+    if plan_section.level == 1:
+        doc.add_page_break()
 
-    # Insert tables, images, and graphs
-    insert_tables(doc, section_data, placeholders, computed_table_numbers, computed_figure_numbers)
-    insert_images_and_graphs(doc, section_data, computed_figure_numbers, placeholders)
-
-    # Recursively process subsections
-    for idx, (sub_key, sub_data) in enumerate(filtered_subsections.items(), start=1):
-        sub_section_number = f"{section_number}.{idx}"
-        add_section(doc, sub_key, sub_data, sub_section_number, placeholders, numbering_tracker)
-
-
-def precompute_numbers(section_data, section_number, numbering_tracker):
-    """Precompute table and figure numbers before replacing placeholders."""
-    main_section_number = section_number.split(".")[0]  # Extract main section (e.g., "4" from "4.1.2")
-
-    computed_table_numbers = []
-    computed_figure_numbers = []  # Includes images, graphs, and charts
-
-    # ✅ Precompute Table Numbers
-    if "table" in section_data:
-        numbering_tracker["table"][main_section_number] = numbering_tracker["table"].get(main_section_number, 0) + 1
-        computed_table_numbers.append(f"{main_section_number}.{numbering_tracker['table'][main_section_number]}")
-    elif "tables" in section_data:
-        num_tables = len(section_data["tables"])
-        for _ in range(num_tables):
-            numbering_tracker["table"][main_section_number] = numbering_tracker["table"].get(main_section_number, 0) + 1
-            computed_table_numbers.append(f"{main_section_number}.{numbering_tracker['table'][main_section_number]}")
-
-    # ✅ Precompute Figure Numbers for Images, Graphs, and Charts
-    num_figures = 0
-    if "image" in section_data:
-        num_figures += 1
-    if "images" in section_data:
-        num_figures += len(section_data["images"])
-    if "graph" in section_data:
-        num_figures += 1
-
-    # ✅ Ensure Charts Get a Figure Number **ONLY for Air/Noise Monitoring**
-    valid_chart_headers = {
-        "air_quality": ["Monitoring Location", "Time", "CO", "O3", "NO2", "SO2", "PM2.5", "PM10"],
-        "noise_quality": ["Monitoring Location", "Time", "EQ", "Max", "AE", "10", "50", "90"]
-    }
-
-    if "table" in section_data and "data" in section_data["table"]:
-        table_headers = section_data["table"]["data"][0]  # First row = column headers
-
-        # ✅ Only count figures if headers match air or noise monitoring
-        if table_headers == valid_chart_headers["air_quality"] or table_headers == valid_chart_headers["noise_quality"]:
-            pollutants = table_headers[2:]  # Skip first two columns (Monitoring Location & Time)
-            num_figures += len(pollutants)  # Allocate figure numbers for each pollutant's chart
-
-    if "tables" in section_data:
-        for tbl in section_data["tables"]:
-            if "data" in tbl:
-                table_headers = tbl["data"][0]  # First row = column headers
-                if table_headers == valid_chart_headers["air_quality"] or table_headers == valid_chart_headers["noise_quality"]:
-                    pollutants = table_headers[2:]  # Skip first two columns (Monitoring Location & Time)
-                    num_figures += len(pollutants)
-
-    # ✅ Assign Figure Numbers Only When Needed
-    for _ in range(num_figures):
-        numbering_tracker["figure"][main_section_number] = numbering_tracker["figure"].get(main_section_number, 0) + 1
-        computed_figure_numbers.append(f"{main_section_number}.{numbering_tracker['figure'][main_section_number]}")
-
-    return computed_table_numbers, computed_figure_numbers
-
-
-def process_section_text(doc, section_data, placeholders, computed_table_numbers, computed_figure_numbers):
-    """Replace placeholders and add section text, ensuring correct figure number ranges while keeping table numbers intact."""
-    text = section_data.get("text", "")
-
-    if not text:
-        return
+    # Add section heading
+    doc.add_heading(plan_section.title, level=plan_section.level)
 
-    # ✅ Step 1: Replace `{table_number}` placeholders (UNCHANGED)
-    while "{table_number}" in text and computed_table_numbers:
-        text = text.replace("{table_number}", computed_table_numbers[0], 1)
+    with span("text"):
+        # Replace placeholders and add section text
+        process_section_text(doc, plan_section, placeholders)
 
-    # ✅ Step 2: Handle `{figure_number} to {figure_number}` correctly
-    match = re.search(r"\{figure_number} to \{figure_number}", text)
+        # Handle special sections: Scope of Work, Conclusion
+        process_special_sections(doc, plan_section, placeholders)
 
-    if match and len(computed_figure_numbers) >= 2:
-        first_figure = computed_figure_numbers[0]  # Get first available figure number
-        last_figure = computed_figure_numbers[len(computed_figure_numbers) - 1]  # Get last available figure number
+        # Add bullet lists
+        add_bullet_list(doc, plan_section, placeholders)
 
-        # Replace the range placeholder correctly
-        text = text.replace("{figure_number} to {figure_number}", f"{first_figure} to {last_figure}", 1)
+    # Insert tables, images, and graphs
+    insert_tables(doc, plan_section, placeholders)
+    insert_images_and_graphs(doc, plan_section, placeholders)
 
-        # **Remove only the used numbers in the range**
-        computed_figure_numbers = computed_figure_numbers[1:]  # Remove first figure (keep last for remaining replacements)
 
-    # ✅ Step 3: Replace remaining `{figure_number}` placeholders sequentially
-    while "{figure_number}" in text and computed_figure_numbers:
-        text = text.replace("{figure_number}", computed_figure_numbers.pop(0), 1)
+def process_section_text(doc, plan_section, placeholders):
+    """Render the compiled section text with its table numbers and figure number ranges."""
+    if not plan_section.text:
+        return
 
-    # **🔹 Step 4: Handle Case Where Not Enough Figures Are Available**
-    if "{figure_number}" in text:
-        print(f"⚠ Warning: Not enough figure numbers to replace all placeholders in section '{section_data.get('title', '')}'")
+    # ✅ Render placeholders, table numbers and `{figure_number} to {figure_number}` ranges in one pass
+    text = render_template(plan_section.text, placeholders, plan_section.table_numbers,
+                           plan_section.figure_numbers, context=plan_section.title)
 
-    # ✅ Step 5: Add the processed text to the document (Prevents Empty Paragraphs)
+    # ✅ Add the processed text to the document (Prevents Empty Paragraphs)
     if text.strip():
-        doc.add_paragraph(replace_placeholders(text, placeholders))
+        doc.add_paragraph(text)
 
 
+def process_special_sections(doc, plan_section, placeholders):
+    """Handle special sections like Scope of Work and Conclusion (content precomputed in the plan)."""
+    for param in plan_section.special_bullets:
+        doc.add_paragraph(param, style="List Bullet")
 
+    for paragraph in plan_section.special_paragraphs:
+        doc.add_paragraph(paragraph)
 
+    # ✅ Verdict reflects the computed exceedances, not a fixed compliance statement
+    if plan_section.verdict:
+        doc.add_paragraph(conclusion_verdict(placeholders.get("exceedances"), plan_section.verdict))
 
 
-def process_special_sections(section_title, section_data, placeholders, doc):
-    """Handle special sections like Scope of Work and Regulatory Standards."""
-    if section_title.lower() == "scope of work" and placeholders.get("report_parameters"):
-        parameter_list = [p.strip() for p in placeholders["report_parameters"].split(",")]
-        formatted_parameters = [format_parameter_section(param) for param in parameter_list]
-        for param in formatted_parameters:
-            doc.add_paragraph(param, style="List Bullet")
-
-    if section_title.lower() == "regulatory standards" and placeholders.get("report_parameters"):
-        parameter_list = [p.strip().lower() for p in placeholders["report_parameters"].split(",")]
-        filtered_subsections = {
-            key: value for key, value in section_data.get("subsections", {}).items()
-            if key.lower() in parameter_list
-        }
-        if not filtered_subsections:
-            print(f"⚠ Warning: No matching regulatory standard found for parameters {parameter_list}.")
-        return filtered_subsections
-
-    if section_title.lower() == "conclusion" and placeholders.get("report_parameters"):
-        parameter_list = [p.strip().lower() for p in placeholders["report_parameters"].split(",")]
+def add_bullet_list(doc, plan_section, placeholders):
+    """Add bullet lists to the document if available."""
+    for point in plan_section.bullets:
+        formatted_point = render_template(point, placeholders, context=plan_section.title)
+        doc.add_paragraph(formatted_point, style="List Bullet")
 
-        # Load conclusions and verdict from constants.json
-        conclusion_texts = CONSTANTS.get("conclusions", {})
-        verdict_text = conclusion_texts.get("verdict",
-                                            "This analysis revealed that the observed monitoring parameter(s) consistently adhered to the national standards across all monitored locations at the project site.")
 
-        # Append the relevant conclusions based on selected parameters
-        conclusion_paragraphs = []
-        for param in parameter_list:
-            if param in conclusion_texts:
-                conclusion_paragraphs.append(conclusion_texts[param])
+def bind_table_rows(plan_table, placeholders):
+    """Returns the rows to emit for a plan table: bound monitoring data when available, else the static rows."""
+    bound = placeholders.get(plan_table.binding) if plan_table.binding else None
+    if isinstance(bound, MonitoringTable):
+        return bound.rows()
+    if bound:
+        return bound
+    return plan_table.rows
 
-        # Add conclusions and verdict to the document
-        if conclusion_paragraphs:
-            doc.add_paragraph("\n\n".join(conclusion_paragraphs))  # Ensures spacing between paragraphs
-            doc.add_paragraph(verdict_text)
-        else:
-            print(f"⚠ Warning: No matching conclusions found for parameters {parameter_list}.")
 
-    return section_data.get("subsections", {})
+def insert_tables(doc, plan_section, placeholders):
+    """Insert tables using precomputed table numbers and dynamically inject monitoring data when applicable."""
+    for plan_table in plan_section.tables:
+        rows = bind_table_rows(plan_table, placeholders)
+        if not rows:
+            print(f"⚠ Warning: Unexpected table format in section. Skipping.")
+            continue
 
+        with span("table", number=plan_table.number, rows=len(rows)):
+            count_table(rows)
+            table_title = render_template(plan_table.title, placeholders, [plan_table.number],
+                                          context=plan_section.title)
+            doc.add_heading(table_title, level=4)
 
-def add_bullet_list(doc, section_data, placeholders):
-    """Add bullet lists to the document if available."""
-    bullet_points = section_data.get("bullet_list", [])
-    for point in bullet_points:
-        formatted_point = replace_placeholders(point, placeholders)
-        doc.add_paragraph(formatted_point, style="List Bullet")
+            # ✅ Insert Updated Table into Document (single pass, no per-cell python-docx calls)
+            add_bulk_table(doc, rows, style='Table Grid',
+                           transform=lambda cell_text: replace_placeholders(cell_text, placeholders))
 
+            doc.add_paragraph("")
 
+        if plan_table.chart_type:
+            with span("charts", number=plan_table.number, chart_type=plan_table.chart_type):
+                insert_charts(doc, plan_table, placeholders.get(plan_table.binding), placeholders.get("exceedances"))
 
-def insert_tables(doc, section_data, placeholders, computed_table_numbers, computed_figure_numbers):
-    """Insert tables using precomputed table numbers and dynamically inject monitoring data when applicable."""
 
-    # 🔹 Check if section contains a single table or multiple tables
-    if "table" in section_data:
-        tables = [section_data["table"]]
-    elif "tables" in section_data:
-        tables = section_data["tables"]
-    else:
-        return  # No table data present
+def count_table(rows):
+    """Table counters for the trace (header included; rows are padded/truncated to the header width)."""
+    count("tables")
+    count("table_rows", len(rows))
+    count("table_cells", len(rows) * len(rows[0]))
 
-    # ✅ Known headers for data injection
-    air_quality_headers = ["Monitoring Location", "Time", "CO", "O3", "NO2", "SO2", "PM2.5", "PM10"]
-    noise_quality_headers = ["Monitoring Location", "Time", "EQ", "Max", "AE", "10", "50", "90"]
 
-    # 🔹 Check if this section needs dynamic data injection
-    if "title" in section_data:
-        section_title = section_data["title"].lower()
+def bind_image(plan_image, placeholders):
+    """Resolves a plan image to (path, description), or (None, None) if its data slot is empty."""
+    if plan_image.binding == "monitoring_location_map":
+        return placeholders.get("monitoring_location_map"), plan_image.description
 
-        # ✅ Monitoring Locations (Scope of Work)
-        if "monitoring locations" in section_title and "monitoring_locations" in placeholders:
-            tables[0]["data"] = placeholders["monitoring_locations"]
+    if plan_image.binding == "monitoring_location_images":
+        location_images = list((placeholders.get("monitoring_location_images") or {}).items())
+        if plan_image.binding_index >= len(location_images):
+            return None, None
+        location, image_path = location_images[plan_image.binding_index]
+        return image_path, f"Location {location}"
 
-        # ✅ Inject Air & Noise Quality Data
-        if "table" in section_data and "data" in section_data["table"] and section_data["table"]["data"]:
-            header_row = section_data["table"]["data"][0]
+    return plan_image.path, plan_image.description
 
-            if header_row == air_quality_headers and "air_monitoring_data" in placeholders:
-                section_data["table"]["data"] = placeholders["air_monitoring_data"]
 
-            elif header_row == noise_quality_headers and "noise_monitoring_data" in placeholders:
-                section_data["table"]["data"] = placeholders["noise_monitoring_data"]
+def insert_images_and_graphs(doc, plan_section, placeholders):
+    """Insert multiple images and graphs with descriptions, ensuring they are centered and appear below."""
+    from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+    from docx.shared import Inches
 
-    # 🔹 Ensure Correct Number of Table Numbers Are Available
-    if len(computed_table_numbers) < len(tables):
-        print(f"⚠ Warning: Mismatch between precomputed table numbers and actual tables in section.")
-        return  # Avoid index errors
+    for plan_image in plan_section.images:
+        image_path, image_description = bind_image(plan_image, placeholders)
 
-    # 🔹 Insert All Tables
-    for index, table_data in enumerate(tables):
-        if not isinstance(table_data, dict) or "data" not in table_data or not table_data["data"]:
-            print(f"⚠ Warning: Unexpected table format in section. Skipping.")
+        if not image_path or not os.path.exists(image_path):
             continue
 
-        table_number = computed_table_numbers[index]  # ✅ Use correct precomputed number
-        table_title = replace_placeholders(table_data.get("title", "Table"), placeholders).replace("{table_number}", table_number)
-
-        doc.add_heading(table_title, level=4)
-
-        # ✅ Insert Updated Table into Document
-        table = doc.add_table(rows=len(table_data["data"]), cols=len(table_data["data"][0]))
-        table.style = 'Table Grid'
-
-        for row_idx, row_data in enumerate(table_data["data"]):
-            for col_idx, cell_data in enumerate(row_data):
-                table.cell(row_idx, col_idx).text = replace_placeholders(str(cell_data), placeholders)
+        try:
+            with span("image_prepare", figure=plan_image.figure_number):
+                # 🔹 Normalize DPI and downsample to the placed width (source file is left untouched)
+                prepared_path = prepare_image(image_path, plan_image.width, CONSTANTS, plan_image.figure_class)
+            count_figure(prepared_path)
+
+            # 🔹 Insert Image and Center Align
+            image_paragraph = doc.add_paragraph()
+            image_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+            run = image_paragraph.add_run()
+            run.add_picture(prepared_path, width=Inches(plan_image.width))  # ✅ Adjust width dynamically
+
+            # 🔹 Add Image Description Below
+            caption = f"Figure {plan_image.figure_number} - {image_description}"
+            if plan_image.caption_heading:
+                desc_paragraph = doc.add_heading(caption, level=5)
+            else:
+                desc_paragraph = doc.add_paragraph(caption)
+            desc_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+            doc.add_paragraph("")
 
-        doc.add_paragraph("")
+        except Exception as e:
+            print(f"⚠ Warning: Failed to insert image {image_path}. Error: {e}")
 
-        if table_data["data"][0] == air_quality_headers or table_data["data"][0] == noise_quality_headers:
-            insert_charts(doc, section_data, computed_figure_numbers, placeholders)
 
+def count_figure(image):
+    """Figure counters for the trace; `image` is a file path or PNG bytes."""
+    count("figures")
+    if is_tracing():
+        count("image_bytes", len(image) if isinstance(image, bytes) else os.path.getsize(image))
 
-def insert_images_and_graphs(doc, section_data, computed_figure_numbers, placeholders):
-    """Insert multiple images and graphs with descriptions, ensuring they are centered and appear below."""
 
-    if section_data.get("title") == "Scope of Work":
-        monitoring_locations_section = section_data.get("subsections", {}).get("monitoring_locations", {})
-
-        if "images" not in monitoring_locations_section:
-            monitoring_locations_section["images"] = []  # Ensure the key exists
-
-        # ✅ Insert Monitoring Location Map at the beginning (if provided)
-        if placeholders.get("monitoring_location_map") and not any(
-                img.get("description") == "Monitoring Location Map showing marked locations." for img in
-                monitoring_locations_section["images"]):
-            monitoring_locations_section["images"].insert(0, {
-                "path": placeholders["monitoring_location_map"],
-                "description": "Environmental Monitoring Location Map"
-            })
-
-        # ✅ Insert Site Images for each monitoring location (if provided)
-        if placeholders.get("monitoring_location_images"):
-            for location, image_path in placeholders["monitoring_location_images"].items():
-                monitoring_locations_section["images"].append({
-                    "path": image_path,
-                    "description": f"Location {location}"
-                })
-
-    # 🔹 Handle Multiple Images
-    if "images" in section_data:
-        for image_data in section_data["images"]:
-            if not isinstance(image_data, dict) or "path" not in image_data:
-                print("⚠ Warning: Image data format incorrect. Skipping.")
-                continue
-
-            if not computed_figure_numbers:
-                print("⚠ Warning: Not enough figure numbers for images.")
-                continue
-
-            figure_number = computed_figure_numbers.pop(0)
-            image_path = image_data["path"]
-            image_description = image_data.get("description", f"Figure {figure_number} - Image Description")
-
-            if os.path.exists(image_path):
-                try:
-                    with Image.open(image_path) as img:
-                        dpi = img.info.get('dpi')  # Extract DPI metadata
-                        if dpi is None or dpi[0] == 0 or dpi[1] == 0:
-                            print(f"⚠ Warning: DPI metadata missing for {image_path}. Setting default DPI to 96.")
-                            dpi = (96, 96)
-                        img.save(image_path, dpi=dpi)  # Save with corrected DPI
-
-                    # 🔹 Determine Image Size
-                    image_width = Inches(5) if "Location Map" in image_description else Inches(2.5)  # Larger for Location Map
-
-                    # 🔹 Insert Image and Center Align
-                    image_paragraph = doc.add_paragraph()
-                    image_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-                    run = image_paragraph.add_run()
-                    run.add_picture(image_path, width=image_width)  # ✅ Adjust width dynamically
-
-                    # 🔹 Add Image Description Below
-                    desc_paragraph = doc.add_heading(f"Figure {figure_number} - {image_description}", level=5)
-                    desc_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-                    doc.add_paragraph("")
-
-                except Exception as e:
-                    print(f"⚠ Warning: Failed to insert image {image_path}. Error: {e}")
-
-    # 🔹 Handle Single Image (for backward compatibility)
-    elif "image" in section_data:
-        figure_number = computed_figure_numbers.pop(0)
-        image_path = section_data["image"]
-        image_description = section_data.get("image_description", f"Figure {figure_number} - Image Description")
-
-        if os.path.exists(image_path):
-            try:
-                with Image.open(image_path) as img:
-                    dpi = img.info.get('dpi')
-                    if dpi is None or dpi[0] == 0 or dpi[1] == 0:
-                        print(f"⚠ Warning: DPI metadata missing for {image_path}. Setting default DPI to 96.")
-                        dpi = (96, 96)
-                    img.save(image_path, dpi=dpi)
-
-                # 🔹 Determine Image Size
-                image_width = Inches(3) if "Location Map" in image_description else Inches(1.5)  # Larger for Location Map
-
-                # 🔹 Insert Image and Center Align
-                image_paragraph = doc.add_paragraph()
-                image_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-                run = image_paragraph.add_run()
-                run.add_picture(image_path, width=image_width)
-
-                # 🔹 Add Image Description Below
-                desc_paragraph = doc.add_paragraph(f"Figure {figure_number} - {image_description}")
-                desc_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-                doc.add_paragraph("")
-
-            except Exception as e:
-                print(f"⚠ Warning: Failed to insert image {image_path}. Error: {e}")
-
-def insert_charts(doc, section_data, computed_figure_numbers, placeholders):
-    """Generate and insert charts for air and noise quality monitoring data using sequential figure numbering."""
-
-    # Define headers for air and noise quality
-    air_quality_headers = ["Monitoring Location", "Time", "CO", "O3", "NO2", "SO2", "PM2.5", "PM10"]
-    noise_quality_headers = ["Monitoring Location", "Time", "EQ", "Max", "AE", "10", "50", "90"]  # Ensure correct case
-
-    # Identify if air or noise monitoring data is present
-    if "table" in section_data and "data" in section_data["table"]:
-        table_data = section_data["table"]["data"]
-    elif "tables" in section_data:
-        table_data = section_data["tables"][0]["data"] if section_data["tables"] else []
-    else:
-        print("⚠ Warning: No relevant table data found.")
-        return  # No relevant table data
+def build_chart_specs(plan_table, table_data, exceedances=None):
+    """
+    Builds the chart specs for an air/noise table from its bound data (a MonitoringTable or rows).
 
-    # Convert table data to DataFrame
-    df = pd.DataFrame(table_data[1:], columns=table_data[0])  # Use first row as headers
+    :return: (monitoring_type, chart specs in plan order), or (monitoring_type, None) when there is no data.
+    """
+    # ✅ Benchmark lines come from the parsed regulatory standards tables
+    standards = chart_limits(exceedances.limits, plan_table.chart_type) if exceedances else {}
+    standard_labels = chart_limit_labels(exceedances.limits, plan_table.chart_type) if exceedances else {}
 
     # ✅ Determine monitoring type
-    if set(df.columns) == set(air_quality_headers):  # Using set() to ignore column order issues
+    if plan_table.chart_type == "air":
         monitoring_type = "Air Quality"
-        ncec_standards = {
-            "CO": 40000,
-            "O3": 157,
-            "NO2": 200,
-            "SO2": 441,
-            "PM2.5": 35,
-            "PM10": 340
-        }
         y_axis_label = "Concentration (μg/m³)"  # ✅ Air quality uses μg/m³
-    elif set(df.columns) == set(noise_quality_headers):  # ✅ Ensuring we match the noise headers correctly
+    else:
         monitoring_type = "Noise Quality"
-        ncec_standards = {"EQ": 70}  # ✅ Only EQ benchmark (70 dB)
         y_axis_label = "Noise Level (dB)"  # ✅ Noise quality uses dB
-    else:
-        print(f"⚠ Warning: Table headers do not match expected Air/Noise quality formats. Headers found: {df.columns.tolist()}")
-        return  # Not an air/noise monitoring table
 
-    # ✅ Extract monitoring locations dynamically
-    locations = df["Monitoring Location"].tolist()
+    table = as_monitoring_table(table_data, plan_table.chart_type)
+    if table is None:
+        print(f"⚠ Warning: No {monitoring_type} data to chart.")
+        return monitoring_type, None
 
-    # ✅ Extract pollutants dynamically (Only EQ for Noise)
-    if monitoring_type == "Air Quality":
-        pollutants = [col for col in df.columns if col not in ["Monitoring Location", "Time"]]
-    elif monitoring_type == "Noise Quality":
-        pollutants = ["EQ"] if "EQ" in df.columns else []  # ✅ Only include EQ for Noise
+    # ✅ Typed columns straight from the table (parsed once when the data was bound)
+    locations = table.location.astype(str).tolist()
 
-    # ✅ Ensure we have valid pollutants to plot
-    if not pollutants:
-        print(f"⚠ Warning: No valid pollutants found for {monitoring_type}. Skipping chart generation.")
-        return
-
-    # ✅ Generate and save charts dynamically
-    saved_files = []
-    for pollutant in pollutants:
-        if not computed_figure_numbers:
-            print(f"⚠ Warning: Not enough figure numbers for charts.")
-            continue
+    # ✅ Build chart specs dynamically
+    return monitoring_type, [{
+        "monitoring_type": monitoring_type,
+        "pollutant": chart.pollutant,
+        "locations": locations,
+        "values": table.columns[chart.pollutant].tolist(),
+        "standard": standards.get(chart.pollutant),
+        "standard_label": standard_labels.get(chart.pollutant),
+        "y_axis_label": y_axis_label
+    } for chart in plan_table.charts]
 
-        figure_number = computed_figure_numbers.pop(0)  # Fetch the next figure number
 
-        fig, ax = plt.subplots(figsize=(6, 4))  # Set figure size
-
-        # Extract pollutant values for each location
-        pollutant_values = df[pollutant].astype(float).tolist()
+def render_table_charts(plan_table, table_data, exceedances=None):
+    """
+    Renders the charts that follow an air/noise table (cached, in parallel when workers are available).
 
-        # ✅ Plot bars
-        bars = ax.bar(locations, pollutant_values, color='#1f77b4', width=0.4, label=f"{pollutant} Levels")
+    :return: List of (figure caption, PNG bytes) in plan order.
+    """
+    monitoring_type, chart_specs = build_chart_specs(plan_table, table_data, exceedances)
+    if not chart_specs:
+        return []
 
-        # ✅ Add a horizontal benchmark line if applicable
-        if pollutant in ncec_standards:
-            ax.axhline(y=ncec_standards[pollutant], color='red', linestyle='--', linewidth=2,
-                       label=f"NCEC Std. ({ncec_standards[pollutant]} {y_axis_label})")
+    with span("chart_render", charts=len(chart_specs)):
+        rendered_charts = render_charts(chart_specs, resolve_chart_profile(CONSTANTS), CONSTANTS.get("chart_workers"),
+                                        cache=get_chart_cache(CONSTANTS))
+    for chart_png in rendered_charts:
+        count_figure(chart_png)
+    return [(f"Figure {chart.figure_number} - {monitoring_type} - {chart.pollutant} Levels", chart_png)
+            for chart, chart_png in zip(plan_table.charts, rendered_charts)]
 
-        # ✅ Labels and title
-        ax.set_xlabel("Monitoring Locations")
-        ax.set_ylabel(y_axis_label)
-        ax.set_title(f"{monitoring_type} - {pollutant} Levels")
-        ax.legend()
 
-        # ✅ Save the figure
-        filename = f"{pollutant.replace(' ', '_').replace('/', '_')}_levels.png"
-        plt.savefig(filename, dpi=300, bbox_inches='tight')
-        saved_files.append((filename, figure_number, pollutant))
+def insert_charts(doc, plan_table, table_data, exceedances=None):
+    """Generate and insert charts for air and noise quality monitoring data using the plan's figure numbers."""
+    from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+    from docx.shared import Inches
 
-        plt.close(fig)  # ✅ Prevent display when running script
+    display_width = resolve_chart_profile(CONSTANTS)["display_width"]
 
     # ✅ Insert images into Word document
-    for image_path, figure_number, pollutant in saved_files:
-        doc.add_heading(f"Figure {figure_number} - {monitoring_type} - {pollutant} Levels", level=5)
+    for caption, chart_png in render_table_charts(plan_table, table_data, exceedances):
+        doc.add_heading(caption, level=5)
 
         # ✅ Insert Image and Center Align
         image_paragraph = doc.add_paragraph()
         image_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
         run = image_paragraph.add_run()
-        run.add_picture(image_path, width=Inches(4))
+        run.add_picture(io.BytesIO(encode_image_bytes(chart_png, "chart", CONSTANTS)), width=Inches(display_width))
 
         doc.add_paragraph("")  # ✅ Add spacing below
 
-        # ✅ Clean up temporary files
-        os.remove(image_path)
-
-
-
-
-def format_parameter_section(parameter):
-    """Formats user input parameters into proper section titles."""
-    formatted_parameters = {
-        "air": "Ambient Air Quality Monitoring",
-        "noise": "Noise Monitoring",
-        "soil": "Soil Quality Monitoring",
-        "water": "Water Quality Monitoring"
-    }
-    return formatted_parameters.get(parameter.lower(), parameter.capitalize() + " Monitoring")
-
-def generate_report():
-    """Generates a monitoring report dynamically based on input data."""
-
-    structure_file = CONSTANTS["structure_file"]
-
-
-    placeholders = {'consultancy_name': 'Green Fields Environmental Consulting',
-                    'contractor_name': 'Abdullah Bin Talib for Swimming Pools Co.',
-                    'project_location': 'Rosewood Resort Triple Bay',
-                    'project_name': 'Concrete Structure & Civil Works',
-                    'project_number': 'PR2408074 ',
-                    'reference_number': '2408074-RSG-MAC-WR-23',
-                    'report_frequency': 'Weekly',
-                    'report_date': '05 Jan 2025',
-                    'report_number': '59th',
-                    'report_parameters': 'Air, Noise',
-                    'monitoring_frequency': '30 mins',
-                    'monitoring_locations': [['Monitoring Location', 'Description', 'Latitude', 'Longitude'],
-                                             ['ML-01', 'Family Pool', '26.636180°', '36.224574°'],
-                                             ['ML-02', 'Couple Pool', '26.627794°', '36.227677°']],
-                    'monitoring_location_map': 'monitoring/test_data/map.png',
-                    'monitoring_location_images': {'ML-01': 'monitoring/test_data/ml01.png',
-                                                   'ML-02': 'monitoring/test_data/ml02.png'},
-                    'air_monitoring_data': [['Monitoring Location', 'Time', 'CO', 'O3', 'NO2', 'SO2', 'PM2.5', 'PM10'],
-                                            ['ML-01', '30/12/2024 09:37', '1016.4', '51', '88.8', '41.4', '14.3', '120.9'],
-                                            ['ML-02', '30/12/2024 10:22', '1253.3', '37.0', '64.2', '99.8', '15.8', '131.3']],
-                    'noise_monitoring_data': [['Monitoring Location', 'Time', 'EQ', 'Max', 'AE', '10', '50', '90'],
-                                              ['ML-01', '30/12/2024 09:37', '61.3', '72.3', '93.9', '64.1', '60.06', '55.8'],
-                                              ['ML-02', '30/12/2024 10:22', '61', '82.3', '93.6', '64.2', '58.6', '55.8']]}
-
-    # Load structured JSON
-    with open(structure_file, 'r') as file:
-        section_data = json.load(file)
-
-    # Convert JSON keys to lowercase for **case-insensitive** lookup
-    section_data = {key.lower(): value for key, value in section_data.items()}
-
-    # Define **explicit** section order
-    sections = [
-        "Introduction",
-        "Scope of Work",
-        "Regulatory Standards"
-    ]
-
-    # 📌 Insert User-defined Sections Dynamically
-    if placeholders["report_parameters"]:
-        parameter_list = [p.strip() for p in placeholders["report_parameters"].split(",")]
-        formatted_parameters = [format_parameter_section(param) for param in parameter_list]
-        sections.extend(formatted_parameters)
-
-    # 📌 Add Final Sections
-    sections.extend(["Conclusion", "Appendices"])
-
-    # Initialize table/figure/graph numbering tracker
-    numbering_tracker = {
-        "table": {},
-        "figure": {},
-        "graph": {}
-    }
-
-    # Create Word document
-    doc = Document()
-    # set_document_theme(doc)
-    add_header(doc, placeholders)
 
+def bind_raw_readings(placeholders):
+    """
+    Aggregates raw instrument readings into the report tables at the report's monitoring frequency.
 
-    add_page_number(doc)
+    `air_readings` / `noise_readings` are typed readings frames (see `aggregation.frame_from_readings`);
+    when present they replace `air_monitoring_data` / `noise_monitoring_data`.
+    """
+    bound = dict(placeholders)
+    for kind in ("air", "noise"):
+        readings = placeholders.get(f"{kind}_readings")
+        if readings is None:
+            continue
+        from monitoring.aggregation import aggregate_monitoring_data
+        try:
+            bound[f"{kind}_monitoring_data"] = aggregate_monitoring_data(readings, kind,
+                                                                         placeholders.get("monitoring_frequency"))
+        except ValueError as e:
+            print(f"⚠ Warning: Unable to aggregate {kind} readings. Error: {e}")
+    return bound
+
+
+def bind_monitoring_tables(placeholders):
+    """
+    Parses `air_monitoring_data` / `noise_monitoring_data` rows into MonitoringTables, once per report, so
+    tables, charts and exceedances all read the same typed columns. Rows that don't match the schema are
+    left as they are (emitted as a plain table, not charted).
+    """
+    for kind in ("air", "noise"):
+        key = f"{kind}_monitoring_data"
+        rows = placeholders.get(key)
+        if not rows or isinstance(rows, MonitoringTable):
+            continue
+        try:
+            placeholders[key] = MonitoringTable.from_rows(rows, kind)
+        except ValueError as e:
+            print(f"⚠ Warning: Unable to read {kind} monitoring data. Error: {e}")
+    return placeholders
+
+
+# Sample project used when generate_report is called without placeholders (e.g. from main.py)
+SAMPLE_PLACEHOLDERS = {'consultancy_name': 'Green Fields Environmental Consulting',
+                       'contractor_name': 'Abdullah Bin Talib for Swimming Pools Co.',
+                       'project_location': 'Rosewood Resort Triple Bay',
+                       'project_name': 'Concrete Structure & Civil Works',
+                       'project_number': 'PR2408074 ',
+                       'reference_number': '2408074-RSG-MAC-WR-23',
+                       'report_frequency': 'Weekly',
+                       'report_date': '05 Jan 2025',
+                       'report_number': '59th',
+                       'report_parameters': 'Air, Noise',
+                       'monitoring_frequency': '30 mins',
+                       'monitoring_locations': [['Monitoring Location', 'Description', 'Latitude', 'Longitude'],
+                                                ['ML-01', 'Family Pool', '26.636180°', '36.224574°'],
+                                                ['ML-02', 'Couple Pool', '26.627794°', '36.227677°']],
+                       'monitoring_location_map': os.path.join(PACKAGE_DIR, 'test_data', 'map.png'),
+                       'monitoring_location_images': {'ML-01': os.path.join(PACKAGE_DIR, 'test_data', 'ml01.png'),
+                                                      'ML-02': os.path.join(PACKAGE_DIR, 'test_data', 'ml02.png')},
+                       'air_monitoring_data': [['Monitoring Location', 'Time', 'CO', 'O3', 'NO2', 'SO2', 'PM2.5', 'PM10'],
+                                               ['ML-01', '30/12/2024 09:37', '1016.4', '51', '88.8', '41.4', '14.3', '120.9'],
+                                               ['ML-02', '30/12/2024 10:22', '1253.3', '37.0', '64.2', '99.8', '15.8', '131.3']],
+                       'noise_monitoring_data': [['Monitoring Location', 'Time', 'EQ', 'Max', 'AE', '10', '50', '90'],
+                                                 ['ML-01', '30/12/2024 09:37', '61.3', '72.3', '93.9', '64.1', '60.06', '55.8'],
+                                                 ['ML-02', '30/12/2024 10:22', '61', '82.3', '93.6', '64.2', '58.6', '55.8']]}
+
+
+def report_filename(placeholders, extension=".docx", report_type=None):
+    """Builds the report file name; the reference/report number keeps concurrent projects from overwriting each other."""
+    name = get_report_type(report_type).file_prefix(placeholders)
+    for key in ("reference_number", "report_number"):
+        value = re.sub(r"[^A-Za-z0-9._-]+", "_", str(placeholders.get(key) or "")).strip("._")
+        if value:
+            name += f"_{value}"
+    return f"{name}{extension}"
+
+
+@lru_cache(maxsize=1)
+def report_file_mode():
+    """Mode a plain `open()` gives new files (0o666 less the umask); mkstemp's temp files are 0600."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def save_document(doc, report_path):
+    """Saves atomically (temp file + rename) so readers never see a half-written report."""
+    report_dir = os.path.dirname(report_path) or "."
+    os.makedirs(report_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=report_dir, suffix=".docx.tmp")
+    os.close(fd)
+    try:
+        doc.save(tmp_path)
+        os.chmod(tmp_path, report_file_mode())
+        os.replace(tmp_path, report_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def prepare_report(placeholders=None, report_type=None):
+    """
+    Binds report data and compiles the plan shared by every output format.
 
-    # 📌 Title Page
-    # add_title_page(doc, placeholders["report_frequency"])
+    :param report_type: Registered report type name (see reportTypes); defaults to the monitoring report.
+
+    :return: (ReportPlan, bound placeholders including the computed `exceedances`)
+    """
+    if placeholders is None:
+        placeholders = SAMPLE_PLACEHOLDERS
+    report_type = get_report_type(report_type)
+
+    reset_template_warnings()
+    chart_cache = get_chart_cache(CONSTANTS)
+    if chart_cache is not None:
+        chart_cache.reset_stats()
+    section_cache = get_section_cache(CONSTANTS)
+    if section_cache is not None:
+        section_cache.reset_stats()
+
+    # 📌 Aggregate raw instrument readings (if supplied) to the monitoring frequency; parse entered rows once
+    with span("readings"):
+        placeholders = bind_monitoring_tables(bind_raw_readings(placeholders))
+
+    # 📌 Generate the location map from the location coordinates when none was uploaded
+    with span("location_map"):
+        from monitoring.locations import bind_location_map
+        placeholders = bind_location_map(placeholders, CONSTANTS)
+
+    # 📌 Compile (or fetch the cached) report plan: sections, heading levels, numbering and data slots
+    with span("plan"):
+        plan = get_report_plan(CONSTANTS[report_type.structure_key], placeholders, CONSTANTS,
+                               report_type.section_names, PROJECT_DIR)
+
+    # 📌 Evaluate all readings against the regulatory standards (drives chart lines and the conclusion)
+    with span("exceedances"):
+        placeholders["exceedances"] = evaluate_exceedances(placeholders, reference_limits(plan.standards, CONSTANTS),
+                                                           CONSTANTS)
+
+    return plan, placeholders
+
+
+def prepare_base_document(doc):
+    """Applies the report-independent parts of every report to the base document (once per process)."""
+    # set_document_theme(doc)
+
+    add_page_number(doc)
 
     # 📌 Table of Contents
     add_table_of_contents(doc)
 
-    # 📌 Generate Sections
-    for i, section_key in enumerate(sections, start=1):
-        # Convert key to lowercase for safe lookup
-        section_key_lower = section_key.lower().replace(" ", "_")
 
-        if section_key_lower in section_data:
-            section_title = section_key  # ✅ Fetch correct title
-            add_section(doc, section_title, section_data[section_key_lower], str(i), placeholders, numbering_tracker)
-        else:
-            print(f"⚠ Warning: Section '{section_key}' not found in JSON.")
+def get_report_template():
+    """Returns the cached base document built from `template_dir` (see docTemplate)."""
+    return get_document_template(CONSTANTS.get("template_dir"), prepare_base_document)
 
 
-    # 📌 Save Document
-    output_dir = CONSTANTS["output_dir"]
-    os.makedirs(output_dir, exist_ok=True)
-    report_path = f"{output_dir}/{placeholders['report_frequency'].capitalize()}_Monitoring_Report.docx"
-    doc.save(report_path)
+def report_cache_summary():
+    """Prints the chart and section cache hit/miss lines for the report just generated."""
+    chart_cache = get_chart_cache(CONSTANTS)
+    if chart_cache is not None:
+        cache_stats = chart_cache.stats()
+        print(f"📊 Chart cache: {cache_stats['hits']} hit(s), {cache_stats['misses']} miss(es)")
+    section_cache = get_section_cache(CONSTANTS)
+    if section_cache is not None:
+        cache_stats = section_cache.stats()
+        print(f"📄 Section cache: {cache_stats['hits']} hit(s), {cache_stats['misses']} miss(es)")
 
-    print(f"✅ {placeholders['report_frequency'].capitalize()} Monitoring Report generated: {report_path}")
-    return report_path
\ No newline at end of file
+
+def generate_report(placeholders=None, report_path=None, report_type=None):
+    """
+    Generates a monitoring report (or another registered report type, e.g. "cesmp") based on input data.
+
+    :param placeholders: Report data; defaults to SAMPLE_PLACEHOLDERS.
+    :param report_path: Output .docx path; defaults to `output_dir` / `report_filename(placeholders)`.
+    :param report_type: Registered report type name (see reportTypes); defaults to the monitoring report.
+    :return: Path of the generated report.
+    """
+    report_type = get_report_type(report_type)
+    with span("report", format="docx", type=report_type.name):
+        with span("prepare"):
+            plan, placeholders = prepare_report(placeholders, report_type.name)
+
+        with span("document"):
+            # Copy of the cached base document (template styles, page numbers, contents fields)
+            template = get_report_template()
+            doc = template.new_document()
+            add_header(doc, placeholders, report_type.name)
+
+            # 📌 Title Page
+            # add_title_page(doc, placeholders["report_frequency"])
+
+        # 📌 Generate Sections
+        for plan_section in plan.sections:
+            add_section(doc, plan_section, placeholders, template)
+
+
+        # 📌 Save Document
+        if report_path is None:
+            report_path = os.path.join(CONSTANTS["output_dir"],
+                                       report_filename(placeholders, ".docx", report_type.name))
+        with span("package"):
+            count("duplicate_media", deduplicate_media(doc))
+        with span("save"):
+            save_document(doc, report_path)
+
+    print(f"✅ {report_type.file_prefix(placeholders).replace('_', ' ')} generated: {report_path}")
+    report_cache_summary()
+    print_package_summary(package_size_report(report_path), CONSTANTS)
+    return report_path
@@ -0,0 +1,157 @@
+import math
+
+from monitoring.reportPlan import AIR_QUALITY_HEADERS, NOISE_QUALITY_HEADERS
+
+
+# Timestamp format written by the UI and `rows()`; other layouts are parsed as ISO, then day-first
+TIME_FORMAT = "%d/%m/%Y %H:%M"
+
+KIND_HEADERS = {
+    "air": AIR_QUALITY_HEADERS,
+    "noise": NOISE_QUALITY_HEADERS,
+}
+
+
+class MonitoringTable:
+    """
+    Typed, columnar air / noise monitoring table.
+
+    Measurements are float32 columns, locations a pandas Categorical and timestamps datetime64[ns]; the
+    schema is checked once when the table is built. Charts, exceedances and the data store read the
+    typed columns directly, and the table writers get the display rows from `rows()`: the original
+    strings when the table came from entered rows (so the report shows exactly what was entered),
+    otherwise values formatted once on first use.
+    """
+
+    __slots__ = ("kind", "location", "timestamp", "columns", "decimals", "_rows")
+
+    def __init__(self, kind, location, timestamp, columns, rows=None, decimals=1):
+        self.kind = kind
+        self.location = location        # pandas Categorical of location codes
+        self.timestamp = timestamp      # numpy datetime64[ns] array (NaT where unparseable)
+        self.columns = columns          # Measurement name -> float32 array (NaN where missing)
+        self.decimals = decimals
+        self._rows = rows
+
+    @property
+    def headers(self):
+        return KIND_HEADERS[self.kind]
+
+    @property
+    def parameters(self):
+        return self.headers[2:]
+
+    def __len__(self):
+        """Number of readings (the header is not a row)."""
+        return len(self.timestamp)
+
+    def __repr__(self):
+        return f"MonitoringTable({self.kind!r}, {len(self)} readings)"
+
+    @classmethod
+    def from_rows(cls, rows, kind):
+        """
+        Parses `*_monitoring_data` rows (header row first, values as strings) once into typed columns.
+
+        Columns are matched by header name; raises ValueError when a required header is missing.
+        """
+        import numpy as np
+        import pandas as pd
+
+        headers = KIND_HEADERS[kind]
+        positions = {str(name).strip(): index for index, name in enumerate(rows[0])} if rows else {}
+        missing = [name for name in headers if name not in positions]
+        if missing:
+            raise ValueError(f"{kind} monitoring data is missing column(s): {', '.join(missing)}")
+
+        body = rows[1:]
+
+        def column(name):
+            # One column at a time (transposing with zip(*rows) builds row-sized argument tuples)
+            index = positions[name]
+            return np.array([row[index] if index < len(row) else "" for row in body], dtype=object)
+
+        location = pd.Categorical(column("Monitoring Location").astype(str))
+        timestamp = parse_times(column("Time"))
+        columns = {name: parse_values(column(name)) for name in headers[2:]}
+        return cls(kind, location, timestamp, columns, rows=rows)
+
+    @classmethod
+    def from_frame(cls, frame, kind, decimals=1):
+        """
+        Wraps a typed (e.g. aggregated) frame: location, timestamp and one column per measurement.
+        Readings with no measurement are dropped and values are rounded to the displayed precision.
+        """
+        import numpy as np
+        import pandas as pd
+
+        parameters = KIND_HEADERS[kind][2:]
+        values = frame[list(parameters)].to_numpy(np.float64)
+        keep = ~np.isnan(values).all(axis=1)
+        values = values[keep].round(decimals).astype(np.float32)
+        location = pd.Categorical(frame["location"].astype(str).to_numpy()[keep])
+        timestamp = frame["timestamp"].to_numpy("datetime64[ns]")[keep]
+        columns = {name: np.ascontiguousarray(values[:, index]) for index, name in enumerate(parameters)}
+        return cls(kind, location, timestamp, columns, decimals=decimals)
+
+    def to_frame(self):
+        """Typed readings frame (see `aggregation.frame_from_readings`) over the table's arrays."""
+        import pandas as pd
+
+        data = {"location": self.location, "timestamp": self.timestamp}
+        data.update(self.columns)
+        return pd.DataFrame(data, copy=False)
+
+    def rows(self):
+        """Display rows (header row first, values as strings) for the table writers."""
+        if self._rows is None:
+            import numpy as np
+            import pandas as pd
+
+            times = pd.DatetimeIndex(self.timestamp).strftime(TIME_FORMAT).tolist()
+            locations = np.asarray(self.location).astype(str).tolist()
+            formatted = [["" if math.isnan(value) else f"{value:.{self.decimals}f}" for value in row]
+                         for row in np.column_stack([self.columns[name] for name in self.parameters])
+                         .astype(np.float64).tolist()]
+            self._rows = [list(self.headers)] + [[location, time] + row
+                                                 for location, time, row in zip(locations, times, formatted)]
+        return self._rows
+
+
+def parse_values(values):
+    """Parses measurement strings to float32; blanks and text (e.g. '-', 'n/a') become NaN."""
+    import numpy as np
+    import pandas as pd
+
+    try:
+        return values.astype(np.float32)    # Fast path: every cell is a number
+    except (TypeError, ValueError):
+        return pd.to_numeric(values, errors="coerce").astype(np.float32)
+
+
+def parse_times(values):
+    """Parses time strings with the known format in one vectorised pass; misses are tried as ISO, then day-first."""
+    import pandas as pd
+
+    timestamp = pd.to_datetime(values, format=TIME_FORMAT, errors="coerce").to_numpy("datetime64[ns]")
+    misses = pd.isna(timestamp) & (values != "")
+    if misses.any():
+        # ISO dates before day-first parsing, which would swap their month and day ('2025-02-01' -> 2 Jan)
+        timestamp[misses] = pd.to_datetime(pd.Series(values[misses]).astype(str), format="ISO8601",
+                                           errors="coerce").to_numpy("datetime64[ns]")
+        misses = pd.isna(timestamp) & (values != "")
+    if misses.any():
+        timestamp[misses] = pd.to_datetime(pd.Series(values[misses]).astype(str), dayfirst=True, format="mixed",
+                                           errors="coerce").to_numpy("datetime64[ns]")
+    return timestamp
+
+
+def as_monitoring_table(data, kind):
+    """Returns `data` (a MonitoringTable or `*_monitoring_data` rows) as a MonitoringTable, or None if empty."""
+    if data is None:
+        return None
+    if isinstance(data, MonitoringTable):
+        return data if len(data) else None
+    if len(data) < 2:
+        return None
+    return MonitoringTable.from_rows(data, kind)
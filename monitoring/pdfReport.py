@@ -0,0 +1,403 @@
+"""
+PDF output backend: renders the compiled report plan straight to PDF with reportlab (no Word round-trip).
+
+Page numbers, the table of contents and the lists of tables/figures are laid out by reportlab
+itself (multi-pass build), so the PDF is complete without any field updates.
+
+Requires reportlab (`pip install reportlab`) in addition to the Word report's dependencies. This module
+is only imported when a PDF is requested (see batchReport.run_report_job), so Word reports work without it.
+"""
+import copy
+import io
+import os
+import tempfile
+from xml.sax.saxutils import escape
+
+try:
+    from reportlab import rl_config
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.lib.utils import ImageReader, simpleSplit
+    from reportlab.platypus import (BaseDocTemplate, Frame, Image, KeepTogether, LongTable, PageBreak,
+                                    PageTemplate, Paragraph, Spacer, TableStyle)
+    from reportlab.platypus.tableofcontents import TableOfContents
+except ImportError as e:
+    raise ImportError("PDF reports require reportlab (pip install reportlab); Word reports do not") from e
+
+from monitoring.exceedance import conclusion_verdict
+from monitoring.imagePipeline import prepare_image
+from monitoring.profiling import count, span
+from monitoring.monitoringReport import (CONSTANTS, bind_image, bind_table_rows, count_figure, count_table,
+                                         prepare_report, render_table_charts, replace_placeholders,
+                                         report_cache_summary, report_file_mode, report_filename)
+from monitoring.chartRenderer import resolve_chart_profile
+from monitoring.reportTypes import get_report_type
+from monitoring.templateEngine import render_template
+
+
+PAGE_MARGIN = 0.9 * inch
+TABLE_FONT_SIZE = 8
+TABLE_LEADING = TABLE_FONT_SIZE * 1.2
+CELL_PADDING_X = 4
+CELL_PADDING_Y = 3
+
+# Binary image streams: ASCII85 doubles encode time (pure Python) and grows the file by a quarter
+rl_config.useA85 = 0
+
+
+def _styles():
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle("TableCaption", parent=styles["Heading4"], alignment=TA_CENTER))
+    styles.add(ParagraphStyle("FigureCaption", parent=styles["Heading5"], alignment=TA_CENTER))
+    styles.add(ParagraphStyle("Caption", parent=styles["BodyText"], alignment=TA_CENTER))
+    styles.add(ParagraphStyle("ReportBullet", parent=styles["BodyText"], leftIndent=18, bulletIndent=6))
+    styles.add(ParagraphStyle("ContentsHeading", parent=styles["Heading1"], spaceAfter=12))
+    return styles
+
+
+def _markup(text):
+    """Escapes plain text for a reportlab Paragraph, keeping line breaks."""
+    return escape(str(text)).replace("\n", "<br/>")
+
+
+class _EntryList(TableOfContents):
+    """A TableOfContents fed by its own notification kind (used for the lists of tables and figures)."""
+
+    def __init__(self, entry_kind, **kwargs):
+        super().__init__(**kwargs)
+        self.entry_kind = entry_kind
+
+    def notify(self, kind, stuff):
+        if kind == self.entry_kind:
+            self.addEntry(*stuff)
+
+
+class _ReportImage(Image):
+    """An image that lays out normally but is only encoded on the final pass."""
+
+    def draw(self):
+        if not getattr(self.canv, "_draft", False):
+            super().draw()
+
+
+class _ReportTable(LongTable):
+    """A table that lays out (and splits) normally but is only drawn on the final pass."""
+
+    def draw(self):
+        if not getattr(self.canv, "_draft", False):
+            super().draw()
+
+
+class _ReportDocTemplate(BaseDocTemplate):
+    """Registers headings and captions with the contents lists and the PDF outline as they are laid out."""
+
+    def __init__(self, filename, placeholders, styles, report_title, **kwargs):
+        super().__init__(filename, pagesize=A4, leftMargin=PAGE_MARGIN, rightMargin=PAGE_MARGIN,
+                         topMargin=PAGE_MARGIN, bottomMargin=PAGE_MARGIN, **kwargs)
+        self.placeholders = placeholders
+        self.styles = styles
+        self.report_title = report_title
+        self.logo = _logo(placeholders.get("company_logo"))
+        frame = Frame(self.leftMargin, self.bottomMargin, self.width, self.height, id="body",
+                      leftPadding=0, rightPadding=0, topPadding=0, bottomPadding=0)
+        self.addPageTemplates([PageTemplate(id="report", frames=[frame], onPage=self._draw_page)])
+        self._entry_count = 0
+        self._entries = []  # (kind, entry) notified to the contents lists on the current pass
+        self.draft = False
+
+    def build_report(self, story, output, max_passes=10):
+        """
+        Lays a copy of the story out in draft passes (images and tables skipped) until the contents
+        settle, then writes the final PDF in a single full pass with the settled entries, so each image
+        is encoded once.
+        """
+        self.draft, self.filename = True, io.BytesIO()
+        self.multiBuild(copy.deepcopy(story), maxPasses=max_passes)
+
+        # Seed the contents lists with the settled entries: the final build is satisfied by its first pass
+        for flowable in story:
+            if isinstance(flowable, TableOfContents):
+                for kind, stuff in self._entries:
+                    flowable.notify(kind, stuff)
+        self.draft, self.filename = False, output
+        self.multiBuild(story, maxPasses=1)
+
+    def notify(self, kind, stuff):
+        self._entries.append((kind, stuff))
+        super().notify(kind, stuff)
+
+    def _draw_page(self, canvas, doc):
+        """Header (report details and logo) and footer (page number) on every page."""
+        canvas.saveState()
+        placeholders = self.placeholders
+        header_lines = (f"{self.report_title} ({placeholders.get('report_number')})",
+                        placeholders.get("project_location", "Project Location"),
+                        f"Project No. {placeholders.get('project_number', 'Project Number')}")
+        canvas.setFont("Helvetica", 7)
+        top = doc.pagesize[1] - PAGE_MARGIN / 2
+        for index, line in enumerate(header_lines):
+            canvas.drawString(self.leftMargin, top - index * 8.5, str(line))
+
+        if self.logo is not None:
+            reader, width, height = self.logo
+            canvas.drawImage(reader, doc.pagesize[0] - self.rightMargin - width, top - height + 7, width, height,
+                             mask="auto")
+
+        canvas.setFont("Helvetica", 10)
+        canvas.drawCentredString(doc.pagesize[0] / 2, PAGE_MARGIN / 2, str(doc.page))
+        canvas.restoreState()
+
+    def beforeDocument(self):
+        # Bookmark keys must be identical on every pass or the contents never settle
+        self._entry_count = 0
+        self._entries = []
+        self.canv._draft = self.draft
+
+    def afterFlowable(self, flowable):
+        level = getattr(flowable, "outline_level", None)
+        if level is None:
+            return
+
+        text = flowable.getPlainText()
+        self._entry_count += 1
+        key = f"entry-{self._entry_count}"
+        self.canv.bookmarkPage(key)
+
+        if flowable.outline_kind == "heading":
+            self.canv.addOutlineEntry(text, key, level=level, closed=level > 0)
+            if level <= 2:
+                self.notify("TOCEntry", (level, text, self.page, key))
+        else:
+            self.notify(flowable.outline_kind, (0, text, self.page, key))
+
+
+def _logo(company_logo_path, max_width=1.5 * inch, max_height=0.6 * inch):
+    """Loads the company logo scaled to fit the header (same bounds as the Word header)."""
+    if not company_logo_path or not os.path.exists(company_logo_path):
+        return None
+    try:
+        reader = ImageReader(company_logo_path)
+        img_width, img_height = reader.getSize()
+    except Exception as e:
+        print(f"⚠ Warning: Unable to load company logo. Error: {e}")
+        return None
+
+    aspect_ratio = img_height / img_width
+    if aspect_ratio > 1:  # Tall image
+        return reader, max_height / aspect_ratio, max_height
+    return reader, max_width, max_width * aspect_ratio  # Wide image
+
+
+class _PdfReportBuilder:
+    """Turns plan sections into reportlab flowables, mirroring the Word emitter section by section."""
+
+    def __init__(self, placeholders, styles, frame_width):
+        self.placeholders = placeholders
+        self.styles = styles
+        self.frame_width = frame_width
+        self.chart_width = resolve_chart_profile(CONSTANTS)["display_width"] * inch
+        self.story = []
+
+    def _paragraph(self, text, style, outline_kind=None, outline_level=0):
+        paragraph = Paragraph(_markup(text), self.styles[style])
+        if outline_kind:
+            paragraph.outline_kind = outline_kind
+            paragraph.outline_level = outline_level
+        return paragraph
+
+    def add_contents(self):
+        """Contents, then the lists of tables and figures (page numbers filled in by the multi-pass build)."""
+        level_styles = [ParagraphStyle(f"TOCLevel{level}", parent=self.styles["BodyText"], leftIndent=14 * level,
+                                       firstLineIndent=0, fontSize=10 - level, leading=13 - level)
+                        for level in range(3)]
+
+        self.story.append(Paragraph("Contents", self.styles["ContentsHeading"]))
+        contents = TableOfContents(dotsMinLevel=0)
+        contents.levelStyles = level_styles
+        self.story.append(contents)
+
+        self.story.append(PageBreak())
+        for title, kind in (("Tables", "TableEntry"), ("Figures", "FigureEntry")):
+            self.story.append(Paragraph(title, self.styles["ContentsHeading"]))
+            entry_list = _EntryList(kind, dotsMinLevel=0)
+            entry_list.levelStyles = level_styles[:1]
+            self.story.append(entry_list)
+            self.story.append(Spacer(1, 12))
+
+    def add_section(self, plan_section):
+        with span("section", key=plan_section.key, number=plan_section.number):
+            count("sections")
+            self._add_section(plan_section)
+
+    def _add_section(self, plan_section):
+        placeholders = self.placeholders
+
+        # Page break only for main sections (level 1 heading)
+        if plan_section.level == 1:
+            self.story.append(PageBreak())
+
+        self.story.append(self._paragraph(plan_section.title, f"Heading{min(plan_section.level, 3)}",
+                                          "heading", plan_section.level - 1))
+
+        if plan_section.text:
+            text = render_template(plan_section.text, placeholders, plan_section.table_numbers,
+                                   plan_section.figure_numbers, context=plan_section.title)
+            if text.strip():
+                self.story.append(self._paragraph(text, "BodyText"))
+
+        for param in plan_section.special_bullets:
+            self.story.append(Paragraph(_markup(param), self.styles["ReportBullet"], bulletText="•"))
+        for paragraph in plan_section.special_paragraphs:
+            self.story.append(self._paragraph(paragraph, "BodyText"))
+        if plan_section.verdict:
+            self.story.append(self._paragraph(
+                conclusion_verdict(placeholders.get("exceedances"), plan_section.verdict), "BodyText"))
+
+        for point in plan_section.bullets:
+            text = render_template(point, placeholders, context=plan_section.title)
+            self.story.append(Paragraph(_markup(text), self.styles["ReportBullet"], bulletText="•"))
+
+        for plan_table in plan_section.tables:
+            self._add_table(plan_section, plan_table)
+        for plan_image in plan_section.images:
+            self._add_image(plan_image)
+
+    def _add_table(self, plan_section, plan_table):
+        placeholders = self.placeholders
+        rows = bind_table_rows(plan_table, placeholders)
+        if not rows:
+            print(f"⚠ Warning: Unexpected table format in section. Skipping.")
+            return
+
+        with span("table", number=plan_table.number, rows=len(rows)):
+            count_table(rows)
+            table_title = render_template(plan_table.title, placeholders, [plan_table.number],
+                                          context=plan_section.title)
+            self.story.append(self._paragraph(table_title, "TableCaption", "TableEntry"))
+            self.story.append(self._table(rows))
+            self.story.append(Spacer(1, 12))
+
+        if plan_table.chart_type:
+            with span("charts", number=plan_table.number, chart_type=plan_table.chart_type):
+                for caption, chart_png in render_table_charts(plan_table, placeholders.get(plan_table.binding),
+                                                             placeholders.get("exceedances")):
+                    self._add_figure(io.BytesIO(chart_png), self.chart_width, caption, heading=True,
+                                     caption_first=True)
+
+    def _table(self, rows):
+        """
+        Builds a table of pre-wrapped plain-string cells with explicit row heights, so reportlab never
+        measures Paragraph cells and long monitoring tables split across pages in linear time.
+        """
+        num_cols = max(len(row) for row in rows)
+        col_width = self.frame_width / num_cols
+        text_width = col_width - 2 * CELL_PADDING_X
+        # Widest Helvetica glyphs are just under 1em: shorter cells can't need wrapping
+        safe_chars = int(text_width / TABLE_FONT_SIZE)
+
+        data = []
+        row_heights = []
+        for row_index, row in enumerate(rows):
+            font = "Helvetica-Bold" if row_index == 0 else "Helvetica"
+            cells = []
+            lines = 1
+            for index in range(num_cols):
+                text = replace_placeholders(str(row[index]), self.placeholders) if index < len(row) else ""
+                if len(text) > safe_chars or "\n" in text:
+                    wrapped = [line for part in text.split("\n")
+                               for line in (simpleSplit(part, font, TABLE_FONT_SIZE, text_width) or [""])]
+                    text = "\n".join(wrapped)
+                    lines = max(lines, len(wrapped))
+                cells.append(text)
+            data.append(cells)
+            row_heights.append(lines * TABLE_LEADING + 2 * CELL_PADDING_Y)
+
+        table = _ReportTable(data, colWidths=[col_width] * num_cols, rowHeights=row_heights, repeatRows=1)
+        table.setStyle(TableStyle([
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+            ("FONTSIZE", (0, 0), (-1, -1), TABLE_FONT_SIZE),
+            ("LEADING", (0, 0), (-1, -1), TABLE_LEADING),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("LEFTPADDING", (0, 0), (-1, -1), CELL_PADDING_X),
+            ("RIGHTPADDING", (0, 0), (-1, -1), CELL_PADDING_X),
+            ("TOPPADDING", (0, 0), (-1, -1), CELL_PADDING_Y),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), CELL_PADDING_Y),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ]))
+        return table
+
+    def _add_image(self, plan_image):
+        image_path, image_description = bind_image(plan_image, self.placeholders)
+        if not image_path or not os.path.exists(image_path):
+            return
+        try:
+            with span("image_prepare", figure=plan_image.figure_number):
+                # 🔹 Same downsampled copy as the Word report
+                prepared_path = prepare_image(image_path, plan_image.width, CONSTANTS, plan_image.figure_class)
+            count_figure(prepared_path)
+            self._add_figure(prepared_path, plan_image.width * inch,
+                             f"Figure {plan_image.figure_number} - {image_description}",
+                             heading=plan_image.caption_heading)
+        except Exception as e:
+            print(f"⚠ Warning: Failed to insert image {image_path}. Error: {e}")
+
+    def _add_figure(self, source, width, caption, heading=True, caption_first=False):
+        img_width, img_height = ImageReader(source).getSize()
+        if hasattr(source, "seek"):
+            source.seek(0)
+        width = min(width, self.frame_width)
+        image = _ReportImage(source, width=width, height=width * img_height / img_width)
+        caption = self._paragraph(caption, "FigureCaption", "FigureEntry") if heading else \
+            self._paragraph(caption, "Caption")
+        parts = [caption, image] if caption_first else [image, caption]
+        self.story.append(KeepTogether(parts + [Spacer(1, 12)]))
+
+
+def generate_pdf_report(placeholders=None, report_path=None, report_type=None):
+    """
+    Generates the monitoring report (or another registered report type) as a PDF from the same report
+    plan as the Word report.
+
+    :param placeholders: Report data; defaults to SAMPLE_PLACEHOLDERS.
+    :param report_path: Output .pdf path; defaults to `output_dir` / `report_filename(placeholders, ".pdf")`.
+    :param report_type: Registered report type name (see reportTypes); defaults to the monitoring report.
+    :return: Path of the generated report.
+    """
+    report_type = get_report_type(report_type)
+    with span("report", format="pdf", type=report_type.name):
+        with span("prepare"):
+            plan, placeholders = prepare_report(placeholders, report_type.name)
+
+        if report_path is None:
+            report_path = os.path.join(CONSTANTS["output_dir"],
+                                       report_filename(placeholders, ".pdf", report_type.name))
+        report_dir = os.path.dirname(report_path) or "."
+        os.makedirs(report_dir, exist_ok=True)
+
+        styles = _styles()
+        fd, tmp_path = tempfile.mkstemp(dir=report_dir, suffix=".pdf.tmp")
+        os.close(fd)
+        try:
+            doc = _ReportDocTemplate(tmp_path, placeholders, styles, report_type.report_title(placeholders),
+                                     title=report_type.file_prefix(placeholders).replace("_", " "),
+                                     author=placeholders.get("consultancy_name", CONSTANTS["consultancy_name"]))
+            builder = _PdfReportBuilder(placeholders, styles, doc.width)
+            builder.add_contents()
+            for plan_section in plan.sections:
+                builder.add_section(plan_section)
+
+            # ✅ Repeats layout until the contents page numbers settle
+            with span("layout", flowables=len(builder.story)):
+                doc.build_report(builder.story, tmp_path)
+            os.chmod(tmp_path, report_file_mode())
+            os.replace(tmp_path, report_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    print(f"✅ {report_type.file_prefix(placeholders).replace('_', ' ')} (PDF) generated: {report_path}")
+    report_cache_summary()
+    return report_path
@@ -0,0 +1,175 @@
+"""
+Lightweight tracing for the report pipeline: nested timing spans and counters, exported as a JSON trace
+or a Chrome trace-event file (chrome://tracing, Perfetto).
+
+Tracing is off by default; `span()` and `count()` then return immediately, so the hooks can stay in
+hot paths.
+
+    with tracing(memory=True) as trace:
+        generate_report(placeholders)
+    trace.save_json("trace.json")
+    trace.save_chrome("trace.chrome.json")
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+
+_tracer = None
+_NULL_SPAN = nullcontext()
+
+
+class Trace:
+    """Spans and counters recorded while tracing was active."""
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.spans = []         # Finished spans in completion order
+        self.counters = {}
+        self.counter_samples = []   # (timestamp, name, running total) for Chrome counter tracks
+        self.started = time.perf_counter()
+        self.wall_start = time.time()
+        self.pid = os.getpid()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, name, attrs):
+        stack = self._stack()
+        record = {"name": name, "depth": len(stack), "parent": stack[-1]["name"] if stack else None,
+                  "tid": threading.get_ident(), "attrs": attrs}
+        if self.memory:
+            import tracemalloc
+            record["memory_start"] = tracemalloc.get_traced_memory()[0]
+        stack.append(record)
+        start = time.perf_counter()
+        try:
+            yield record["attrs"]
+        finally:
+            end = time.perf_counter()
+            stack.pop()
+            record["start"] = start - self.started
+            record["duration"] = end - start
+            if self.memory:
+                import tracemalloc
+                current, peak = tracemalloc.get_traced_memory()
+                record["memory_delta"] = current - record.pop("memory_start")
+                record["memory_peak"] = peak
+            with self._lock:
+                self.spans.append(record)
+
+    def count(self, name, value):
+        with self._lock:
+            total = self.counters.get(name, 0) + value
+            self.counters[name] = total
+            self.counter_samples.append((time.perf_counter() - self.started, name, total))
+
+    def stage_totals(self):
+        """Total seconds per span name (inclusive), slowest first."""
+        totals = {}
+        for record in self.spans:
+            totals[record["name"]] = totals.get(record["name"], 0.0) + record["duration"]
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def to_dict(self):
+        spans = sorted(self.spans, key=lambda record: record["start"])
+        return {
+            "started": self.wall_start,
+            "pid": self.pid,
+            "memory": self.memory,
+            "counters": dict(self.counters),
+            "stage_totals": {name: round(seconds, 6) for name, seconds in self.stage_totals().items()},
+            "spans": [{key: (round(value, 6) if key in ("start", "duration") else value)
+                       for key, value in record.items() if key != "tid"} for record in spans],
+        }
+
+    def to_chrome(self):
+        """Chrome trace-event format: complete ("X") events per span, counter ("C") events per counter."""
+        events = []
+        for record in self.spans:
+            args = dict(record["attrs"])
+            if self.memory:
+                args.update(memory_delta=record["memory_delta"], memory_peak=record["memory_peak"])
+            events.append({"name": record["name"], "ph": "X", "pid": self.pid, "tid": record["tid"],
+                           "ts": round(record["start"] * 1e6, 3), "dur": round(record["duration"] * 1e6, 3),
+                           "args": args})
+        for timestamp, name, total in self.counter_samples:
+            events.append({"name": name, "ph": "C", "pid": self.pid, "ts": round(timestamp * 1e6, 3),
+                           "args": {name: total}})
+        events.sort(key=lambda event: event["ts"])
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_json(self, path):
+        _write_json(path, self.to_dict())
+
+    def save_chrome(self, path):
+        _write_json(path, self.to_chrome())
+
+    def summary(self, limit=10):
+        """One line per slowest span name, plus the counters."""
+        lines = [f"{name:<24} {seconds * 1000:10.1f} ms" for name, seconds in list(self.stage_totals().items())[:limit]]
+        lines.extend(f"{name:<24} {value:>10}" for name, value in sorted(self.counters.items()))
+        return "\n".join(lines)
+
+
+def _write_json(path, data):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=1, default=str)
+
+
+def span(name, **attrs):
+    """Times a block as a named span (no-op unless tracing is active). Yields the span's attrs dict."""
+    if _tracer is None:
+        return _NULL_SPAN
+    return _tracer.span(name, attrs)
+
+
+def count(name, value=1):
+    """Adds `value` to a named counter (no-op unless tracing is active)."""
+    if _tracer is not None:
+        _tracer.count(name, value)
+
+
+def is_tracing():
+    return _tracer is not None
+
+
+def start_tracing(memory=False):
+    """Starts recording spans and counters in this process; `memory` adds tracemalloc deltas per span."""
+    global _tracer
+    if memory:
+        import tracemalloc
+        tracemalloc.start()
+    _tracer = Trace(memory)
+    return _tracer
+
+
+def stop_tracing():
+    """Stops recording and returns the Trace (None if tracing was not active)."""
+    global _tracer
+    trace, _tracer = _tracer, None
+    if trace is not None and trace.memory:
+        import tracemalloc
+        tracemalloc.stop()
+    return trace
+
+
+@contextmanager
+def tracing(memory=False):
+    """Records a trace for the duration of the block."""
+    trace = start_tracing(memory)
+    try:
+        yield trace
+    finally:
+        stop_tracing()
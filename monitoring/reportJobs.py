@@ -0,0 +1,156 @@
+"""
+Background report jobs for the UI: a bounded queue in front of a process pool, so report builds
+run off the request handlers and several sessions can build at once.
+"""
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from monitoring.batchReport import init_report_worker, run_report_job
+
+
+DEFAULT_REPORT_WORKERS = 2
+DEFAULT_REPORT_QUEUE_SIZE = 8
+
+_jobs = None
+_jobs_lock = threading.Lock()
+
+
+class ReportQueueFull(Exception):
+    """Raised when the job queue is at capacity."""
+
+
+class ReportJob:
+    def __init__(self, job_id, future):
+        self.id = job_id
+        self.future = future
+        self.submitted = time.perf_counter()
+        self.started = None
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.submitted
+
+
+class ReportJobQueue:
+    """
+    Runs report generation in a process pool with a concurrency limit and a bounded backlog.
+
+    Each job writes to its own folder under `output_dir`, so sessions never overwrite each other's reports.
+    """
+
+    def __init__(self, output_dir, max_workers=DEFAULT_REPORT_WORKERS, max_pending=DEFAULT_REPORT_QUEUE_SIZE,
+                 plan_keys=()):
+        """
+        :param plan_keys: (report type, report_parameters) pairs each worker compiles before its first job.
+        """
+        self.output_dir = os.path.join(output_dir, "jobs")
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(1, max_pending)
+
+        # Loaded once here, forked workers inherit the heavy modules instead of each importing them
+        from monitoring.monitoringReport import preload_report_dependencies
+        preload_report_dependencies()
+        self._plan_keys = tuple(plan_keys)
+        self._executor = self._new_executor()
+        self._active = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(max_workers=self.max_workers, initializer=init_report_worker,
+                                   initargs=(self._plan_keys,))
+
+    def _prune(self):
+        self._active = [job for job in self._active if not job.future.done()]
+
+    def submit(self, placeholders, report_format="docx", archive=False, report_type=None):
+        """
+        Queues a report build ("docx" or "pdf"); raises ReportQueueFull when the backlog is at capacity.
+        With `archive` the worker also saves the report's readings to the monitoring data store;
+        `report_type` names a registered report type (default: the monitoring report).
+        """
+        with self._lock:
+            self._prune()
+            if len(self._active) >= self.max_workers + self.max_pending:
+                raise ReportQueueFull(f"{len(self._active)} report(s) already queued or building")
+
+            job_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(self._ids):04d}"
+            job_spec = {"id": job_id, "placeholders": placeholders, "format": report_format, "archive": archive,
+                        "type": report_type}
+            try:
+                future = self._executor.submit(run_report_job, job_spec, self.output_dir)
+            except BrokenProcessPool:
+                # A worker died (e.g. out of memory); the pool is unusable from then on, so start a fresh one
+                print("⚠ Warning: Report worker pool broke (a worker exited unexpectedly). Restarting it.")
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._new_executor()
+                self._prune()
+                future = self._executor.submit(run_report_job, job_spec, self.output_dir)
+            job = ReportJob(job_id, future)
+            self._active.append(job)
+            return job
+
+    def position(self, job):
+        """Number of jobs ahead of `job` waiting for a worker (0 once it can start)."""
+        with self._lock:
+            self._prune()
+            index = next((i for i, active in enumerate(self._active) if active is job), None)
+            return 0 if index is None else max(0, index - self.max_workers + 1)
+
+    def load(self):
+        """Returns (running, queued) job counts."""
+        with self._lock:
+            self._prune()
+            running = min(len(self._active), self.max_workers)
+            return running, len(self._active) - running
+
+    def progress(self, job):
+        """Returns (state, message) for a job: "queued", "running", "done" or "failed"."""
+        if job.future.cancelled():
+            return "failed", "❌ Report generation failed: cancelled"
+        if job.future.done():
+            result = job.future.result() if job.future.exception() is None else {
+                "error": f"{type(job.future.exception()).__name__}: {job.future.exception()}"}
+            if result.get("error"):
+                return "failed", f"❌ Report generation failed: {result['error']}"
+            return "done", f"✅ Report ready ({result['seconds']:.1f} s)."
+
+        ahead = self.position(job)
+        if ahead:
+            return "queued", f"⏳ Queued - {ahead} report(s) ahead ({job.elapsed:.0f} s)"
+        if job.started is None:
+            job.started = time.perf_counter()
+        return "running", f"⚙ Building report... ({time.perf_counter() - job.started:.0f} s)"
+
+    def shutdown(self):
+        """Cancels queued jobs and waits for running builds to finish."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def get_report_jobs(constants, plan_keys=()):
+    """
+    Returns the process-wide report job queue sized from constants.json.
+
+    `plan_keys` warm the workers' plan caches (see ReportJobQueue); it only applies to the first call.
+    """
+    global _jobs
+    with _jobs_lock:
+        if _jobs is None:
+            _jobs = ReportJobQueue(constants["output_dir"],
+                                   constants.get("report_workers") or DEFAULT_REPORT_WORKERS,
+                                   constants.get("report_queue_size") or DEFAULT_REPORT_QUEUE_SIZE,
+                                   plan_keys)
+        return _jobs
+
+
+def shutdown_report_jobs():
+    """Shuts down the process-wide report job queue (if running)."""
+    global _jobs
+    with _jobs_lock:
+        if _jobs is not None:
+            _jobs.shutdown()
+        _jobs = None
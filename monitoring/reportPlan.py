@@ -0,0 +1,369 @@
+import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+from monitoring.templateEngine import compile_template
+from monitoring.exceedance import parse_standards
+
+
+# ✅ Known headers for data injection and charting
+AIR_QUALITY_HEADERS = ("Monitoring Location", "Time", "CO", "O3", "NO2", "SO2", "PM2.5", "PM10")
+NOISE_QUALITY_HEADERS = ("Monitoring Location", "Time", "EQ", "Max", "AE", "10", "50", "90")
+MONITORING_LOCATION_HEADERS = ("Monitoring Location", "Description", "Latitude", "Longitude")
+
+# Chart type -> (placeholder bound to the table, header row, charted pollutants)
+CHART_TABLES = {
+    "air": ("air_monitoring_data", AIR_QUALITY_HEADERS, ("CO", "O3", "NO2", "SO2", "PM2.5", "PM10")),
+    "noise": ("noise_monitoring_data", NOISE_QUALITY_HEADERS, ("EQ",)),
+}
+
+# Fixed sections around the user-selected parameter sections
+LEADING_SECTIONS = ("Introduction", "Scope of Work", "Regulatory Standards")
+TRAILING_SECTIONS = ("Conclusion", "Appendices")
+
+
+@dataclass(frozen=True)
+class PlanChart:
+    pollutant: str
+    figure_number: str
+
+
+@dataclass(frozen=True)
+class PlanTable:
+    title: tuple                # Compiled title template
+    number: str
+    rows: tuple                 # Static rows from structure.json (tuple of tuples)
+    binding: str = None         # Placeholder whose rows replace `rows` at bind time
+    chart_type: str = None      # "air" / "noise" when charts follow the table
+    charts: tuple = ()
+
+
+@dataclass(frozen=True)
+class PlanImage:
+    figure_number: str
+    description: str
+    width: float                # Placed width in inches
+    path: str = None            # Static image path
+    binding: str = None         # "monitoring_location_map" / "monitoring_location_images"
+    binding_index: int = 0      # Index into the bound location images
+    caption_heading: bool = True  # Caption as a Heading 5 (listed in the List of Figures)
+    figure_class: str = "photo"   # Encoding settings to use (see imagePipeline.FIGURE_CLASSES)
+
+
+@dataclass(frozen=True)
+class PlanSection:
+    key: str
+    title: str
+    number: str
+    level: int
+    text: tuple                 # Compiled text template
+    table_numbers: tuple
+    figure_numbers: tuple
+    bullets: tuple = ()         # Compiled bullet templates
+    special_paragraphs: tuple = ()  # Static paragraphs (conclusions)
+    verdict: str = None             # Compliance statement; replaced by computed exceedances at emit time
+    special_bullets: tuple = ()     # Static bullets (scope of work parameters)
+    tables: tuple = ()
+    images: tuple = ()
+
+
+@dataclass(frozen=True)
+class ReportPlan:
+    structure_file: str
+    parameters: tuple
+    sections: tuple             # Flattened, in document order
+    standards: object = None    # exceedance.StandardsIndex parsed from the regulatory standards tables
+
+
+def format_parameter_section(parameter):
+    """Formats user input parameters into proper section titles."""
+    formatted_parameters = {
+        "air": "Ambient Air Quality Monitoring",
+        "noise": "Noise Monitoring",
+        "soil": "Soil Quality Monitoring",
+        "water": "Water Quality Monitoring"
+    }
+    return formatted_parameters.get(parameter.lower(), parameter.capitalize() + " Monitoring")
+
+
+def parse_report_parameters(report_parameters):
+    """Splits the comma separated `report_parameters` placeholder into a tuple of parameter names."""
+    if not report_parameters or report_parameters == "None":
+        return ()
+    return tuple(p.strip() for p in report_parameters.split(",") if p.strip())
+
+
+def plan_layout(placeholders):
+    """Returns the parts of the bound data that change the plan's figure numbering."""
+    return (bool(placeholders.get("monitoring_location_map")),
+            tuple(placeholders.get("monitoring_location_images") or {}))
+
+
+def monitoring_section_names(structure, parameters):
+    """Monitoring reports: the fixed leading sections, one section per selected parameter, the trailing sections."""
+    return (LEADING_SECTIONS + tuple(format_parameter_section(param) for param in parameters)
+            + TRAILING_SECTIONS)
+
+
+def structure_section_names(structure, parameters):
+    """Every top-level section of the structure, in the order the structure file declares them."""
+    return tuple(key.replace("_", " ").title() for key in structure)
+
+
+def get_report_plan(structure_file, placeholders, constants, section_names=monitoring_section_names, base_dir=None):
+    """
+    Returns the compiled report plan for `structure_file` and the selected parameters.
+
+    Plans are cached per (structure file, mtime, section order, parameter set, image layout, which of the
+    structure's images exist), so repeated reports of every report type only bind data and emit, and an
+    image added or removed after the plan was cached is picked up (and numbered) by the next report.
+
+    :param section_names: (structure, parameters) -> top-level section names in document order.
+    :param base_dir: Directory relative image paths in the structure resolve against (default: working directory).
+    """
+    structure_file = os.path.abspath(structure_file)
+    mtime_ns = os.stat(structure_file).st_mtime_ns
+    parameters = parse_report_parameters(placeholders.get("report_parameters"))
+    has_map, location_images = plan_layout(placeholders)
+    conclusions = json.dumps(constants.get("conclusions", {}), sort_keys=True)
+    # Only existence matters: a missing image is left out and takes no figure number
+    present_images = tuple(os.path.exists(path)
+                           for path in _structure_image_paths(structure_file, mtime_ns, base_dir))
+    return _compile_cached(structure_file, mtime_ns, section_names, parameters, has_map, len(location_images),
+                           conclusions, base_dir, present_images)
+
+
+@lru_cache(maxsize=8)
+def _load_structure(structure_file, mtime_ns):
+    with open(structure_file, 'r', encoding="utf-8") as file:
+        return json.load(file)
+
+
+@lru_cache(maxsize=32)
+def _structure_image_paths(structure_file, mtime_ns, base_dir):
+    """Resolved paths of every static image (`images[].path` / `image`) the structure file references."""
+    paths = []
+
+    def walk(node):
+        if isinstance(node, dict):
+            for image_data in node.get("images") or ():
+                if isinstance(image_data, dict) and isinstance(image_data.get("path"), str):
+                    paths.append(image_data["path"])
+            if isinstance(node.get("image"), str):
+                paths.append(node["image"])
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(_load_structure(structure_file, mtime_ns))
+    return tuple(os.path.join(base_dir, path) if base_dir and not os.path.isabs(path) else path for path in paths)
+
+
+@lru_cache(maxsize=32)
+def _compile_cached(structure_file, mtime_ns, section_names, parameters, has_map, num_location_images, conclusions,
+                    base_dir, present_images):
+    # `present_images` is only part of the key: compile_report_plan checks the images itself
+    return compile_report_plan(_load_structure(structure_file, mtime_ns), structure_file, parameters, has_map,
+                               num_location_images, json.loads(conclusions), section_names, base_dir)
+
+
+def compile_report_plan(structure, structure_file, parameters, has_map=False, num_location_images=0,
+                        conclusions=None, section_names=monitoring_section_names, base_dir=None):
+    """
+    Compiles a loaded structure into an immutable ReportPlan.
+
+    :param structure: Loaded structure.json (not modified).
+    :param structure_file: Path the structure was loaded from (for reference).
+    :param parameters: Selected report parameters, e.g. ("Air", "Noise").
+    :param has_map: Whether a monitoring location map will be bound.
+    :param num_location_images: Number of monitoring location images that will be bound.
+    :param conclusions: The `conclusions` block of constants.json.
+    :param section_names: Top-level section order (see `monitoring_section_names`, `structure_section_names`).
+    :param base_dir: Directory relative image paths resolve against; missing images are left out with a
+                     warning, so they take no figure number.
+    :return: ReportPlan
+    """
+    # Convert JSON keys to lowercase for **case-insensitive** lookup
+    structure = {key.lower(): value for key, value in structure.items()}
+
+    compiler = _PlanCompiler(parameters, has_map, num_location_images, conclusions or {}, base_dir)
+
+    section_number = 0
+    for section_name in section_names(structure, parameters):
+        section_key = section_name.lower().replace(" ", "_")
+        if section_key not in structure:
+            print(f"⚠ Warning: Section '{section_name}' not found in JSON.")
+            continue
+
+        section_number += 1
+        compiler.compile_section(section_name, section_key, structure[section_key], str(section_number))
+
+    return ReportPlan(structure_file=structure_file, parameters=tuple(parameters), sections=tuple(compiler.sections),
+                      standards=parse_standards(structure))
+
+
+def next_number(counters, main_section_number):
+    """Next table or figure number of a main section ('2.1', '2.2', ...); `counters` holds the counts so far."""
+    counters[main_section_number] = counters.get(main_section_number, 0) + 1
+    return f"{main_section_number}.{counters[main_section_number]}"
+
+
+class _PlanCompiler:
+    """Walks the structure once, assigning heading levels and table/figure numbers."""
+
+    def __init__(self, parameters, has_map, num_location_images, conclusions, base_dir=None):
+        self.parameters = parameters
+        self.base_dir = base_dir
+        self.parameter_keys = [p.lower() for p in parameters]
+        self.has_map = has_map
+        self.num_location_images = num_location_images
+        self.conclusions = conclusions
+        self.table_counters = {}
+        self.figure_counters = {}
+        self.sections = []
+
+    def _image_path(self, path):
+        """Resolves a structure image path against `base_dir`; None (with a warning) when the file is missing."""
+        if self.base_dir and not os.path.isabs(path):
+            path = os.path.join(self.base_dir, path)
+        if not os.path.exists(path):
+            print(f"⚠ Warning: Image '{path}' not found. Skipping.")
+            return None
+        return path
+
+    def compile_section(self, section_name, section_key, section_data, section_number):
+        main_section_number = section_number.split(".")[0]
+        json_title = section_data.get("title", section_name.replace("_", " ").title())
+        lowered_name = section_name.lower()
+
+        # ✅ Tables (and the charts that follow air/noise tables) come first, then images
+        tables = []
+        table_defs = [section_data["table"]] if "table" in section_data else section_data.get("tables", [])
+        for table_def in table_defs:
+            if not isinstance(table_def, dict) or not table_def.get("data"):
+                print(f"⚠ Warning: Unexpected table format in section '{json_title}'. Skipping.")
+                continue
+            tables.append(self._compile_table(table_def, json_title, main_section_number))
+
+        images = self._compile_images(section_key, section_data, main_section_number)
+
+        table_numbers = tuple(table.number for table in tables)
+        figure_numbers = tuple(chart.figure_number for table in tables for chart in table.charts)
+        figure_numbers += tuple(image.figure_number for image in images)
+
+        special_bullets = ()
+        special_paragraphs = ()
+        verdict = None
+        subsections = section_data.get("subsections", {})
+
+        if lowered_name == "scope of work" and self.parameters:
+            special_bullets = tuple(format_parameter_section(param) for param in self.parameters)
+
+        if lowered_name == "regulatory standards" and self.parameters:
+            subsections = {key: value for key, value in subsections.items() if key.lower() in self.parameter_keys}
+            if not subsections:
+                print(f"⚠ Warning: No matching regulatory standard found for parameters {self.parameter_keys}.")
+
+        # Structure-declared parameter sections keep only the subsections of the selected parameters
+        elif section_data.get("parameter_subsections"):
+            subsections = {key: value for key, value in subsections.items() if key.lower() in self.parameter_keys}
+
+        if lowered_name == "conclusion" and self.parameters:
+            conclusion_paragraphs = [self.conclusions[param] for param in self.parameter_keys
+                                     if param in self.conclusions]
+            if conclusion_paragraphs:
+                verdict_text = self.conclusions.get(
+                    "verdict",
+                    "This analysis revealed that the observed monitoring parameter(s) consistently adhered to the national standards across all monitored locations at the project site.")
+                special_paragraphs = ("\n\n".join(conclusion_paragraphs),)
+                verdict = verdict_text
+            else:
+                print(f"⚠ Warning: No matching conclusions found for parameters {self.parameter_keys}.")
+
+        self.sections.append(PlanSection(
+            key=section_key,
+            title=f"{section_number}. {json_title}",
+            number=section_number,
+            level=section_number.count(".") + 1,
+            text=compile_template(section_data.get("text", "")),
+            table_numbers=table_numbers,
+            figure_numbers=figure_numbers,
+            bullets=tuple(compile_template(point) for point in section_data.get("bullet_list", [])),
+            special_paragraphs=special_paragraphs,
+            verdict=verdict,
+            special_bullets=special_bullets,
+            tables=tuple(tables),
+            images=tuple(images),
+        ))
+
+        # Recursively process subsections
+        for idx, (sub_key, sub_data) in enumerate(subsections.items(), start=1):
+            self.compile_section(sub_key, sub_key, sub_data, f"{section_number}.{idx}")
+
+    def _compile_table(self, table_def, section_title, main_section_number):
+        number = next_number(self.table_counters, main_section_number)
+        header_row = tuple(table_def["data"][0])
+
+        binding = None
+        chart_type = None
+        if "monitoring locations" in section_title.lower():
+            binding = "monitoring_locations"
+        for candidate_type, (placeholder, headers, _) in CHART_TABLES.items():
+            if header_row == headers:
+                binding, chart_type = placeholder, candidate_type
+
+        charts = ()
+        if chart_type:
+            charts = tuple(PlanChart(pollutant, next_number(self.figure_counters, main_section_number))
+                           for pollutant in CHART_TABLES[chart_type][2])
+
+        return PlanTable(
+            title=compile_template(table_def.get("title", "Table")),
+            number=number,
+            rows=tuple(tuple(row) for row in table_def["data"]),
+            binding=binding,
+            chart_type=chart_type,
+            charts=charts,
+        )
+
+    def _compile_images(self, section_key, section_data, main_section_number):
+        images = []
+
+        if section_key == "monitoring_locations":
+            # ✅ Monitoring Location Map first, then one site photo per monitoring location
+            if self.has_map:
+                images.append(PlanImage(next_number(self.figure_counters, main_section_number),
+                                        "Environmental Monitoring Location Map", 5,
+                                        binding="monitoring_location_map", figure_class="map"))
+            for index in range(self.num_location_images):
+                images.append(PlanImage(next_number(self.figure_counters, main_section_number),
+                                        "", 2.5, binding="monitoring_location_images", binding_index=index))
+
+        if "images" in section_data:
+            for image_data in section_data["images"]:
+                if not isinstance(image_data, dict) or "path" not in image_data:
+                    print("⚠ Warning: Image data format incorrect. Skipping.")
+                    continue
+                path = self._image_path(image_data["path"])
+                if path is None:
+                    continue
+                figure_number = next_number(self.figure_counters, main_section_number)
+                description = image_data.get("description", f"Figure {figure_number} - Image Description")
+                width = 5 if "Location Map" in description else 2.5  # Larger for Location Map
+                images.append(PlanImage(figure_number, description, width, path=path,
+                                        figure_class="map" if "Location Map" in description else "photo"))
+
+        # 🔹 Single image (for backward compatibility)
+        elif "image" in section_data:
+            path = self._image_path(section_data["image"])
+            if path is not None:
+                figure_number = next_number(self.figure_counters, main_section_number)
+                description = section_data.get("image_description", f"Figure {figure_number} - Image Description")
+                width = 3 if "Location Map" in description else 1.5  # Larger for Location Map
+                images.append(PlanImage(figure_number, description, width, path=path, caption_heading=False,
+                                        figure_class="map" if "Location Map" in description else "photo"))
+
+        return images
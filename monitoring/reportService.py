@@ -0,0 +1,285 @@
+"""
+Local report-generation HTTP service: site systems push report data, poll the job and download the
+report. Jobs go through the same bounded queue and warm worker pool as the UI (see reportJobs), so the
+workers keep the heavy imports, the base document and the compiled plans loaded between reports.
+
+Usage (from the repository root):
+    python main.py --serve
+    python main.py --serve --host 0.0.0.0 --port 9000
+
+Endpoints:
+    POST /reports                  {"placeholders": {...}, "type": "monitoring", "format": "docx", "archive": false}
+                                   -> 202 {"id", "status_url", "download_url"}; 429 when the queue is full,
+                                   503 when the worker pool is unavailable
+    GET  /reports/<id>             -> {"id", "type", "format", "state", "message", "seconds", "error"}
+    GET  /reports/<id>/download    -> the report file once the job is done (409 until then)
+    GET  /metrics                  -> throughput, latency percentiles and queue depth
+    GET  /health                   -> {"status": "ok"}
+"""
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import BrokenExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from monitoring.reportJobs import ReportQueueFull, get_report_jobs, shutdown_report_jobs
+from monitoring.reportTypes import get_report_type, report_type_names
+
+
+DEFAULT_SERVICE_CONFIG = {
+    "host": "127.0.0.1",
+    "port": 8765,
+    "warm_parameters": ["Air, Noise"],  # report_parameters whose plans each worker compiles up front
+    "max_request_mb": 64,
+    "job_history": 500,                 # Finished jobs kept for status and download
+}
+
+REPORT_CONTENT_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "pdf": "application/pdf",
+}
+
+# Finished jobs in the latency percentiles
+LATENCY_WINDOW = 200
+# Window of the recent throughput figure
+THROUGHPUT_WINDOW_SECONDS = 300
+
+_REPORT_PATH = re.compile(r"^/reports/([A-Za-z0-9._-]+)(/download)?$")
+
+
+def service_config(constants):
+    """The `service` block of constants.json over the defaults."""
+    config = dict(DEFAULT_SERVICE_CONFIG)
+    config.update(constants.get("service", {}))
+    return config
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of `values` (None when empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+
+class ServiceMetrics:
+    """Job counters plus the end-to-end and build latencies of the most recent finished jobs."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.submitted = 0
+        self.rejected = 0
+        self.succeeded = 0
+        self.failed = 0
+        self._finished = deque(maxlen=LATENCY_WINDOW)  # (finished at, total seconds, build seconds)
+        self._lock = threading.Lock()
+
+    def job_submitted(self):
+        with self._lock:
+            self.submitted += 1
+
+    def job_rejected(self):
+        with self._lock:
+            self.rejected += 1
+
+    def job_finished(self, total_seconds, build_seconds, failed):
+        with self._lock:
+            if failed:
+                self.failed += 1
+            else:
+                self.succeeded += 1
+                self._finished.append((time.time(), total_seconds, build_seconds))
+
+    def snapshot(self, running, queued):
+        with self._lock:
+            now = time.time()
+            uptime = now - self.started
+            totals = [total for _, total, _ in self._finished]
+            builds = [build for _, _, build in self._finished if build is not None]
+            recent = sum(1 for finished, _, _ in self._finished if now - finished <= THROUGHPUT_WINDOW_SECONDS)
+            window = min(uptime, THROUGHPUT_WINDOW_SECONDS)
+
+            def latency(values):
+                if not values:
+                    return {"p50": None, "p95": None, "max": None, "mean": None}
+                return {"p50": round(percentile(values, 50), 3), "p95": round(percentile(values, 95), 3),
+                        "max": round(max(values), 3), "mean": round(sum(values) / len(values), 3)}
+
+            return {
+                "uptime_seconds": round(uptime, 1),
+                "jobs": {"submitted": self.submitted, "rejected": self.rejected, "succeeded": self.succeeded,
+                         "failed": self.failed, "running": running, "queued": queued},
+                "throughput": {
+                    "reports_per_minute": round(self.succeeded / uptime * 60, 3) if uptime else 0.0,
+                    "recent_reports_per_minute": round(recent / window * 60, 3) if window else 0.0,
+                },
+                "latency_seconds": {"end_to_end": latency(totals), "build": latency(builds),
+                                    "samples": len(totals)},
+            }
+
+
+class ReportService:
+    """Tracks the jobs submitted over HTTP on top of the process-wide report job queue."""
+
+    def __init__(self, constants):
+        self.config = service_config(constants)
+        plan_keys = [(name, parameters) for name in report_type_names()
+                     for parameters in self.config["warm_parameters"]]
+        self.queue = get_report_jobs(constants, plan_keys)
+        self.metrics = ServiceMetrics()
+        self._jobs = OrderedDict()  # id -> (ReportJob, report type name, format)
+        self._lock = threading.Lock()
+
+    def submit(self, request):
+        """Validates and queues a report request; returns (HTTP status, response body)."""
+        if not isinstance(request, dict) or not isinstance(request.get("placeholders"), dict):
+            return 400, {"error": "Expected a JSON object with a \"placeholders\" object"}
+        report_format = request.get("format", "docx")
+        if report_format not in REPORT_CONTENT_TYPES:
+            return 400, {"error": f"Unknown format '{report_format}'. Available: {', '.join(REPORT_CONTENT_TYPES)}"}
+        try:
+            report_type = get_report_type(request.get("type")).name
+        except ValueError as e:
+            return 400, {"error": str(e)}
+
+        try:
+            job = self.queue.submit(request["placeholders"], report_format, archive=bool(request.get("archive")),
+                                    report_type=report_type)
+        except ReportQueueFull as e:
+            self.metrics.job_rejected()
+            return 429, {"error": f"Report queue is full: {e}"}
+        except (BrokenExecutor, RuntimeError) as e:  # Pool broke again on restart, or already shut down
+            self.metrics.job_rejected()
+            return 503, {"error": f"Report workers unavailable: {type(e).__name__}: {e}"}
+
+        self.metrics.job_submitted()
+        with self._lock:
+            self._jobs[job.id] = (job, report_type, report_format)
+            self._forget_finished()
+        job.future.add_done_callback(lambda future: self._job_done(job, future))
+        return 202, {"id": job.id, "status_url": f"/reports/{job.id}", "download_url": f"/reports/{job.id}/download"}
+
+    def _job_done(self, job, future):
+        failed = future.cancelled() or future.exception() is not None
+        result = {"error": "cancelled or crashed"} if failed else future.result()
+        self.metrics.job_finished(job.elapsed, result.get("seconds"), bool(result.get("error")))
+
+    def _forget_finished(self):
+        """Drops the oldest finished jobs past `job_history`, together with their report folders."""
+        finished = [job_id for job_id, (job, _, _) in self._jobs.items() if job.future.done()]
+        for job_id in finished[:max(0, len(self._jobs) - self.config["job_history"])]:
+            del self._jobs[job_id]
+            shutil.rmtree(os.path.join(self.queue.output_dir, job_id), ignore_errors=True)
+
+    def _lookup(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def status(self, job_id):
+        entry = self._lookup(job_id)
+        if entry is None:
+            return 404, {"error": f"Unknown report job '{job_id}'"}
+        job, report_type, report_format = entry
+        state, message = self.queue.progress(job)
+        body = {"id": job.id, "type": report_type, "format": report_format, "state": state, "message": message,
+                "seconds": None, "error": None}
+        if state in ("done", "failed"):
+            ok = not job.future.cancelled() and job.future.exception() is None
+            result = job.future.result() if ok else {"error": message}
+            body.update(seconds=result.get("seconds"), error=result.get("error"))
+        return 200, body
+
+    def artifact(self, job_id):
+        """Returns (HTTP status, error body or None, report path or None)."""
+        status, body = self.status(job_id)
+        if status != 200:
+            return status, body, None
+        if body["state"] == "failed":
+            return 410, {"error": body["error"]}, None
+        if body["state"] != "done":
+            return 409, {"error": f"Report is not ready ({body['state']})"}, None
+        return 200, None, self._lookup(job_id)[0].future.result()["path"]
+
+    def metrics_snapshot(self):
+        running, queued = self.queue.load()
+        return self.metrics.snapshot(running, queued)
+
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+    server_version = "ChlorisReportService/1.0"
+    service = None  # Set by `make_server`
+
+    def _send_json(self, status, body):
+        data = json.dumps(body, indent=2).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_file(self, path, report_format):
+        self.send_response(200)
+        self.send_header("Content-Type", REPORT_CONTENT_TYPES.get(report_format, "application/octet-stream"))
+        self.send_header("Content-Length", str(os.path.getsize(path)))
+        self.send_header("Content-Disposition", f'attachment; filename="{os.path.basename(path)}"')
+        self.end_headers()
+        with open(path, "rb") as file:
+            shutil.copyfileobj(file, self.wfile)
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/health":
+            return self._send_json(200, {"status": "ok"})
+        if path == "/metrics":
+            return self._send_json(200, self.service.metrics_snapshot())
+
+        match = _REPORT_PATH.match(path)
+        if match is None:
+            return self._send_json(404, {"error": f"No route for GET {path}"})
+        job_id, download = match.groups()
+        if not download:
+            return self._send_json(*self.service.status(job_id))
+
+        status, body, report_path = self.service.artifact(job_id)
+        if report_path is None:
+            return self._send_json(status, body)
+        self._send_file(report_path, os.path.splitext(report_path)[1].lstrip("."))
+
+    def do_POST(self):
+        if self.path.split("?", 1)[0] != "/reports":
+            return self._send_json(404, {"error": f"No route for POST {self.path}"})
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > self.service.config["max_request_mb"] * 1024 * 1024:
+            return self._send_json(413, {"error": "Request body too large"})
+        try:
+            request = json.loads(self.rfile.read(length) or b"null")
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            return self._send_json(400, {"error": f"Invalid JSON: {e}"})
+        self._send_json(*self.service.submit(request))
+
+
+def make_server(constants, host=None, port=None):
+    """Builds the HTTP server (and its warm worker pool) without starting it."""
+    service = ReportService(constants)
+    handler = type("BoundReportRequestHandler", (ReportRequestHandler,), {"service": service})
+    server = ThreadingHTTPServer((host or service.config["host"], port or service.config["port"]), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(constants, host=None, port=None):
+    """Runs the report service until interrupted, then drains the worker pool."""
+    server = make_server(constants, host, port)
+    print(f"🌐 Report service listening on http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        shutdown_report_jobs()
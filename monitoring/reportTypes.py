@@ -0,0 +1,76 @@
+"""
+Report types: each one pairs a structure file with the order its sections are compiled in, plus the
+header and file name titles. Every type goes through the same pipeline (plan compiler and cache, data
+binding, tables, images, charts, section cache, Word and PDF output), so a new type is a structure
+file and a `register_report_type` call.
+"""
+import re
+from dataclasses import dataclass
+
+from monitoring.reportPlan import monitoring_section_names, structure_section_names
+
+
+DEFAULT_REPORT_TYPE = "monitoring"
+
+
+@dataclass(frozen=True)
+class ReportType:
+    name: str                   # Registry key, e.g. "monitoring"
+    label: str                  # Display name (UI, CLI)
+    structure_key: str          # constants.json entry holding the structure file
+    section_names: object       # (structure, parameters) -> top-level section names, see reportPlan
+    title: str                  # Header title; "{report_frequency}" is filled in
+    file_title: str             # File name prefix; "{report_frequency}" is filled in (capitalised)
+
+    def report_title(self, placeholders):
+        return self.title.format(report_frequency=placeholders.get("report_frequency") or "").strip()
+
+    def file_prefix(self, placeholders):
+        """File name prefix; placeholder text is scrubbed to [A-Za-z0-9._-] so it can't leave the output folder."""
+        frequency = re.sub(r"[^A-Za-z0-9._-]+", "_", str(placeholders.get("report_frequency") or "")).strip("._")
+        return self.file_title.format(report_frequency=frequency.capitalize())
+
+
+_REPORT_TYPES = {}
+
+
+def register_report_type(report_type):
+    """Registers (or replaces) a report type under its lower-cased name."""
+    _REPORT_TYPES[report_type.name.lower()] = report_type
+    return report_type
+
+
+def get_report_type(name=None):
+    """Looks a report type up by name or label (case-insensitive); None gives the monitoring report."""
+    key = (name or DEFAULT_REPORT_TYPE).strip().lower()
+    for report_type in _REPORT_TYPES.values():
+        if key in (report_type.name.lower(), report_type.label.lower()):
+            return report_type
+    raise ValueError(f"Unknown report type '{name}'. Available: {', '.join(report_type_names())}")
+
+
+def report_type_names():
+    return list(_REPORT_TYPES)
+
+
+def report_type_labels():
+    return [report_type.label for report_type in _REPORT_TYPES.values()]
+
+
+register_report_type(ReportType(
+    name="monitoring",
+    label="Monitoring",
+    structure_key="structure_file",
+    section_names=monitoring_section_names,
+    title="{report_frequency} Environmental Monitoring Report",
+    file_title="{report_frequency}_Monitoring_Report",
+))
+
+register_report_type(ReportType(
+    name="cesmp",
+    label="CESMP",
+    structure_key="cesmp_structure_file",
+    section_names=structure_section_names,
+    title="Construction Environmental & Social Management Plan",
+    file_title="CESMP",
+))
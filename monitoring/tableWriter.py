@@ -0,0 +1,97 @@
+import re
+from xml.sax.saxutils import escape
+
+
+# Rows are serialised and parsed in chunks so memory stays flat for very long tables
+ROW_CHUNK_SIZE = 500
+
+# Characters python-docx cannot store in a w:t element (XML 1.0 forbids them)
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_RUN_SPLIT = re.compile(r"(\t|\r|\n)")
+
+
+def _run_xml(text):
+    """Builds the `w:r` content python-docx would write for `cell.text = text`."""
+    parts = []
+    for token in _RUN_SPLIT.split(text):
+        if not token:
+            continue
+        if token == "\t":
+            parts.append("<w:tab/>")
+        elif token in "\r\n":
+            parts.append("<w:br/>")
+        elif len(token.strip()) < len(token):
+            parts.append(f'<w:t xml:space="preserve">{escape(token)}</w:t>')
+        else:
+            parts.append(f"<w:t>{escape(token)}</w:t>")
+
+    if not parts:
+        return "<w:r/>"
+    return "<w:r>" + "".join(parts) + "</w:r>"
+
+
+def _rows_xml(rows, tc_pr, num_cols, transform):
+    row_parts = []
+    for row in rows:
+        cells = list(row)
+        if len(cells) > num_cols:
+            print(f"⚠ Warning: Table row has {len(cells)} cells but the header has {num_cols}. Extra cells dropped.")
+            cells = cells[:num_cols]
+
+        cell_parts = []
+        for cell in cells:
+            text = transform(str(cell)) if transform else str(cell)
+            text = _INVALID_XML_CHARS.sub("", text)
+            cell_parts.append(f"<w:tc>{tc_pr}<w:p>{_run_xml(text)}</w:p></w:tc>")
+
+        # Short rows keep their trailing cells empty, exactly like an untouched doc.add_table cell
+        cell_parts.extend(f"<w:tc>{tc_pr}<w:p/></w:tc>" for _ in range(num_cols - len(cells)))
+        row_parts.append("<w:tr>" + "".join(cell_parts) + "</w:tr>")
+
+    return "".join(row_parts)
+
+
+def add_bulk_table(doc, rows, style="Table Grid", transform=None):
+    """
+    Adds a table to `doc` in one pass from a row iterator, bypassing per-cell python-docx calls.
+
+    The result is identical to `doc.add_table` + `table.style = style` + `table.cell(r, c).text = ...`,
+    but scales linearly with the number of rows.
+
+    :param doc: The Word Document object.
+    :param rows: Iterable of rows (the first row defines the column count).
+    :param style: Table style name.
+    :param transform: Optional callable applied to every cell's text (e.g. placeholder replacement).
+    :return: The python-docx Table, or None if `rows` is empty.
+    """
+    rows = iter(rows)
+    first_row = next(rows, None)
+    if not first_row:
+        return None
+
+    num_cols = len(first_row)
+    table = doc.add_table(rows=0, cols=num_cols)
+    table.style = style
+
+    tbl = table._tbl
+    col_width = tbl.tblGrid.gridCol_lst[0].w.twips if num_cols else 0
+    tc_pr = f'<w:tcPr><w:tcW w:type="dxa" w:w="{col_width}"/></w:tcPr>'
+
+    chunk = [first_row]
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= ROW_CHUNK_SIZE:
+            _append_rows(tbl, chunk, tc_pr, num_cols, transform)
+            chunk = []
+    if chunk:
+        _append_rows(tbl, chunk, tc_pr, num_cols, transform)
+
+    return table
+
+
+def _append_rows(tbl, rows, tc_pr, num_cols, transform):
+    from docx.oxml import parse_xml
+    from docx.oxml.ns import nsdecls
+
+    fragment = parse_xml(f"<w:tbl {nsdecls('w')}>{_rows_xml(rows, tc_pr, num_cols, transform)}</w:tbl>")
+    tbl.extend(list(fragment))
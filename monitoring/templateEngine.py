@@ -0,0 +1,139 @@
+import re
+from functools import lru_cache
+
+
+# Segment kinds of a compiled template
+LITERAL = "literal"
+PLACEHOLDER = "placeholder"
+TABLE_NUMBER = "table_number"
+FIGURE_NUMBER = "figure_number"
+FIGURE_RANGE = "figure_range"
+
+_TOKEN_PATTERN = re.compile(r"\{figure_number\} to \{figure_number\}|\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+# Placeholder names already reported as unknown (reset per report)
+_warned_placeholders = set()
+
+
+@lru_cache(maxsize=4096)
+def compile_template(text):
+    """
+    Compiles a structure.json text into a tuple of (kind, value) segments.
+
+    `{name}` becomes a PLACEHOLDER segment, `{table_number}` / `{figure_number}` become numbering
+    segments and `{figure_number} to {figure_number}` becomes a single FIGURE_RANGE segment.
+    """
+    if not text:
+        return ()
+    if "{" not in text:
+        return ((LITERAL, text),)
+
+    segments = []
+    position = 0
+    for match in _TOKEN_PATTERN.finditer(text):
+        if match.start() > position:
+            segments.append((LITERAL, text[position:match.start()]))
+
+        name = match.group(1)
+        if name is None:
+            segments.append((FIGURE_RANGE, None))
+        elif name == "table_number":
+            segments.append((TABLE_NUMBER, None))
+        elif name == "figure_number":
+            segments.append((FIGURE_NUMBER, None))
+        else:
+            segments.append((PLACEHOLDER, name))
+        position = match.end()
+
+    if position < len(text):
+        segments.append((LITERAL, text[position:]))
+
+    return tuple(segments)
+
+
+def template_placeholders(template):
+    """Returns the placeholder names referenced by a compiled template."""
+    return {value for kind, value in template if kind == PLACEHOLDER}
+
+
+def render_template(template, placeholders, table_numbers=None, figure_numbers=None, context=""):
+    """
+    Renders a compiled template in one pass.
+
+    Table numbers are assigned in order (the last one is reused if the text mentions more tables than
+    the section has). A figure range takes the first and last figure numbers; remaining figure
+    placeholders take the following numbers in order. When `table_numbers` / `figure_numbers` is None
+    the numbering placeholders are left in place for a later stage. Neither list is modified.
+
+    :param template: Output of `compile_template`.
+    :param placeholders: Placeholder values.
+    :param table_numbers: Precomputed table numbers for this text.
+    :param figure_numbers: Precomputed figure numbers for this text.
+    :param context: Section title used in warnings.
+    :return: Rendered text.
+    """
+    parts = []
+    table_index = 0
+    figure_index = 0
+
+    for kind, value in template:
+        if kind == LITERAL:
+            parts.append(value)
+
+        elif kind == PLACEHOLDER:
+            if value in placeholders:
+                parts.append(str(placeholders[value]))
+            else:
+                if value not in _warned_placeholders:
+                    _warned_placeholders.add(value)
+                    print(f"⚠ Warning: Unknown placeholder '{{{value}}}' in section '{context}'.")
+                parts.append(f"{{{value}}}")
+
+        elif kind == TABLE_NUMBER:
+            if table_numbers is None:
+                parts.append("{table_number}")
+            elif table_numbers:
+                parts.append(table_numbers[min(table_index, len(table_numbers) - 1)])
+                table_index += 1
+            else:
+                print(f"⚠ Warning: No table number available for section '{context}'.")
+                parts.append("{table_number}")
+
+        elif kind == FIGURE_RANGE:
+            if figure_numbers is None:
+                parts.append("{figure_number} to {figure_number}")
+            elif len(figure_numbers) - figure_index >= 2:
+                parts.append(f"{figure_numbers[figure_index]} to {figure_numbers[-1]}")
+                figure_index += 1
+            elif len(figure_numbers) - figure_index == 1:
+                parts.append(figure_numbers[figure_index])
+                figure_index += 1
+            else:
+                print(f"⚠ Warning: Not enough figure numbers to replace all placeholders in section '{context}'")
+                parts.append("{figure_number} to {figure_number}")
+
+        elif kind == FIGURE_NUMBER:
+            if figure_numbers is None:
+                parts.append("{figure_number}")
+            elif figure_index < len(figure_numbers):
+                parts.append(figure_numbers[figure_index])
+                figure_index += 1
+            else:
+                print(f"⚠ Warning: Not enough figure numbers to replace all placeholders in section '{context}'")
+                parts.append("{figure_number}")
+
+    return "".join(parts)
+
+
+def render_text(text, placeholders, table_numbers=None, figure_numbers=None, context=""):
+    """Compiles (cached) and renders `text`."""
+    if not text:
+        return ""
+    if "{" not in text:
+        return text
+    return render_template(compile_template(text), placeholders, table_numbers, figure_numbers, context)
+
+
+def reset_template_warnings():
+    """Clears the unknown-placeholder warnings so each report reports its own."""
+    _warned_placeholders.clear()
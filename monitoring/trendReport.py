@@ -0,0 +1,368 @@
+"""
+Trend reports: how each parameter evolves over many monitoring periods, per project and location.
+
+Readings come from the monitoring data store (every archived report and import), so a quarter or a year
+of weekly reports becomes one document. Statistics are grouped pandas operations over the long
+(location, parameter, timestamp, value) frame: per period readings, mean, percentiles, maximum and the
+averaging periods over their standard (as in the monitoring report's exceedances), plus a rolling mean of
+each series. Charts plot every series over the whole range; series longer than `max_chart_points` are
+reduced with min/max decimation (each bucket keeps its lowest and highest reading), so peaks survive and a
+100k-point history is drawn from a few thousand.
+"""
+import io
+import os
+import re
+
+from monitoring.chartCache import get_chart_cache
+from monitoring.chartRenderer import render_charts, resolve_chart_profile
+from monitoring.dataStore import KIND_PARAMETERS, get_monitoring_store
+from monitoring.docPackage import deduplicate_media, package_size_report, print_package_summary
+from monitoring.exceedance import (DEFAULT_EXCEEDANCE_CONFIG, averaged_values, chart_limit_labels, chart_limits,
+                                   exceedance_config, reference_limits)
+from monitoring.profiling import count, span
+from monitoring.monitoringReport import (CONSTANTS, PROJECT_DIR, add_header, count_figure, count_table,
+                                         get_report_template, save_document)
+from monitoring.reportPlan import get_report_plan, next_number
+from monitoring.tableWriter import add_bulk_table
+from monitoring.templateEngine import render_text
+
+
+DEFAULT_TREND_CONFIG = {
+    "period": "monthly",
+    "rolling_window": "24h",
+    "percentiles": [50, 95],
+    "max_chart_points": 2000,
+    "chart_parameters": {"air": ["CO", "O3", "NO2", "SO2", "PM2.5", "PM10"], "noise": ["EQ", "Max"]},
+}
+
+# Trend period -> (pandas period alias, period name in the report text)
+PERIOD_ALIASES = {
+    "weekly": ("W", "week"),
+    "monthly": ("M", "month"),
+    "quarterly": ("Q", "quarter"),
+}
+
+DEFAULT_NOISE_DAY_HOURS = DEFAULT_EXCEEDANCE_CONFIG["noise_day_hours"]
+
+KIND_TITLES = {"air": "Air Quality", "noise": "Noise Quality"}
+KIND_UNITS = {"air": "Concentration (μg/m³)", "noise": "Noise Level (dB)"}
+
+# Captions numbered like the monitoring report's (see reportPlan.next_number and templateEngine)
+TABLE_CAPTION = "Table {table_number} - {title}"
+FIGURE_CAPTION = "Figure {figure_number} - {title}"
+
+
+def trend_config(constants):
+    config = dict(DEFAULT_TREND_CONFIG)
+    config.update(constants.get("trend", {}))
+    return config
+
+
+def load_trend_readings(store, project_number, kind, start=None, end=None):
+    """
+    Stored readings of one project and kind in [start, end) as a long frame: categorical `location` and
+    `parameter`, datetime64 `timestamp` and float64 `value`, sorted by location, parameter and time.
+    """
+    import numpy as np
+    import pandas as pd
+
+    frame = store.query_readings(project_number, kind, start, end)
+    parameters = list(KIND_PARAMETERS[kind])
+    readings = frame.melt(id_vars=["location", "timestamp"], value_vars=parameters, var_name="parameter",
+                          value_name="value")
+    readings = readings[readings["value"].notna()]
+    readings = readings.assign(parameter=pd.Categorical(readings["parameter"], categories=parameters),
+                               value=readings["value"].to_numpy(np.float64))
+    return readings.sort_values(["location", "parameter", "timestamp"], kind="stable", ignore_index=True)
+
+
+def period_statistics(readings, kind, period, percentiles, limits, day_hours=DEFAULT_NOISE_DAY_HOURS):
+    """
+    Per (location, parameter, period) statistics of a long readings frame in one grouped pass.
+
+    Noise means are energy averages (10·log10 of the mean of 10^(L/10)); air means are arithmetic.
+    Exceedances are counted like the monitoring report's (see `exceedance.averaged_values`): averaging
+    periods whose mean is above the standard for that averaging time (e.g. daily PM10 means over the daily
+    limit) and noise days / nights whose Leq is above the day / night limit, never single readings.
+
+    :param limits: Reference limits (see `exceedance.reference_limits`).
+    :param day_hours: First and last-plus-one hour of the noise day period.
+    :return: DataFrame with location, parameter, period, readings, mean, p<percentile>..., max, exceedances, limit
+        (the charted standard, NaN for parameters without one).
+    """
+    import numpy as np
+    import pandas as pd
+
+    alias = PERIOD_ALIASES[period][0]
+    values = readings["value"].to_numpy(np.float64)
+    frame = pd.DataFrame({
+        "location": readings["location"],
+        "parameter": readings["parameter"],
+        "period": readings["timestamp"].dt.to_period(alias),
+        "value": values,
+        "energy": np.power(10.0, values / 10.0) if kind == "noise" else values,
+    })
+
+    grouped = frame.groupby(["location", "parameter", "period"], observed=True, sort=True)
+    statistics = grouped["value"].agg(readings="count", max="max")
+    mean = grouped["energy"].mean()
+    statistics.insert(1, "mean", 10.0 * np.log10(mean) if kind == "noise" else mean)
+    quantiles = grouped["value"].quantile([percentile / 100 for percentile in percentiles]).unstack()
+    for position, (percentile, column) in enumerate(zip(percentiles, quantiles.columns)):
+        statistics.insert(2 + position, f"p{percentile:g}", quantiles[column])
+    statistics = statistics.reset_index()
+
+    exceedances = period_exceedances(readings, kind, alias, limits, day_hours)
+    keys = pd.MultiIndex.from_arrays([statistics["location"].astype(str), statistics["parameter"].astype(str),
+                                      statistics["period"]])
+    statistics["exceedances"] = exceedances.reindex(keys, fill_value=0).to_numpy(int)
+    statistics["limit"] = statistics["parameter"].astype(str).map(chart_limits(limits, kind))
+    return statistics
+
+
+def period_exceedances(readings, kind, alias, limits, day_hours):
+    """Exceeded averaging periods per (location, parameter, trend period) of a long readings frame."""
+    import pandas as pd
+
+    wide = (readings.pivot_table(index=["location", "timestamp"], columns="parameter", values="value",
+                                 observed=True)
+            .reindex(columns=list(KIND_PARAMETERS[kind])).reset_index())
+    wide.columns.name = None
+    averages = averaged_values(wide, kind, limits, day_hours)
+    if averages is None:
+        return pd.Series(dtype=int)
+
+    exceeded = averages[averages["value"] > averages["limit"]]
+    return exceeded.groupby([exceeded["location"], exceeded["parameter"],
+                             exceeded["timestamp"].dt.to_period(alias)]).size()
+
+
+def rolling_mean(timestamps, values, window, kind):
+    """Time-based rolling mean of one series (energy average for noise levels)."""
+    import numpy as np
+    import pandas as pd
+
+    series = pd.Series(np.power(10.0, values / 10.0) if kind == "noise" else values,
+                       index=pd.DatetimeIndex(timestamps))
+    rolled = series.rolling(window, min_periods=1).mean().to_numpy()
+    return 10.0 * np.log10(rolled) if kind == "noise" else rolled
+
+
+def decimate_minmax(values, max_points):
+    """
+    Indices of the points to plot for a long series: the values are split into max_points // 2 consecutive
+    buckets and each bucket keeps its minimum and maximum (plus the first and last point), in time order.
+    Series of at most `max_points` points are kept whole.
+    """
+    import numpy as np
+
+    size = len(values)
+    if size <= max_points or max_points < 2:
+        return np.arange(size)
+
+    bucket = -(-size // (max_points // 2))
+    buckets = -(-size // bucket)
+    grid = np.full(buckets * bucket, np.nan)
+    grid[:size] = values
+    grid = grid.reshape(buckets, bucket)
+    base = np.arange(buckets) * bucket
+    return np.unique(np.concatenate([base + np.nanargmin(grid, axis=1), base + np.nanargmax(grid, axis=1),
+                                     [0, size - 1]]))
+
+
+def trend_chart_specs(readings, kind, project_number, config, limits, limit_labels=None):
+    """
+    Chart specs (see `chartRenderer.render_trend_chart`) for every charted location / parameter series.
+
+    :param limits: Parameter -> standard line value; `limit_labels` names each line's source.
+    """
+    import numpy as np
+
+    charted = set(config["chart_parameters"].get(kind, KIND_PARAMETERS[kind]))
+    specs = []
+    for (location, parameter), series in readings.groupby(["location", "parameter"], observed=True, sort=True):
+        if parameter not in charted:
+            continue
+        timestamps = series["timestamp"].to_numpy("datetime64[ns]")
+        values = series["value"].to_numpy(np.float64)
+        rolling = rolling_mean(timestamps, values, config["rolling_window"], kind)
+        keep = decimate_minmax(values, config["max_chart_points"])
+        count("trend_points", len(values))
+        count("trend_points_plotted", len(keep))
+        specs.append({
+            "chart": "trend",
+            "monitoring_type": KIND_TITLES[kind],
+            "project": project_number,
+            "location": str(location),
+            "pollutant": parameter,
+            "timestamps": timestamps[keep].astype("datetime64[s]").astype(np.int64).tolist(),
+            "values": np.round(values[keep], 3).tolist(),
+            "rolling": np.round(rolling[keep], 3).tolist(),
+            "rolling_label": f"{config['rolling_window']} rolling mean",
+            "standard": limits.get(parameter),
+            "standard_label": (limit_labels or {}).get(parameter),
+            "y_axis_label": KIND_UNITS[kind],
+        })
+    return specs
+
+
+def statistics_rows(statistics, percentiles):
+    """Table rows (header first) for a period statistics frame."""
+    header = (["Location", "Parameter", "Period", "Readings", "Mean"]
+              + [f"P{percentile:g}" for percentile in percentiles] + ["Max", "Exceedances"])
+    rows = [header]
+    columns = ["mean"] + [f"p{percentile:g}" for percentile in percentiles] + ["max"]
+    values = statistics[columns].round(1).to_numpy().tolist()
+    for record, numbers in zip(statistics[["location", "parameter", "period", "readings", "exceedances", "limit"]]
+                               .itertuples(index=False), values):
+        location, parameter, period, readings, exceedances, limit = record
+        exceedance_text = "-" if limit != limit or limit is None else str(exceedances)
+        rows.append([str(location), str(parameter), str(period), str(readings)]
+                    + [f"{number:.1f}" for number in numbers] + [exceedance_text])
+    return rows
+
+
+def trend_filename(projects, start, end, extension=".docx"):
+    """Trend_Report_<projects>_<start>-<end>.docx (file-system safe)."""
+    name = "_".join(re.sub(r"[^A-Za-z0-9._-]+", "_", str(project)).strip("._") for project in projects)
+    return f"Trend_Report_{name}_{start:%Y%m%d}-{end:%Y%m%d}{extension}"
+
+
+def generate_trend_report(projects, start=None, end=None, period=None, kinds=None, report_path=None, store=None):
+    """
+    Generates a consolidated trend report for one or more projects from the monitoring data store.
+
+    :param projects: Project numbers (as archived by reports / imports).
+    :param start: First day included (date string or datetime); defaults to the first stored reading.
+    :param end: Day after the last one included; defaults to after the last stored reading.
+    :param period: "weekly", "monthly" or "quarterly" statistics; defaults to the configured trend period.
+    :param kinds: Subset of ("air", "noise"); defaults to both.
+    :param report_path: Output .docx path; defaults to `output_dir` / `trend_filename(...)`.
+    :param store: MonitoringStore; defaults to the configured data store.
+    :return: Path of the generated report.
+    """
+    from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+    from docx.shared import Inches
+
+    config = trend_config(CONSTANTS)
+    period = (period or config["period"]).lower()
+    if period not in PERIOD_ALIASES:
+        raise ValueError(f"Unsupported trend period {period!r} (use {', '.join(PERIOD_ALIASES)})")
+    store = store or get_monitoring_store(CONSTANTS)
+    if store is None:
+        raise ValueError("Trend reports read the monitoring data store; set data_store in constants.json")
+    projects = [str(project).strip() for project in projects]
+    kinds = [kind for kind in (kinds or KIND_PARAMETERS) if kind in KIND_PARAMETERS]
+
+    chart_cache = get_chart_cache(CONSTANTS)
+    if chart_cache is not None:
+        chart_cache.reset_stats()
+
+    with span("report", format="trend"):
+        with span("readings"):
+            readings = {}
+            for project in projects:
+                for kind in kinds:
+                    frame = load_trend_readings(store, project, kind, start, end)
+                    if len(frame):
+                        readings[project, kind] = frame
+                        count("trend_readings", len(frame))
+            if not readings:
+                raise ValueError(f"No stored readings for project(s) {', '.join(projects)} in the requested range")
+            first = min(frame["timestamp"].min() for frame in readings.values())
+            last = max(frame["timestamp"].max() for frame in readings.values())
+
+        with span("plan"):
+            plan = get_report_plan(CONSTANTS["structure_file"], {"report_parameters": "Air, Noise"}, CONSTANTS,
+                                   base_dir=PROJECT_DIR)
+            limits = reference_limits(plan.standards, CONSTANTS)
+
+        with span("exceedances"):
+            day_hours = exceedance_config(CONSTANTS)["noise_day_hours"]
+            statistics = {key: period_statistics(frame, key[1], period, config["percentiles"], limits, day_hours)
+                          for key, frame in readings.items()}
+
+        with span("charts"):
+            specs = {key: trend_chart_specs(frame, key[1], key[0], config, chart_limits(limits, key[1]),
+                                            chart_limit_labels(limits, key[1]))
+                     for key, frame in readings.items()}
+            with span("chart_render", charts=sum(len(chart_specs) for chart_specs in specs.values())):
+                rendered = iter(render_charts([spec for chart_specs in specs.values() for spec in chart_specs],
+                                              resolve_chart_profile(CONSTANTS), CONSTANTS.get("chart_workers"),
+                                              cache=chart_cache))
+
+        with span("document"):
+            doc = get_report_template().new_document()
+            add_header(doc, {"report_frequency": "Trend", "report_number": f"{first:%d %b %Y} - {last:%d %b %Y}",
+                             "project_location": ", ".join(projects), "project_number": ", ".join(projects)})
+
+            table_counters = {}
+            figure_counters = {}
+            display_width = resolve_chart_profile(CONSTANTS)["display_width"]
+
+            doc.add_page_break()
+            doc.add_heading("1. Trend Summary", level=1)
+            doc.add_paragraph(
+                f"This report shows how the monitored parameters evolved for project(s) {', '.join(projects)} "
+                f"between {first:%d %b %Y} and {last:%d %b %Y}. Statistics are given per {PERIOD_ALIASES[period][1]} "
+                f"(readings, mean, {', '.join(f'P{p:g}' for p in config['percentiles'])}, maximum and exceedances). "
+                f"Exceedances count the averaging periods above the reference standard for that averaging time "
+                f"(e.g. daily means above a daily limit) and, for noise, the day and night periods above the day "
+                f"and night limits; single readings above a limit are not exceedances. Charts show every reading, with long histories reduced to "
+                f"their minimum and maximum per interval, together with the {config['rolling_window']} rolling "
+                f"mean and the reference standard.")
+
+            doc.add_heading(render_text(TABLE_CAPTION, {"title": "Data Coverage"}, [next_number(table_counters, "1")]),
+                            level=4)
+            coverage = [["Project", "Monitoring", "Locations", "Readings", "First Reading", "Last Reading"]]
+            for (project, kind), frame in readings.items():
+                coverage.append([project, KIND_TITLES[kind], str(frame["location"].nunique()), str(len(frame)),
+                                 f"{frame['timestamp'].min():%d/%m/%Y %H:%M}",
+                                 f"{frame['timestamp'].max():%d/%m/%Y %H:%M}"])
+            count_table(coverage)
+            add_bulk_table(doc, coverage, style="Table Grid")
+            doc.add_paragraph("")
+
+            for section_number, kind in enumerate([kind for kind in kinds
+                                                   if any(key[1] == kind for key in readings)], start=2):
+                doc.add_page_break()
+                doc.add_heading(f"{section_number}. {KIND_TITLES[kind]} Trends", level=1)
+                for subsection, project in enumerate([project for project in projects
+                                                      if (project, kind) in readings], start=1):
+                    with span("section", key=f"{kind}_trends", number=f"{section_number}.{subsection}"):
+                        doc.add_heading(f"{section_number}.{subsection}. Project {project}", level=2)
+
+                        with span("table"):
+                            rows = statistics_rows(statistics[project, kind], config["percentiles"])
+                            count_table(rows)
+                            title = f"{KIND_TITLES[kind]} {period.capitalize()} Statistics ({project})"
+                            doc.add_heading(render_text(TABLE_CAPTION, {"title": title},
+                                                        [next_number(table_counters, str(section_number))]),
+                                            level=4)
+                            add_bulk_table(doc, rows, style="Table Grid")
+                            doc.add_paragraph("")
+
+                        for spec in specs[project, kind]:
+                            chart_png = next(rendered)
+                            count_figure(chart_png)
+                            title = f"{KIND_TITLES[kind]} - {spec['location']} - {spec['pollutant']} Trend ({project})"
+                            doc.add_heading(render_text(FIGURE_CAPTION, {"title": title}, figure_numbers=[
+                                next_number(figure_counters, str(section_number))]), level=5)
+                            image_paragraph = doc.add_paragraph()
+                            image_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+                            image_paragraph.add_run().add_picture(io.BytesIO(chart_png), width=Inches(display_width))
+                            doc.add_paragraph("")
+
+        if report_path is None:
+            report_path = os.path.join(CONSTANTS["output_dir"], trend_filename(projects, first, last))
+        with span("package"):
+            count("duplicate_media", deduplicate_media(doc))
+        with span("save"):
+            save_document(doc, report_path)
+
+    print(f"✅ Trend Report generated: {report_path}")
+    if chart_cache is not None:
+        cache_stats = chart_cache.stats()
+        print(f"📊 Chart cache: {cache_stats['hits']} hit(s), {cache_stats['misses']} miss(es)")
+    print_package_summary(package_size_report(report_path), CONSTANTS)
+    return report_path
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from monitoring.aggregation import aggregate_air, aggregate_noise, parse_frequency
+from monitoring.reportPlan import AIR_QUALITY_HEADERS, NOISE_QUALITY_HEADERS
+
+
+def readings_frame(headers, rows):
+    """Typed readings frame from (location, timestamp, {column: value}) tuples; other columns are NaN."""
+    frame = pd.DataFrame([{name: values.get(name, np.nan) for name in headers[2:]} for _, _, values in rows])
+    frame.insert(0, "timestamp", pd.to_datetime([timestamp for _, timestamp, _ in rows]))
+    frame.insert(0, "location", [location for location, _, _ in rows])
+    return frame
+
+
+def test_parse_frequency():
+    assert parse_frequency("15 mins") == pd.Timedelta(minutes=15)
+    assert parse_frequency("1 hr") == pd.Timedelta(hours=1)
+    assert parse_frequency("2 hours") == pd.Timedelta(hours=2)
+    with pytest.raises(ValueError):
+        parse_frequency("fortnightly")
+
+
+def test_noise_eq_is_energy_averaged():
+    frame = readings_frame(NOISE_QUALITY_HEADERS, [
+        ("ML-01", "2025-01-01 10:00", {"EQ": 60.0, "Max": 70.0}),
+        ("ML-01", "2025-01-01 10:05", {"EQ": 70.0, "Max": 80.0}),
+        ("ML-01", "2025-01-01 10:10", {"EQ": 60.0, "Max": 65.0}),
+    ])
+
+    result = aggregate_noise(frame, "15 mins")
+
+    assert len(result) == 1
+    row = result.iloc[0]
+    assert row["EQ"] == pytest.approx(10 * np.log10((2 * 10 ** 6 + 10 ** 7) / 3))  # Not the 63.3 arithmetic mean
+    assert row["Max"] == 80.0
+    assert row["AE"] == pytest.approx(10 * np.log10((2 * 10 ** 6 + 10 ** 7) * 300))  # 5-minute samples
+
+
+def test_noise_statistical_levels_and_intervals():
+    levels = [50.0, 52.0, 54.0, 56.0, 58.0, 60.0, 62.0, 64.0, 66.0, 68.0, 70.0]
+    rows = [("ML-01", pd.Timestamp("2025-01-01 10:00") + pd.Timedelta(minutes=minute), {"EQ": level})
+            for minute, level in enumerate(levels)]
+    rows.append(("ML-01", "2025-01-01 10:15", {"EQ": 40.0}))  # Next interval
+
+    result = aggregate_noise(readings_frame(NOISE_QUALITY_HEADERS, rows), "15 mins")
+
+    assert result["timestamp"].tolist() == [pd.Timestamp("2025-01-01 10:00"), pd.Timestamp("2025-01-01 10:15")]
+    first = result.iloc[0]
+    assert (first["10"], first["50"], first["90"]) == pytest.approx((68.0, 60.0, 52.0))
+    assert first["Max"] == 70.0  # Lmax falls back to the Leq where Max is missing
+
+
+def test_noise_ignores_samples_without_eq_and_splits_locations():
+    frame = readings_frame(NOISE_QUALITY_HEADERS, [
+        ("ML-01", "2025-01-01 10:00", {"EQ": 60.0}),
+        ("ML-01", "2025-01-01 10:05", {"Max": 99.0}),
+        ("ML-02", "2025-01-01 10:00", {"EQ": 50.0}),
+    ])
+
+    result = aggregate_noise(frame, "15 mins").set_index("location")
+
+    assert result.loc["ML-01", "EQ"] == pytest.approx(60.0)
+    assert result.loc["ML-01", "Max"] == 60.0
+    assert result.loc["ML-02", "EQ"] == pytest.approx(50.0)
+
+
+def test_air_average_is_time_weighted():
+    frame = readings_frame(AIR_QUALITY_HEADERS, [
+        ("ML-01", "2025-01-01 10:00", {"CO": 100.0}),
+        ("ML-01", "2025-01-01 10:10", {"CO": 400.0}),  # Followed by 5 minutes, not 10
+        ("ML-01", "2025-01-01 10:15", {"CO": 100.0}),
+    ])
+
+    result = aggregate_air(frame, "30 mins")
+
+    # Durations 10, 5 and the median spacing (7.5) minutes
+    assert result.iloc[0]["CO"] == pytest.approx((100 * 10 + 400 * 5 + 100 * 7.5) / 22.5)
+    assert np.isnan(result.iloc[0]["O3"])
@@ -0,0 +1,67 @@
+import copy
+import json
+import os
+
+import pytest
+
+from monitoring.batchReport import SUMMARY_FILENAME, _job_report_path, load_batch_jobs, run_batch
+
+
+def test_job_report_path_stays_in_job_folder(tmp_path):
+    output_dir = str(tmp_path / "out")
+
+    assert _job_report_path(output_dir, "PR1", "report.docx") == os.path.join(
+        os.path.realpath(output_dir), "PR1", "report.docx")
+
+
+@pytest.mark.parametrize("filename", ["../report.docx", "../PR2/report.docx", "sub/report.docx", "/tmp/report.docx"])
+def test_job_report_path_rejects_names_outside_job_folder(tmp_path, filename):
+    with pytest.raises(ValueError, match="outside the job folder"):
+        _job_report_path(str(tmp_path / "out"), "PR1", filename)
+
+
+def test_job_report_path_rejects_symlink_escape(tmp_path):
+    (tmp_path / "out" / "PR1").mkdir(parents=True)
+    (tmp_path / "out" / "PR1" / "report.docx").symlink_to(tmp_path / "elsewhere.docx")
+
+    with pytest.raises(ValueError):
+        _job_report_path(str(tmp_path / "out"), "PR1", "report.docx")
+
+
+def test_manifest_jobs_get_unique_ids_and_resolved_paths(tmp_path):
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps([
+        {"id": "PR 1", "format": "pdf", "placeholders": {"monitoring_location_map": "maps/site.png"}},
+        {"id": "PR 1", "placeholders": {"monitoring_location_images": {"ML-01": "ml01.png"}}},
+    ]), encoding="utf-8")
+
+    first, second = load_batch_jobs(str(manifest))
+
+    assert (first["id"], second["id"]) == ("PR_1", "PR_1_2")
+    assert first["format"] == "pdf"
+    assert first["placeholders"]["monitoring_location_map"] == str(tmp_path / "maps" / "site.png")
+    assert second["placeholders"]["monitoring_location_images"] == {"ML-01": str(tmp_path / "ml01.png")}
+
+
+def test_run_batch_writes_summary(tmp_path, monkeypatch):
+    from monitoring import monitoringReport
+
+    monkeypatch.setitem(monitoringReport.CONSTANTS, "cache_dir", str(tmp_path / "cache"))
+    placeholders = copy.deepcopy(monitoringReport.SAMPLE_PLACEHOLDERS)
+    jobs = [{"id": "good", "placeholders": placeholders},
+            {"id": "bad", "type": "unknown", "placeholders": placeholders}]
+    output_dir = tmp_path / "out"
+
+    summary = run_batch(jobs, str(output_dir), max_workers=2)
+
+    with open(output_dir / SUMMARY_FILENAME, encoding="utf-8") as file:
+        assert json.load(file) == summary
+    assert (summary["reports"], summary["succeeded"], summary["failed"], summary["workers"]) == (2, 1, 1, 2)
+
+    bad, good = summary["results"]  # Sorted by job id
+    assert bad["id"] == "bad" and bad["path"] is None and "unknown" in bad["error"]
+    assert good["error"] is None
+    assert os.path.dirname(good["path"]) == os.path.realpath(output_dir / "good")
+    assert os.path.exists(good["path"])
+    assert good["package"]["media_parts"] > 0
+    assert summary["mean_report_seconds"] == summary["max_report_seconds"] == good["seconds"]
@@ -0,0 +1,86 @@
+import pandas as pd
+import pytest
+
+from monitoring.bulkUpload import match_columns, validate_readings
+
+
+AIR_HEADER = ["Location", "Date and Time", "CO (μg/m3)", "O3", "NO2", "SO2", "PM2.5", "PM10"]
+
+
+def upload_frame(rows, header=AIR_HEADER, decimal_comma=False):
+    """An upload chunk as `iter_upload_chunks` yields it: every cell as stripped text."""
+    frame = pd.DataFrame(rows, columns=header, dtype=str)
+    frame.attrs["decimal_comma"] = decimal_comma
+    return frame
+
+
+def test_match_columns_accepts_aliases_and_units():
+    columns = match_columns(AIR_HEADER, "air")
+
+    assert columns["Monitoring Location"] == "Location"
+    assert columns["Time"] == "Date and Time"
+    assert columns["CO"] == "CO (μg/m3)"
+
+
+def test_match_columns_requires_every_schema_column():
+    with pytest.raises(ValueError, match="PM10"):
+        match_columns(AIR_HEADER[:-1], "air")
+
+
+def test_valid_rows_are_normalised():
+    frame = upload_frame([
+        ["ML-01", "01/02/2025 10:00", "1000", "50", "-", "n/a", "15", "120"],
+        ["ML-02", "2025-02-01 10:30:15", "900", "", "", "", "", ""],
+    ])
+
+    rows, errors, row_numbers = validate_readings(frame, "air")
+
+    assert errors == []
+    assert rows == [["ML-01", "01/02/2025 10:00", "1000", "50", "", "", "15", "120"],
+                    ["ML-02", "01/02/2025 10:30:15", "900", "", "", "", "", ""]]
+    assert row_numbers == [2, 3]
+
+
+def test_invalid_cells_are_reported_with_spreadsheet_rows():
+    frame = upload_frame([
+        ["ML-01", "01/02/2025 10:00", "1000", "50", "60", "70", "15", "120"],
+        ["", "01/02/2025 10:15", "1000", "", "", "", "", ""],
+        ["ML-01", "someday", "1000", "", "", "", "", ""],
+        ["ML-01", "01/02/2025 10:45", "lots", "", "", "", "", ""],
+        ["ML-01", "01/02/2025 11:00", "-5", "", "", "", "", ""],
+        ["ML-01", "01/02/2025 11:15", "", "", "", "", "", ""],
+        ["", "", "", "", "", "", "", ""],  # Blank line: skipped silently
+    ])
+
+    rows, errors, row_numbers = validate_readings(frame, "air", first_row=10)
+
+    assert row_numbers == [10]
+    assert len(rows) == 1
+    assert sorted((row, column, message) for row, column, _, message in errors) == [
+        (11, "Monitoring Location", "missing location"),
+        (12, "Time", "unreadable timestamp (use DD/MM/YYYY HH:MM)"),
+        (13, "CO", "not a number"),
+        (14, "CO", "outside the range 0 to 100000"),
+        (15, "", "no measurements"),
+    ]
+
+
+def test_unknown_locations_are_rejected():
+    frame = upload_frame([
+        ["ML-01", "01/02/2025 10:00", "1000", "", "", "", "", ""],
+        ["ML-09", "01/02/2025 10:00", "1000", "", "", "", "", ""],
+    ])
+
+    rows, errors, _ = validate_readings(frame, "air", known_locations={"ML-01"})
+
+    assert [row[0] for row in rows] == ["ML-01"]
+    assert [(error[0], error[2]) for error in errors] == [(3, "ML-09")]
+
+
+def test_decimal_comma():
+    frame = upload_frame([["ML-01", "01/02/2025 10:00", "1000,5", "", "", "", "", ""]], decimal_comma=True)
+
+    rows, errors, _ = validate_readings(frame, "air")
+
+    assert errors == []
+    assert rows[0][2] == "1000.5"
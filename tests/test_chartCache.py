@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from monitoring.chartCache import DiskCache, chart_cache_key, get_chart_cache, get_disk_cache
+
+
+def test_hit_and_miss(tmp_path):
+    cache = DiskCache(str(tmp_path))
+
+    assert cache.get("a") is None
+    cache.put("a", b"png bytes")
+
+    assert cache.get("a") == b"png bytes"
+    assert cache.stats() == {"hits": 1, "misses": 1}
+    cache.reset_stats()
+    assert cache.stats() == {"hits": 0, "misses": 0}
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=350)
+    for index, key in enumerate(["a", "b", "c"]):
+        cache.put(key, bytes(100))
+        os.utime(tmp_path / f"{key}.png", (1000 + index, 1000 + index))
+
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") is not None
+    cache.put("d", bytes(100))
+
+    assert sorted(os.listdir(tmp_path)) == ["a.png", "c.png", "d.png"]
+
+
+def test_eviction_only_touches_its_own_suffix(tmp_path):
+    (tmp_path / "notes.txt").write_bytes(bytes(1000))
+    cache = DiskCache(str(tmp_path), max_bytes=150, suffix=".json")
+
+    cache.put("a", bytes(100))
+    cache.put("b", bytes(100))
+
+    assert (tmp_path / "notes.txt").exists()
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".json")]) == 1
+
+
+def test_instances_are_keyed_on_settings(tmp_path):
+    constants = {"cache_dir": str(tmp_path), "chart_cache_max_mb": 1}
+    cache = get_chart_cache(constants)
+
+    assert get_chart_cache(dict(constants)) is cache
+    assert cache.cache_dir == str(tmp_path / "charts")
+    assert get_chart_cache({**constants, "chart_cache_max_mb": 2}).max_bytes == 2 * 1024 * 1024
+    assert get_chart_cache({**constants, "cache_dir": str(tmp_path / "other")}) is not cache
+    assert get_chart_cache({**constants, "chart_cache_max_mb": 0}) is None
+    assert get_disk_cache(str(tmp_path / "charts"), 1, suffix=".json") is not cache
+
+
+@pytest.mark.parametrize("change", [{"spec": {"title": "PM2.5"}}, {"profile": {"dpi": 150}}, {"style_version": 4}])
+def test_chart_key_covers_spec_profile_and_style(change):
+    arguments = {"spec": {"title": "PM10"}, "profile": {"dpi": 300}, "style_version": 3}
+
+    assert chart_cache_key(**arguments) == chart_cache_key(**dict(arguments))
+    assert chart_cache_key(**{**arguments, **change}) != chart_cache_key(**arguments)
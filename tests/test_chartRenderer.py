@@ -0,0 +1,63 @@
+import io
+
+import pytest
+from PIL import Image
+
+from monitoring.chartCache import DiskCache
+from monitoring.chartRenderer import (DEFAULT_CHART_PROFILE, render_chart, render_charts, resolve_chart_profile,
+                                      shutdown_chart_executor)
+
+
+PROFILE = {"dpi": 50, "width": 4, "height": 3, "display_width": 3}
+
+
+def chart_spec(pollutant, values=(10.0, 20.0)):
+    return {"monitoring_type": "Ambient Air Quality", "pollutant": pollutant, "locations": ["ML-01", "ML-02"],
+            "values": list(values), "standard": 15.0, "standard_label": "NCEC", "y_axis_label": "μg/m³"}
+
+
+def test_resolve_chart_profile(capsys):
+    constants = {"chart_profile": "draft", "chart_profiles": {"draft": {"dpi": 100}}}
+
+    assert resolve_chart_profile(constants) == dict(DEFAULT_CHART_PROFILE, dpi=100)
+    assert resolve_chart_profile(constants, "missing") == DEFAULT_CHART_PROFILE
+    assert "Chart profile 'missing' not found" in capsys.readouterr().out
+
+
+def test_render_chart_scales_with_profile_dpi():
+    def size(profile):
+        with Image.open(io.BytesIO(render_chart(chart_spec("CO"), profile))) as img:
+            assert img.format == "PNG"
+            return img.size
+
+    width, height = size(PROFILE)
+    double_width, double_height = size(dict(PROFILE, dpi=100))
+
+    assert double_width == pytest.approx(2 * width, rel=0.05)
+    assert double_height == pytest.approx(2 * height, rel=0.05)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_render_charts_keeps_spec_order(max_workers):
+    specs = [chart_spec(pollutant) for pollutant in ("CO", "O3", "NO2")]
+
+    try:
+        charts = render_charts(specs, PROFILE, max_workers=max_workers)
+    finally:
+        shutdown_chart_executor()
+
+    assert charts == [render_chart(spec, PROFILE) for spec in specs]
+
+
+def test_cached_charts_are_not_rendered_again(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path))
+    specs = [chart_spec("CO"), chart_spec("O3")]
+    first = render_charts(specs, PROFILE, max_workers=1, cache=cache)
+
+    rendered = []
+    monkeypatch.setattr("monitoring.chartRenderer._render_uncached",
+                        lambda specs, profile, max_workers: rendered.extend(specs) or [b"new"] * len(specs))
+    changed = chart_spec("O3", values=(10.0, 30.0))
+
+    assert render_charts([specs[0], changed], PROFILE, max_workers=1, cache=cache) == [first[0], b"new"]
+    assert rendered == [changed]
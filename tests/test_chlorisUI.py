@@ -0,0 +1,63 @@
+import copy
+
+import pytest
+
+import chlorisUI
+from chlorisUI import EMPTY_SESSION, TABLE_PAGE_SIZE, build_placeholders, show_table_page, table_page
+
+
+REPORT_DETAILS = ["Contractor", "Project", "PR1", "REF-1", "Weekly", "05 Jan 2025", "1st", "30 mins", ["Air"]]
+
+
+def new_session():
+    """A browser session's state, as gr.State deep-copies it from EMPTY_SESSION."""
+    return copy.deepcopy(EMPTY_SESSION)
+
+
+def test_table_pages():
+    rows = [[str(index)] for index in range(TABLE_PAGE_SIZE * 2 + 1)]
+
+    page_rows, page, label = table_page(rows, 2)
+    assert (page_rows[0], page, label) == (["50"], 2, f"Page 2 of 3 ({len(rows)} row(s))")
+    assert table_page(rows, 99)[1:] == (3, f"Page 3 of 3 ({len(rows)} row(s))")
+    assert table_page(rows, None)[1] == 1
+    assert table_page([], 5) == ([], 1, "Page 1 of 1 (0 row(s))")
+
+
+def test_sessions_do_not_share_data():
+    first, second = new_session(), new_session()
+    first["monitoring_data"].append(["ML-01", "Gate", "26.6", "36.2"])
+    first["location_images"]["ML-01"] = "ml01.png"
+
+    assert show_table_page("locations", first, 1)[0] == [["ML-01", "Gate", "26.6", "36.2"]]
+    assert show_table_page("locations", second, 1)[0] == []
+    assert second["location_images"] == {} and EMPTY_SESSION["location_images"] == {}
+
+
+def test_placeholders_are_a_snapshot_of_the_session():
+    session = new_session()
+    session["monitoring_data"].append(["ML-01", "Gate", "26.6", "36.2"])
+    session["location_images"]["ML-01"] = "ml01.png"
+
+    placeholders = build_placeholders(session, *REPORT_DETAILS)
+    session["monitoring_data"].append(["ML-02", "Camp", "26.7", "36.3"])
+    session["location_images"]["ML-02"] = "ml02.png"
+
+    assert placeholders["report_parameters"] == "Air"
+    assert placeholders["monitoring_locations"][1:] == [["ML-01", "Gate", "26.6", "36.2"]]
+    assert placeholders["monitoring_location_images"] == {"ML-01": "ml01.png"}
+    assert build_placeholders(session, *REPORT_DETAILS[:-1], [])["report_parameters"] == "None"
+
+
+def test_readings_are_checked_against_session_locations():
+    pytest.importorskip("gradio")
+    session = new_session()
+    session["monitoring_data"].append(["ML-01", "Gate", "26.6", "36.2"])
+
+    chlorisUI.add_air_data(session, "ML-01", "01/02/2025 10:00", "1000", "", "", "", "", "")
+    result = chlorisUI.add_air_data(session, "ML-09", "01/02/2025 10:00", "1000", "", "", "", "", "")
+    duplicate = chlorisUI.add_air_data(session, "ML-01", "01/02/2025 10:00", "900", "", "", "", "", "")
+
+    assert [row[0] for row in session["air_data"]] == ["ML-01"]
+    assert result[4].startswith("⚠") and "ML-09" in result[4]
+    assert "exists" in duplicate[4]
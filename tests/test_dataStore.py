@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from monitoring.dataStore import MonitoringStore
+from monitoring.reportPlan import AIR_QUALITY_HEADERS
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = MonitoringStore(str(tmp_path / "store.sqlite3"))
+    timestamps = pd.date_range("2025-01-01", periods=48, freq="1h")
+    frames = []
+    for offset, location in enumerate(["ML-01", "ML-02"]):
+        frame = pd.DataFrame({name: np.nan for name in AIR_QUALITY_HEADERS[2:]}, index=range(len(timestamps)))
+        frame["CO"] = np.arange(len(timestamps), dtype=np.float64) + 100 * offset
+        frame["PM10"] = 50.0
+        frame.loc[::2, "PM10"] = np.nan  # Missing values are not stored
+        frame.insert(0, "timestamp", timestamps)
+        frame.insert(0, "location", location)
+        frames.append(frame)
+    store.insert_readings("PR-1", "air", pd.concat(frames, ignore_index=True))
+    return store
+
+
+def test_range_is_half_open(store):
+    frame = store.query_readings("PR-1", "air", start="2025-01-01 10:00", end="2025-01-01 12:00")
+
+    assert frame["timestamp"].tolist() == [pd.Timestamp("2025-01-01 10:00"), pd.Timestamp("2025-01-01 11:00")] * 2
+    assert frame["location"].tolist() == ["ML-01", "ML-01", "ML-02", "ML-02"]
+    assert frame["CO"].tolist() == [10.0, 11.0, 110.0, 111.0]
+
+
+def test_open_ended_ranges(store):
+    assert len(store.query_readings("PR-1", "air", start="2025-01-02 23:00")) == 2
+    assert len(store.query_readings("PR-1", "air", end="2025-01-01 01:00")) == 2
+    assert len(store.query_readings("PR-1", "air")) == 96
+
+
+def test_location_and_parameter_filters(store):
+    frame = store.query_readings("PR-1", "air", start="2025-01-01", end="2025-01-01 04:00", locations=["ML-02"],
+                                 parameters=["PM10"])
+
+    assert list(frame.columns) == ["location", "timestamp", "PM10"]
+    assert frame["location"].unique().tolist() == ["ML-02"]
+    # Only timestamps with a stored PM10 value come back
+    assert frame["timestamp"].dt.hour.tolist() == [1, 3]
+    assert frame["PM10"].tolist() == [50.0, 50.0]
+
+
+def test_empty_results(store):
+    assert store.query_readings("PR-1", "air", start="2026-01-01").empty
+    assert store.query_readings("PR-unknown", "air").empty
+    assert store.query_readings("PR-1", "noise").empty
+
+
+def test_reimport_replaces_readings(store):
+    frame = pd.DataFrame({"location": ["ML-01"], "timestamp": [pd.Timestamp("2025-01-01 10:00")], "CO": [999.0]})
+    store.insert_readings("PR-1", "air", frame)
+
+    result = store.query_readings("PR-1", "air", start="2025-01-01 10:00", end="2025-01-01 11:00",
+                                  locations=["ML-01"])
+
+    assert result["CO"].tolist() == [999.0]
+    assert store.time_range("PR-1", "air") == (pd.Timestamp("2025-01-01"), pd.Timestamp("2025-01-02 23:00"))
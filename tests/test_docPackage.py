@@ -0,0 +1,84 @@
+import io
+import zipfile
+
+import docx
+from docx.image.image import Image as DocxImage
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.opc.packuri import PackURI
+from docx.parts.image import ImagePart
+from PIL import Image
+
+from monitoring.docPackage import deduplicate_media, package_size_report
+
+
+BLIP = "{http://schemas.openxmlformats.org/drawingml/2006/main}blip"
+EMBED = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
+
+
+def png_bytes(color):
+    buffer = io.BytesIO()
+    Image.new("RGB", (40, 30), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def blip_ids(document):
+    return [blip.get(EMBED) for blip in document.element.body.iter(BLIP)]
+
+
+def document_with_duplicate():
+    """Two pictures of the same image stored as two parts, as restored fragments can leave them, and one other."""
+    document = docx.Document()
+    blob = png_bytes((200, 30, 30))
+    document.add_picture(io.BytesIO(blob))
+    document.add_picture(io.BytesIO(blob))
+    document.add_picture(io.BytesIO(png_bytes((30, 30, 200))))
+
+    copy = ImagePart.from_image(DocxImage.from_blob(blob), PackURI("/word/media/copy.png"))
+    copy_id = document.part.relate_to(copy, RT.IMAGE)
+    list(document.element.body.iter(BLIP))[1].set(EMBED, copy_id)
+    return document
+
+
+def saved_media(document, path):
+    document.save(path)
+    with zipfile.ZipFile(path) as package:
+        return sorted(name for name in package.namelist() if name.startswith("word/media/"))
+
+
+def test_duplicate_image_parts_are_merged(tmp_path):
+    document = document_with_duplicate()
+    first, second, other = blip_ids(document)
+    assert first != second
+
+    assert deduplicate_media(document) == 1
+
+    assert blip_ids(document) == [first, first, other]
+    assert len(saved_media(document, tmp_path / "report.docx")) == 2
+    # The saved package opens with every picture still resolving to an image
+    reopened = docx.Document(str(tmp_path / "report.docx"))
+    assert all(reopened.part.related_parts[rId].blob.startswith(b"\x89PNG") for rId in blip_ids(reopened))
+
+
+def test_distinct_images_are_kept(tmp_path):
+    document = docx.Document()
+    document.add_picture(io.BytesIO(png_bytes((200, 30, 30))))
+    document.add_picture(io.BytesIO(png_bytes((30, 30, 200))))
+    ids = blip_ids(document)
+
+    assert deduplicate_media(document) == 0
+    assert blip_ids(document) == ids
+    assert len(saved_media(document, tmp_path / "report.docx")) == 2
+
+
+def test_package_size_report(tmp_path):
+    document = document_with_duplicate()
+    deduplicate_media(document)
+    path = tmp_path / "report.docx"
+    document.save(path)
+
+    report = package_size_report(str(path))
+
+    assert report["media_parts"] == 2
+    assert set(report["media_formats"]) == {"png"}
+    assert report["media_bytes"] == sum(size for _, size in report["largest_media"])
+    assert report["media_bytes"] + report["xml_bytes"] + report["other_bytes"] < report["total_bytes"]
@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from monitoring.exceedance import (AirStandard, ExceedanceResult, NoiseStandard, _evaluate_frame, averaging_window,
+                                   conclusion_verdict, parse_allowed_exceedances, parse_standards)
+from monitoring.reportPlan import AIR_QUALITY_HEADERS, NOISE_QUALITY_HEADERS
+
+
+DAY_HOURS = [7, 20]
+VERDICT = "All parameters adhered to the national standards."
+
+
+def readings_frame(headers, start, periods, freq, location="ML-01", **columns):
+    """Typed readings frame with every schema column, NaN except for `columns` (name -> value or array)."""
+    frame = pd.DataFrame({name: np.nan for name in headers[2:]}, index=range(periods))
+    for name, values in columns.items():
+        frame[name] = values
+    frame.insert(0, "timestamp", pd.date_range(start, periods=periods, freq=freq))
+    frame.insert(0, "location", location)
+    return frame
+
+
+def air_limits(*standards):
+    return {"air": {standard.pollutant: standard for standard in standards}, "noise": {}}
+
+
+def test_averaging_window():
+    assert averaging_window("1 hour") == ("1 hr", None, False)
+    assert averaging_window("10 mins") == ("10 mins", None, False)
+    assert averaging_window("Daily") == ("24 hr", None, False)
+    assert averaging_window("8 hours (Daily Maximum)") == ("1 hr", pd.Timedelta(hours=8), True)
+    with pytest.raises(ValueError):
+        averaging_window("Annual")
+
+
+def test_short_spike_is_not_a_daily_exceedance():
+    pm10 = np.full(288, 100.0)
+    pm10[100] = 5000.0  # One 5-minute spike
+    frame = readings_frame(AIR_QUALITY_HEADERS, "2025-01-01", 288, "5min", PM10=pm10)
+
+    counts = _evaluate_frame(frame, "air", air_limits(AirStandard("PM10", "Daily", 340)), DAY_HOURS)
+
+    row = counts.iloc[0]
+    assert (row["readings"], row["exceedances"]) == (1, 0)
+    assert row["max_value"] == pytest.approx((287 * 100 + 5000) / 288)
+
+
+def test_daily_mean_counts_once_per_calendar_day():
+    pm10 = np.concatenate([np.full(288, 400.0), np.full(288, 100.0)])
+    frame = readings_frame(AIR_QUALITY_HEADERS, "2025-01-01", 576, "5min", PM10=pm10)
+
+    counts = _evaluate_frame(frame, "air", air_limits(AirStandard("PM10", "Daily", 340)), DAY_HOURS)
+
+    assert counts["period"].tolist() == ["01/01/2025", "02/01/2025"]
+    assert counts["exceedances"].tolist() == [1, 0]
+
+
+def test_one_hour_limit_uses_hourly_means():
+    so2 = np.full(24, 50.0)
+    so2[0:4] = 500.0    # 20 minutes at 500 in the first hour: hourly mean 200, not above 200
+    so2[12:24] = 250.0  # A whole hour above the limit
+    frame = readings_frame(AIR_QUALITY_HEADERS, "2025-01-01", 24, "5min", SO2=so2)
+
+    counts = _evaluate_frame(frame, "air", air_limits(AirStandard("SO2", "1 hour", 200)), DAY_HOURS)
+
+    assert (counts.iloc[0]["readings"], counts.iloc[0]["exceedances"]) == (2, 1)
+
+
+def test_eight_hour_daily_maximum_uses_rolling_means():
+    o3 = np.full(24, 100.0)
+    o3[8:16] = 200.0    # Exactly one 8-hour window averages 200
+    frame = readings_frame(AIR_QUALITY_HEADERS, "2025-01-01", 24, "1h", O3=o3)
+    limits = air_limits(AirStandard("O3", "8 hours (Daily Maximum)", 157))
+
+    counts = _evaluate_frame(frame, "air", limits, DAY_HOURS)
+    assert (counts.iloc[0]["readings"], counts.iloc[0]["exceedances"]) == (1, 1)
+    assert counts.iloc[0]["max_value"] == pytest.approx(200.0)
+
+    o3[8:12] = 100.0    # At most four high hours in any window: 150
+    counts = _evaluate_frame(readings_frame(AIR_QUALITY_HEADERS, "2025-01-01", 24, "1h", O3=o3), "air", limits,
+                             DAY_HOURS)
+    assert counts.iloc[0]["exceedances"] == 0
+
+
+def test_noise_night_is_dated_by_its_evening():
+    eq = np.full(24, 60.0)  # Above the 50 dB(A) night limit, below the 70 dB(A) day limit
+    frame = readings_frame(NOISE_QUALITY_HEADERS, "2025-01-01", 24, "1h", EQ=eq)
+    limits = {"air": {}, "noise": {"EQ": NoiseStandard("NCEC", "Residential", 70, 50)}}
+
+    counts = _evaluate_frame(frame, "noise", limits, DAY_HOURS).set_index("period")
+
+    # 00:00-07:00 closes the night of 31/12; 01/01 has its day and the 20:00-24:00 part of its night
+    assert counts.loc["31/12/2024", ["readings", "exceedances"]].tolist() == [1, 1]
+    assert counts.loc["01/01/2025", ["readings", "exceedances"]].tolist() == [2, 1]
+
+
+def test_parse_allowed_exceedances():
+    assert parse_allowed_exceedances("Twice per year") == 2
+    assert parse_allowed_exceedances("24 times per year") == 24
+    assert parse_allowed_exceedances("25 times per year (over 3 years)") == 25
+    assert parse_allowed_exceedances("-") is None
+
+
+def test_parse_standards_reads_the_configured_column():
+    structure = {"regulatory_standards": {"subsections": {"air": {"table": {"data": [
+        ["Pollutant", "Averaging Time", "Time Weighted Average (μg/m3)", "NCEC", "Number of Allowable Exceedances"],
+        ["SO2", "1 hour", "441", "200", "24 times per year"],
+        ["PM10", "Daily", "340", "-", "-"],
+    ]}}}}}
+
+    standards = parse_standards(structure, "NCEC")
+
+    assert list(standards.air) == [("SO2", "1 hour")]
+    standard = standards.air[("SO2", "1 hour")]
+    assert (standard.limit, standard.allowed_exceedances, standard.source) == (200, 24, "NCEC")
+
+
+def exceedance_result(exceedances, allowed):
+    standard = AirStandard("SO2", "1 hour", 200, allowed, f"{allowed} times per year", "NCEC")
+    counts = pd.DataFrame({"kind": ["air"], "location": ["ML-01"], "period": ["01/01/2025"], "parameter": ["SO2"],
+                           "readings": [24], "exceedances": [exceedances], "max_value": [250.0], "limit": [200.0]})
+    return ExceedanceResult(limits=air_limits(standard), counts=counts)
+
+
+def test_verdict_without_exceedances_is_the_compliance_statement():
+    assert conclusion_verdict(exceedance_result(0, 24), VERDICT) == VERDICT
+    assert conclusion_verdict(None, VERDICT) == VERDICT
+
+
+def test_verdict_stays_compliant_within_the_allowance():
+    result = exceedance_result(3, 24)
+
+    verdict = conclusion_verdict(result, VERDICT)
+
+    assert result.compliant
+    assert verdict.startswith(VERDICT)
+    assert "SO2 at ML-01 exceeded the NCEC 1 hour limit of 200 μg/m³ in 3 of 24 averaging period(s)" in verdict
+
+
+def test_verdict_lists_exceedances_beyond_the_allowance():
+    result = exceedance_result(3, 2)
+
+    verdict = conclusion_verdict(result, VERDICT)
+
+    assert not result.compliant
+    assert not verdict.startswith(VERDICT)
+    assert "exceeded the national standards" in verdict
+    assert "allowable exceedances: 2 times per year" in verdict
@@ -0,0 +1,56 @@
+import os
+
+from PIL import Image
+
+from monitoring.imagePipeline import get_image_cache, prepare_image
+
+
+def write_image(path, size=(800, 600), mode="RGB", color=(120, 160, 90)):
+    Image.new(mode, size, color).save(path)
+    return str(path)
+
+
+def image_constants(tmp_path, max_mb=1):
+    return {"cache_dir": str(tmp_path / "cache"), "image_cache_max_mb": max_mb, "image_dpi": 100}
+
+
+def test_prepared_image_is_downsampled_and_cached(tmp_path):
+    constants = image_constants(tmp_path)
+    source = write_image(tmp_path / "photo.png")
+
+    prepared = prepare_image(source, 2, constants, "photo")
+    cache = get_image_cache(constants)
+
+    assert os.path.dirname(prepared) == cache.cache_dir
+    assert prepared.endswith(".jpg")  # "auto" photos without transparency become JPEG
+    with Image.open(prepared) as img:
+        assert img.size == (200, 150)
+
+    cache.reset_stats()
+    assert prepare_image(source, 2, constants, "photo") == prepared
+    assert prepare_image(source, 3, constants, "photo") != prepared
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_transparent_images_stay_png(tmp_path):
+    source = write_image(tmp_path / "logo.png", mode="RGBA", color=(0, 0, 0, 0))
+
+    assert prepare_image(source, 1, image_constants(tmp_path), "logo").endswith(".png")
+
+
+def test_image_cache_is_size_bounded(tmp_path):
+    constants = image_constants(tmp_path)
+    cache = get_image_cache(constants)
+    cache.max_bytes = 1  # Only the entry just written is kept
+
+    first = prepare_image(write_image(tmp_path / "a.png", color=(1, 2, 3)), 2, constants, "photo")
+    second = prepare_image(write_image(tmp_path / "b.png", color=(4, 5, 6)), 2, constants, "photo")
+
+    assert not os.path.exists(first)
+    assert os.path.exists(second)
+
+
+def test_disabled_cache_returns_original(tmp_path):
+    source = write_image(tmp_path / "photo.png")
+
+    assert prepare_image(source, 2, image_constants(tmp_path, max_mb=0), "photo") == source
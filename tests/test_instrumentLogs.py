@@ -0,0 +1,159 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from monitoring.dataStore import MonitoringStore
+from monitoring.instrumentLogs import _TimestampParser, import_logs, iter_readings
+from monitoring.locations import LocationIndex
+
+
+def write_log(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_import_logs_streams_chunks_into_the_store(tmp_path):
+    lines = ["Date,Time,LAeq,LAFmax"] + [f"01/01/2025,10:{minute:02d}:00,{50 + minute},{60 + minute}"
+                                       for minute in range(25)]
+    path = write_log(tmp_path / "pulsar.csv", lines + ["01/01/2025,garbage,1,2"])
+    store = MonitoringStore(str(tmp_path / "store.sqlite3"))
+
+    results = import_logs(store, "PR-1", "noise", [(path, "ML-01")], chunk_size=10)
+
+    assert results == {path: {"values": 50, "rows": 25, "skipped": 1, "unsnapped": 0}}
+    frame = store.query_readings("PR-1", "noise")
+    assert len(frame) == 25
+    assert frame["location"].unique().tolist() == ["ML-01"]
+    assert frame["timestamp"].iloc[-1] == pd.Timestamp("2025-01-01 10:24")
+    assert frame["EQ"].tolist() == [50.0 + minute for minute in range(25)]
+
+
+def test_preamble_before_the_header_is_skipped(tmp_path):
+    path = write_log(tmp_path / "pulsar45.csv", [
+        "Pulsar Instruments - Model 45",
+        "Serial Number,P45-1234",
+        "",
+        "Start Time,01/01/2025 10:00",  # Metadata that looks like a time column but has no measurements
+        "Date,Time,LAeq (dB),LAFmax (dB),LAE (dB),LA10 (dB),LA50 (dB),LA90 (dB)",
+        "01/01/2025,10:00:00,55.1,70.2,84.9,58.0,54.0,50.0",
+    ])
+
+    readings = list(iter_readings(path, "noise", "ML-01"))
+
+    assert readings == [("ML-01", datetime(2025, 1, 1, 10), (55.1, 70.2, 84.9, 58.0, 54.0, 50.0))]
+
+
+def test_pulsar_aliases_and_column_order(tmp_path):
+    path = write_log(tmp_path / "pulsar105.csv", [
+        "Time Stamp,Site,L90,LZeq,Lmax,SEL,Battery",
+        "2025-01-01 10:00:00,ML-02,48.5,60.0,75.5,89.8,98%",
+    ])
+
+    assert list(iter_readings(path, "noise")) == [
+        ("ML-02", datetime(2025, 1, 1, 10), (60.0, 75.5, 89.8, None, None, 48.5))]
+
+
+def test_ptm600_aliases_with_units(tmp_path):
+    path = write_log(tmp_path / "ptm600.csv", [
+        "Date/Time,Location,CO [ug/m3],Ozone (ug/m3),NO2 (ug/m3),SO2 (ug/m3),PM2_5 (ug/m3),PM10 (ug/m3),Temp (C)",
+        "01/01/2025 10:00,ML-01,1000,40,30,20,15,45,31.2",
+    ])
+
+    assert list(iter_readings(path, "air")) == [
+        ("ML-01", datetime(2025, 1, 1, 10), (1000.0, 40.0, 30.0, 20.0, 15.0, 45.0))]
+
+
+def test_semicolon_exports_use_decimal_commas(tmp_path):
+    path = write_log(tmp_path / "export.csv", ["Date;Time;LAeq;LAFmax", "01/01/2025;10:00;55,5;70,25"])
+
+    assert list(iter_readings(path, "noise", "ML-01"))[0][2][:2] == (55.5, 70.25)
+
+
+def test_missing_channels_are_none(tmp_path, capsys):
+    path = write_log(tmp_path / "export.csv", [
+        "Date/Time,CO,PM10",
+        "01/01/2025 10:00,1000,n/a",
+        "01/01/2025 10:15,-,45",
+    ])
+
+    readings = list(iter_readings(path, "air", "ML-01"))
+
+    assert [values for _, _, values in readings] == [(1000.0, None, None, None, None, None),
+                                                    (None, None, None, None, None, 45.0)]
+    assert "has no column for O3, NO2, SO2, PM2.5" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("text", [
+    "01/02/2025 10:30:15", "2025-02-01 10:30:15", "2025-02-01T10:30:15", "01-02-2025 10:30:15",
+    "01.02.2025 10:30:15", "2025/02/01 10:30:15",
+])
+def test_timestamp_formats(tmp_path, text):
+    path = write_log(tmp_path / "export.csv", ["Timestamp,LAeq", f"{text},55"])
+
+    assert list(iter_readings(path, "noise", "ML-01"))[0][1] == datetime(2025, 2, 1, 10, 30, 15)  # Day first
+
+
+@pytest.mark.parametrize("text", ["01/02/2025 10:30", "2025-02-01 10:30"])
+def test_timestamps_without_seconds(tmp_path, text):
+    path = write_log(tmp_path / "export.csv", ["Timestamp,LAeq", f"{text},55"])
+
+    assert list(iter_readings(path, "noise", "ML-01"))[0][1] == datetime(2025, 2, 1, 10, 30)
+
+
+def test_month_first_timestamps_are_read_when_day_first_fails():
+    parse = _TimestampParser()
+
+    assert parse("12/31/2025 10:30:00") == datetime(2025, 12, 31, 10, 30)
+
+
+def test_unreadable_lines_are_skipped_and_counted(tmp_path, capsys):
+    path = write_log(tmp_path / "export.csv", [
+        "Date,Time,LAeq",
+        "01/01/2025,10:00,55",
+        "01/01/2025,sometime,55",   # Unreadable timestamp
+        "01/01/2025,10:02,loud",    # Unreadable value
+        "01/01/2025",               # Truncated line
+        "01/01/2025,10:04,-",       # No measurement
+        ",,",                       # Blank line: not counted
+        "01/01/2025,10:05,56",
+    ])
+    stats = {}
+
+    readings = list(iter_readings(path, "noise", "ML-01", stats))
+
+    assert [timestamp.minute for _, timestamp, _ in readings] == [0, 5]
+    assert stats == {"rows": 2, "skipped": 4, "unsnapped": 0}
+    assert "Skipped 4 unreadable line(s)" in capsys.readouterr().out
+
+
+def test_gps_fixes_beyond_the_snap_distance_are_not_assigned(tmp_path, capsys):
+    locations = LocationIndex(["ML-01", "ML-02"], [26.6362, 26.6500], [36.2245, 36.2245])
+    path = write_log(tmp_path / "gps.csv", [
+        "Date/Time,Latitude,Longitude,LAeq",
+        "01/01/2025 10:00,26.6363,36.2245,55",  # ~11 m from ML-01
+        "01/01/2025 10:01,26.6490,36.2245,56",  # ~110 m from ML-02
+        "01/01/2025 10:02,26.6431,36.2345,57",  # Over 1 km from both
+    ])
+    stats = {}
+
+    readings = list(iter_readings(path, "noise", stats=stats, locations=locations, max_snap_distance_m=200))
+
+    assert [location for location, _, _ in readings] == ["ML-01", "ML-02"]
+    assert stats["unsnapped"] == 1
+    assert "more than 200 m from every monitoring location" in capsys.readouterr().out
+
+    # With a fallback location, fixes that don't snap keep it; a tighter distance drops ML-02's fix too
+    fallback = list(iter_readings(path, "noise", "ML-09", locations=locations, max_snap_distance_m=50))
+    assert [location for location, _, _ in fallback] == ["ML-01", "ML-09", "ML-09"]
+
+
+def test_files_without_a_header_or_location_are_skipped(tmp_path, capsys):
+    no_header = write_log(tmp_path / "notes.csv", ["just,some,text"])
+    no_location = write_log(tmp_path / "export.csv", ["Date/Time,LAeq", "01/01/2025 10:00,55"])
+
+    assert list(iter_readings(no_header, "noise", "ML-01")) == []
+    assert list(iter_readings(no_location, "noise")) == []
+    output = capsys.readouterr().out
+    assert "No noise header row found" in output
+    assert "No monitoring location given" in output
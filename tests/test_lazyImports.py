@@ -0,0 +1,45 @@
+import json
+import os
+import subprocess
+import sys
+
+from monitoring.monitoringReport import PROJECT_DIR, load_constants
+
+
+HEAVY_MODULES = ("docx", "matplotlib", "pandas", "numpy", "PIL", "reportlab", "gradio")
+
+
+def modules_after_import(statement, cwd):
+    """Heavy modules a fresh interpreter has loaded after running `statement`."""
+    code = (f"import json, sys; {statement}; "
+            f"print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))")
+    env = dict(os.environ, PYTHONPATH=PROJECT_DIR)
+    output = subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, capture_output=True, text=True,
+                            check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_report_modules_import_without_heavy_dependencies(tmp_path):
+    # From another working directory too: the config resolves against the package
+    assert modules_after_import("import monitoring.monitoringReport, chlorisUI", str(tmp_path)) == []
+
+
+def test_preload_loads_report_dependencies(tmp_path):
+    loaded = modules_after_import(
+        "from monitoring.monitoringReport import preload_report_dependencies; preload_report_dependencies()",
+        str(tmp_path))
+
+    assert {"docx", "matplotlib", "pandas", "PIL"} <= set(loaded)
+    assert "gradio" not in loaded
+
+
+def test_relative_config_paths_resolve_against_project(tmp_path):
+    config = tmp_path / "constants.json"
+    config.write_text(json.dumps({"structure_file": "monitoring/config/structure.json", "cache_dir": "/var/cache",
+                                  "output_dir": "generated_reports"}), encoding="utf-8")
+
+    constants = load_constants(str(config))
+
+    assert constants["structure_file"] == os.path.join(PROJECT_DIR, "monitoring", "config", "structure.json")
+    assert constants["cache_dir"] == "/var/cache"
+    assert constants["output_dir"] == "generated_reports"
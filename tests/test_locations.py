@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from monitoring.locations import LocationIndex, haversine_m, parse_coordinate, parse_coordinates
+
+
+def test_parse_decimal_coordinates():
+    parsed = parse_coordinates(["26.636180°", "-36.2245", " 50.1 ", "26,5"])
+
+    assert parsed[:3] == pytest.approx([26.63618, -36.2245, 50.1])
+    assert parsed[3] == pytest.approx(26.5)  # Decimal comma
+
+
+def test_parse_degrees_minutes_seconds():
+    parsed = parse_coordinates(['26°38\'10.2"N', "36°13'28.2\"W", "S 26 38 10.2", "E 36.2245", "26:30"])
+
+    assert parsed == pytest.approx([26 + 38 / 60 + 10.2 / 3600, -(36 + 13 / 60 + 28.2 / 3600),
+                                    -(26 + 38 / 60 + 10.2 / 3600), 36.2245, 26.5])
+
+
+@pytest.mark.parametrize("text", ["", "north", "26°61'N", "N 26.5 S", "12.5.3"])
+def test_unreadable_coordinates_are_nan(text):
+    assert np.isnan(parse_coordinates([text])[0])
+
+
+def test_parse_coordinate_raises_when_unreadable():
+    assert parse_coordinate("24.5") == 24.5
+    with pytest.raises(ValueError, match="north"):
+        parse_coordinate("north")
+
+
+def test_haversine():
+    # One degree of latitude is about 111.2 km; antipodal points are half the circumference apart
+    assert haversine_m(0, 0, 1, 0) == pytest.approx(111_195, rel=1e-3)
+    assert haversine_m(0, 0, 0, 180) == pytest.approx(np.pi * 6_371_008.8)
+
+
+def test_from_rows_skips_unreadable_locations():
+    index = LocationIndex.from_rows([
+        ["Monitoring Location", "Description", "Latitude", "Longitude"],
+        ["ML-01", "Gate", "26.6362", "36.2245"],
+        ["ML-02", "Camp", "", "36.2"],
+        ["ML-03", "Yard", "95", "36.2"],
+    ])
+
+    assert index.names == ["ML-01"]
+    assert index.descriptions == ["Gate"]
+
+
+def test_from_rows_requires_coordinate_columns():
+    with pytest.raises(ValueError, match="Latitude"):
+        LocationIndex.from_rows([["Monitoring Location", "Longitude"], ["ML-01", "36.2"]])
+
+
+def test_snap_to_nearest_location_within_distance():
+    index = LocationIndex(["ML-01", "ML-02"], [26.6362, 26.6500], [36.2245, 36.2245])
+
+    # ~11 m north of ML-01, ~110 m south of ML-02, over 1 km from both, and an unreadable fix
+    snapped = index.snap([26.6363, 26.6490, 26.6431, np.nan], [36.2245, 36.2245, 36.2345, 36.2245])
+
+    assert snapped == ["ML-01", "ML-02", None, None]
+
+
+def test_nearest_reports_distances():
+    index = LocationIndex(["ML-01", "ML-02"], [0.0, 0.0], [0.0, 1.0])
+
+    indices, distances = index.nearest([0.0, 0.0], [0.1, 0.9])
+
+    assert indices.tolist() == [0, 1]
+    assert distances == pytest.approx([haversine_m(0, 0, 0, 0.1)] * 2)
+
+
+def test_nearest_without_locations_raises():
+    with pytest.raises(ValueError):
+        LocationIndex([], [], []).nearest([0.0], [0.0])
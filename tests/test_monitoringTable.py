@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from monitoring.monitoringTable import MonitoringTable, as_monitoring_table, parse_times
+from monitoring.reportPlan import AIR_QUALITY_HEADERS, NOISE_QUALITY_HEADERS
+
+
+AIR_ROWS = [
+    list(AIR_QUALITY_HEADERS),
+    ["ML-01", "30/12/2024 09:37", "1016.4", "51", "-", "", "14.3", "120.9"],
+    ["ML-02", "2024-12-30 10:22", "1253.3", "37.0", "64.2", "99.8", "n/a", "131.3"],
+]
+
+
+def test_from_rows_builds_typed_columns():
+    table = MonitoringTable.from_rows(AIR_ROWS, "air")
+
+    assert len(table) == 2
+    assert table.parameters == AIR_QUALITY_HEADERS[2:]
+    assert list(table.location) == ["ML-01", "ML-02"]
+    assert table.timestamp.tolist() == [pd.Timestamp("2024-12-30 09:37").value, pd.Timestamp("2024-12-30 10:22").value]
+    assert table.columns["CO"].dtype == np.float32
+    assert table.columns["CO"] == pytest.approx([1016.4, 1253.3])
+    assert np.isnan(table.columns["NO2"][0]) and np.isnan(table.columns["SO2"][0])
+    assert np.isnan(table.columns["PM2.5"][1])
+
+
+def test_entered_rows_are_displayed_unchanged():
+    assert MonitoringTable.from_rows(AIR_ROWS, "air").rows() is AIR_ROWS
+
+
+def test_columns_are_matched_by_header():
+    header = ["Time", "Monitoring Location", "EQ", "Max", "AE", "90", "50", "10"]
+    table = MonitoringTable.from_rows([header, ["30/12/2024 09:37", "ML-01", "61.3", "72.3", "93.9", "55.8",
+                                                "60.1", "64.1"]], "noise")
+
+    assert list(table.location) == ["ML-01"]
+    assert table.columns["10"] == pytest.approx([64.1])
+    assert table.columns["90"] == pytest.approx([55.8])
+
+
+def test_missing_columns_raise():
+    with pytest.raises(ValueError, match="PM10"):
+        MonitoringTable.from_rows([list(AIR_QUALITY_HEADERS[:-1])], "air")
+
+
+def test_from_frame_drops_empty_readings_and_formats_rows():
+    frame = pd.DataFrame({"location": ["ML-01", "ML-01", "ML-02"],
+                          "timestamp": pd.to_datetime(["2025-01-01 10:00", "2025-01-01 10:15", "2025-01-01 10:00"])})
+    for name in NOISE_QUALITY_HEADERS[2:]:
+        frame[name] = np.nan
+    frame.loc[[0, 2], "EQ"] = [61.26, 55.04]
+
+    table = MonitoringTable.from_frame(frame, "noise")
+
+    assert len(table) == 2
+    assert table.rows() == [list(NOISE_QUALITY_HEADERS),
+                            ["ML-01", "01/01/2025 10:00", "61.3", "", "", "", "", ""],
+                            ["ML-02", "01/01/2025 10:00", "55.0", "", "", "", "", ""]]
+    assert table.to_frame()["EQ"].tolist() == pytest.approx([61.3, 55.0])
+
+
+def test_parse_times_falls_back_to_iso_then_day_first():
+    values = np.array(["01/02/2025 10:00", "2025-02-01T10:30", "1.2.2025 11:00", "", "later"], dtype=object)
+
+    parsed = pd.DatetimeIndex(parse_times(values))
+
+    assert parsed[:3].tolist() == [pd.Timestamp("2025-02-01 10:00"), pd.Timestamp("2025-02-01 10:30"),
+                                   pd.Timestamp("2025-02-01 11:00")]
+    assert parsed[3:].isna().all()
+
+
+def test_as_monitoring_table():
+    table = MonitoringTable.from_rows(AIR_ROWS, "air")
+
+    assert as_monitoring_table(table, "air") is table
+    assert as_monitoring_table(AIR_ROWS, "air").columns["CO"] == pytest.approx(table.columns["CO"])
+    assert as_monitoring_table(None, "air") is None
+    assert as_monitoring_table(AIR_ROWS[:1], "air") is None
+    assert as_monitoring_table(MonitoringTable.from_rows(AIR_ROWS[:1], "air"), "air") is None
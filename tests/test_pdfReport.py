@@ -0,0 +1,32 @@
+import pytest
+
+pytest.importorskip("reportlab")
+
+from reportlab.platypus import PageBreak  # noqa: E402
+from reportlab.platypus.tableofcontents import TableOfContents  # noqa: E402
+
+from monitoring.pdfReport import _PdfReportBuilder, _ReportDocTemplate, _styles  # noqa: E402
+
+
+def test_contents_settle_in_draft_passes_and_final_build_is_single_pass(tmp_path, monkeypatch):
+    output = tmp_path / "report.pdf"
+    styles = _styles()
+    doc = _ReportDocTemplate(str(output), {"report_number": "R-1"}, styles, "Monitoring Report")
+    builder = _PdfReportBuilder({}, styles, doc.width)
+    builder.add_contents()
+    for number in range(1, 4):
+        builder.story.append(PageBreak())
+        builder.story.append(builder._paragraph(f"{number} Section", "Heading1", "heading", 0))
+
+    passes = []
+    multi_build = _ReportDocTemplate.multiBuild
+    monkeypatch.setattr(_ReportDocTemplate, "multiBuild",
+                        lambda self, story, **kwargs: passes.append((self.draft, multi_build(self, story, **kwargs))))
+    doc.build_report(builder.story, str(output))
+
+    assert passes[-1] == (False, 1)
+    assert all(draft for draft, _ in passes[:-1])
+    assert output.read_bytes().startswith(b"%PDF")
+    contents = next(flowable for flowable in builder.story if type(flowable) is TableOfContents)
+    assert [(text, page) for _, text, page, _ in contents._lastEntries] == [
+        ("1 Section", 3), ("2 Section", 4), ("3 Section", 5)]
@@ -0,0 +1,50 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.reportBenchmark import (STAGE_FUNCTIONS, StageTimer, parse_case, run_case_isolated,
+                                        synthesize_project)
+
+
+def test_stage_functions_exist():
+    from monitoring import monitoringReport
+
+    assert [name for name in STAGE_FUNCTIONS.values() if not callable(getattr(monitoringReport, name, None))] == []
+
+
+def test_stage_timer_bills_exclusive_time():
+    module = SimpleNamespace()
+    module.inner = lambda: time.sleep(0.05)
+    module.outer = lambda: (time.sleep(0.05), module.inner())
+    original_inner = module.inner
+
+    timer = StageTimer(module, {"outer": "outer", "inner": "inner"})
+    module.outer()
+    timer.restore()
+
+    assert 0.04 < timer.totals["outer"] < 0.09
+    assert 0.04 < timer.totals["inner"] < 0.09
+    assert module.inner is original_inner
+
+
+def test_synthesized_project(tmp_path):
+    placeholders = synthesize_project(parse_case("3:4:2"), str(tmp_path))
+
+    assert len(placeholders["monitoring_locations"]) == 1 + 3
+    assert len(placeholders["air_monitoring_data"]) == len(placeholders["noise_monitoring_data"]) == 1 + 3 * 4
+    assert sorted(placeholders["monitoring_location_images"]) == ["ML-01", "ML-02"]
+    assert synthesize_project(parse_case("3:4:2"), str(tmp_path))["air_monitoring_data"] == \
+        placeholders["air_monitoring_data"]
+
+
+def test_run_case_reports_every_stage(monkeypatch):
+    from monitoring.monitoringReport import PROJECT_DIR
+
+    monkeypatch.chdir(PROJECT_DIR)
+    result = run_case_isolated(parse_case("1:2:1"), warm=False)
+
+    assert set(result["stages"]) == set(STAGE_FUNCTIONS) | {"other"}
+    assert result["table_rows"] == 4
+    assert result["report_bytes"] > 0
+    assert sum(result["stages"].values()) == pytest.approx(result["total_seconds"], abs=0.01)
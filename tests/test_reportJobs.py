@@ -0,0 +1,74 @@
+import copy
+import os
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from monitoring.reportJobs import ReportJobQueue, ReportQueueFull
+
+
+class PendingExecutor:
+    """Executor whose jobs stay queued until the test finishes them."""
+
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.futures.append(future)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+@pytest.fixture
+def pending_queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(ReportJobQueue, "_new_executor", lambda self: PendingExecutor())
+    return ReportJobQueue(str(tmp_path), max_workers=1, max_pending=2)
+
+
+def test_full_queue_rejects_new_jobs(pending_queue):
+    jobs = [pending_queue.submit({}) for _ in range(3)]
+
+    assert pending_queue.load() == (1, 2)
+    assert [pending_queue.position(job) for job in jobs] == [0, 1, 2]
+    with pytest.raises(ReportQueueFull, match="3 report"):
+        pending_queue.submit({})
+
+    # A finished job frees its slot
+    pending_queue._executor.futures[0].set_result({"id": jobs[0].id, "error": None, "seconds": 1.0})
+    assert pending_queue.progress(jobs[0]) == ("done", "✅ Report ready (1.0 s).")
+    assert pending_queue.progress(jobs[1])[0] == "running"
+    pending_queue.submit({})
+    assert pending_queue.load() == (1, 2)
+
+
+def test_failed_job_progress(pending_queue):
+    job = pending_queue.submit({})
+    pending_queue._executor.futures[0].set_exception(RuntimeError("worker lost"))
+
+    assert pending_queue.progress(job) == ("failed", "❌ Report generation failed: RuntimeError: worker lost")
+
+
+def test_broken_pool_is_restarted(tmp_path, monkeypatch):
+    from monitoring import monitoringReport
+
+    monkeypatch.setitem(monitoringReport.CONSTANTS, "cache_dir", str(tmp_path / "cache"))
+    queue = ReportJobQueue(str(tmp_path), max_workers=1)
+    try:
+        # A worker exiting mid-job (as when the OOM killer takes it) breaks the whole pool
+        broken = queue._executor
+        with pytest.raises(BrokenProcessPool):
+            broken.submit(os._exit, 1).result(timeout=60)
+
+        job = queue.submit(copy.deepcopy(monitoringReport.SAMPLE_PLACEHOLDERS))
+        result = job.future.result(timeout=90)
+
+        assert queue._executor is not broken
+        assert result["error"] is None
+        assert os.path.dirname(result["path"]) == os.path.join(os.path.realpath(queue.output_dir), job.id)
+        assert queue.progress(job)[0] == "done"
+    finally:
+        queue.shutdown()
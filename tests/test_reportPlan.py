@@ -0,0 +1,91 @@
+import json
+import os
+
+import pytest
+
+from monitoring.reportPlan import _compile_cached, get_report_plan, structure_section_names
+
+
+@pytest.fixture
+def sample_plan():
+    from monitoring.monitoringReport import CONSTANTS, PROJECT_DIR, SAMPLE_PLACEHOLDERS
+
+    return get_report_plan(CONSTANTS["structure_file"], SAMPLE_PLACEHOLDERS, CONSTANTS, base_dir=PROJECT_DIR)
+
+
+def section(plan, number):
+    return next(section for section in plan.sections if section.number == number)
+
+
+def test_sample_plan_numbering(sample_plan):
+    locations = section(sample_plan, "2.1")
+    assert locations.key == "monitoring_locations"
+    assert locations.table_numbers == ("2.1",)
+    # Map first, then one photo per location
+    assert [(image.figure_number, image.binding) for image in locations.images] == [
+        ("2.1", "monitoring_location_map"), ("2.2", "monitoring_location_images"),
+        ("2.3", "monitoring_location_images")]
+
+    air_charts = [chart for table in section(sample_plan, "4.4").tables for chart in table.charts]
+    assert [(chart.pollutant, chart.figure_number) for chart in air_charts] == [
+        ("CO", "4.2"), ("O3", "4.3"), ("NO2", "4.4"), ("SO2", "4.5"), ("PM2.5", "4.6"), ("PM10", "4.7")]
+
+    # Noise is charted as one Leq figure, after the two instrument photos of section 5
+    noise = section(sample_plan, "5.3")
+    assert noise.figure_numbers == ("5.3",)
+    assert noise.table_numbers == ("5.1",)
+    assert [(chart.pollutant, chart.figure_number) for table in noise.tables for chart in table.charts] == [
+        ("EQ", "5.3")]
+
+
+def write_structure(path, image):
+    structure = {"site": {"title": "Site", "text": "", "images": [{"path": image, "description": "Gate"}]},
+                 "equipment": {"title": "Equipment", "text": "", "image": "meter.png"}}
+    path.write_text(json.dumps(structure), encoding="utf-8")
+
+
+def figures(plan):
+    return [(image.figure_number, os.path.basename(image.path)) for section in plan.sections
+            for image in section.images]
+
+
+def test_image_added_after_compile_is_picked_up(tmp_path):
+    structure_file = tmp_path / "structure.json"
+    write_structure(structure_file, "gate.png")
+    (tmp_path / "meter.png").write_bytes(b"png")
+
+    def compile_plan():
+        return get_report_plan(str(structure_file), {}, {}, section_names=structure_section_names,
+                               base_dir=str(tmp_path))
+
+    assert figures(compile_plan()) == [("2.1", "meter.png")]
+
+    (tmp_path / "gate.png").write_bytes(b"png")
+    assert figures(compile_plan()) == [("1.1", "gate.png"), ("2.1", "meter.png")]
+
+    (tmp_path / "meter.png").unlink()
+    assert figures(compile_plan()) == [("1.1", "gate.png")]
+
+
+def test_plan_is_cached_per_parameters_and_layout(tmp_path):
+    from monitoring.monitoringReport import CONSTANTS, PROJECT_DIR, SAMPLE_PLACEHOLDERS
+
+    _compile_cached.cache_clear()
+
+    def compile_plan(**changes):
+        return get_report_plan(CONSTANTS["structure_file"], dict(SAMPLE_PLACEHOLDERS, **changes), CONSTANTS,
+                               base_dir=PROJECT_DIR)
+
+    plan = compile_plan()
+    assert compile_plan() is plan
+    assert _compile_cached.cache_info().hits == 1
+
+    air_only = compile_plan(report_parameters="Air")
+    assert air_only is not plan
+    assert air_only.parameters == ("Air",)
+
+    # One location photo fewer shifts the figures after it
+    one_image = dict(list(SAMPLE_PLACEHOLDERS["monitoring_location_images"].items())[:1])
+    locations = section(compile_plan(monitoring_location_images=one_image), "2.1")
+    assert [image.figure_number for image in locations.images] == ["2.1", "2.2"]
+    assert _compile_cached.cache_info().misses == 3
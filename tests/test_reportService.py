@@ -0,0 +1,97 @@
+import pytest
+
+from monitoring import reportService
+from monitoring.reportJobs import ReportJobQueue
+from monitoring.reportService import ReportService
+
+from tests.test_reportJobs import PendingExecutor
+
+
+class ShutDownExecutor(PendingExecutor):
+    def submit(self, fn, *args):
+        raise RuntimeError("cannot schedule new futures after shutdown")
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(ReportJobQueue, "_new_executor", lambda self: PendingExecutor())
+    queue = ReportJobQueue(str(tmp_path), max_workers=1, max_pending=1)
+    monkeypatch.setattr(reportService, "get_report_jobs", lambda constants, plan_keys: queue)
+    return ReportService({"output_dir": str(tmp_path)})
+
+
+def finish(service, job_id, **result):
+    service._lookup(job_id)[0].future.set_result(dict({"id": job_id, "error": None, "seconds": 2.0}, **result))
+
+
+@pytest.mark.parametrize("request_body, message", [
+    ([], "placeholders"),
+    ({"placeholders": "PR1"}, "placeholders"),
+    ({"placeholders": {}, "format": "odt"}, "Unknown format 'odt'"),
+    ({"placeholders": {}, "type": "unknown"}, "unknown"),
+])
+def test_submit_rejects_bad_requests(service, request_body, message):
+    status, body = service.submit(request_body)
+
+    assert status == 400
+    assert message in body["error"]
+
+
+def test_submit_queues_until_full(service):
+    status, body = service.submit({"placeholders": {}, "format": "pdf"})
+    assert status == 202
+    assert body["status_url"] == f"/reports/{body['id']}"
+    assert body["download_url"] == f"/reports/{body['id']}/download"
+
+    assert service.submit({"placeholders": {}})[0] == 202
+    status, body = service.submit({"placeholders": {}})
+    assert status == 429
+    assert "queue is full" in body["error"]
+    assert (service.metrics.submitted, service.metrics.rejected) == (2, 1)
+
+
+def test_submit_without_workers_is_unavailable(service):
+    service.queue._executor = ShutDownExecutor()
+
+    status, body = service.submit({"placeholders": {}})
+
+    assert status == 503
+    assert "RuntimeError" in body["error"]
+
+
+def test_status(service):
+    assert service.status("missing")[0] == 404
+
+    first = service.submit({"placeholders": {}, "format": "pdf"})[1]["id"]
+    second = service.submit({"placeholders": {}})[1]["id"]
+
+    status, body = service.status(second)
+    assert status == 200
+    assert (body["type"], body["format"], body["state"]) == ("monitoring", "docx", "queued")
+    assert service.status(first)[1]["state"] == "running"
+
+    finish(service, first, seconds=3.5)
+    assert service.status(first)[1] == {"id": first, "type": "monitoring", "format": "pdf", "state": "done",
+                                        "message": "✅ Report ready (3.5 s).", "seconds": 3.5, "error": None}
+    assert service.status(second)[1]["state"] == "running"
+
+
+def test_artifact(service, tmp_path):
+    assert service.artifact("missing")[:2] == (404, {"error": "Unknown report job 'missing'"})
+
+    job_id = service.submit({"placeholders": {}})[1]["id"]
+    status, body, path = service.artifact(job_id)
+    assert (status, path) == (409, None)
+    assert body == {"error": "Report is not ready (running)"}
+
+    report_path = str(tmp_path / "report.docx")
+    finish(service, job_id, path=report_path)
+    assert service.artifact(job_id) == (200, None, report_path)
+
+
+def test_failed_job_artifact_is_gone(service):
+    job_id = service.submit({"placeholders": {}})[1]["id"]
+    finish(service, job_id, error="ValueError: no data")
+
+    assert service.artifact(job_id) == (410, {"error": "ValueError: no data"}, None)
+    assert service.metrics.failed == 1
@@ -0,0 +1,54 @@
+import copy
+
+import docx
+import pytest
+
+from monitoring.reportTypes import get_report_type, report_type_labels, report_type_names
+
+
+def test_lookup_by_name_or_label():
+    assert report_type_names() == ["monitoring", "cesmp"]
+    assert report_type_labels() == ["Monitoring", "CESMP"]
+    assert get_report_type().name == "monitoring"
+    assert get_report_type(" Cesmp ").name == "cesmp"
+    with pytest.raises(ValueError, match="Available: monitoring, cesmp"):
+        get_report_type("audit")
+
+
+def test_titles_and_file_prefix():
+    monitoring = get_report_type("monitoring")
+
+    assert monitoring.report_title({"report_frequency": "Weekly"}) == "Weekly Environmental Monitoring Report"
+    assert monitoring.file_prefix({"report_frequency": "../weekly"}) == "Weekly_Monitoring_Report"
+    assert get_report_type("cesmp").file_prefix({"report_frequency": "Weekly"}) == "CESMP"
+
+
+def test_cesmp_plan_follows_its_structure():
+    from monitoring.monitoringReport import CONSTANTS, PROJECT_DIR, SAMPLE_PLACEHOLDERS
+    from monitoring.reportPlan import get_report_plan
+
+    cesmp = get_report_type("cesmp")
+    plan = get_report_plan(CONSTANTS[cesmp.structure_key], SAMPLE_PLACEHOLDERS, CONSTANTS, cesmp.section_names,
+                           PROJECT_DIR)
+
+    main_sections = [section.title for section in plan.sections if section.level == 1]
+    assert main_sections[:3] == ["1. Introduction", "2. Project Description", "3. Regulatory Standards"]
+    assert main_sections[-1] == "12. Appendices"
+    # The shared pipeline binds the same data tables, charts and location figures
+    bindings = {table.binding: (section.number, table.number) for section in plan.sections for table in section.tables
+                if table.binding}
+    assert bindings == {"air_monitoring_data": ("7.1", "7.1"), "noise_monitoring_data": ("7.2", "7.2"),
+                        "monitoring_locations": ("8.1", "8.2")}
+
+
+def test_generate_cesmp_report(tmp_path, monkeypatch):
+    from monitoring import monitoringReport
+
+    monkeypatch.setitem(monitoringReport.CONSTANTS, "cache_dir", str(tmp_path / "cache"))
+    path = monitoringReport.generate_report(copy.deepcopy(monitoringReport.SAMPLE_PLACEHOLDERS),
+                                            str(tmp_path / "cesmp.docx"), "cesmp")
+
+    headings = [paragraph.text for paragraph in docx.Document(path).paragraphs
+                if paragraph.style.name == "Heading 1"]
+    assert headings[:2] == ["1. Introduction", "2. Project Description"]
+    assert "12. Appendices" in headings
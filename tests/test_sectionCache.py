@@ -0,0 +1,91 @@
+import copy
+import dataclasses
+import hashlib
+
+import pytest
+
+from monitoring import monitoringReport
+from monitoring.docTemplate import body_end, dump_fragment, load_fragment
+from monitoring.monitoringReport import (SAMPLE_PLACEHOLDERS, emit_section, get_report_template, prepare_report,
+                                         section_fingerprint)
+from monitoring.templateEngine import compile_template, template_placeholders
+
+_EMBED = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
+
+
+@pytest.fixture(scope="module")
+def report():
+    return prepare_report(copy.deepcopy(SAMPLE_PLACEHOLDERS))
+
+
+def text_section(plan):
+    """The first section whose text references a placeholder."""
+    return next(section for section in plan.sections if template_placeholders(section.text))
+
+
+def test_fingerprint_is_stable(report):
+    plan, placeholders = report
+    section = text_section(plan)
+
+    assert section_fingerprint(section, placeholders) == section_fingerprint(section, dict(placeholders))
+    # Placeholders the section doesn't reference don't change its key
+    assert section_fingerprint(section, {**placeholders, "unused_placeholder": "x"}) == \
+        section_fingerprint(section, placeholders)
+
+
+def test_changing_one_placeholder_changes_the_key(report):
+    plan, placeholders = report
+    section = text_section(plan)
+    name = sorted(template_placeholders(section.text))[0]
+
+    assert section_fingerprint(section, {**placeholders, name: f"{placeholders.get(name)} (edited)"}) != \
+        section_fingerprint(section, placeholders)
+
+
+def test_changing_the_template_changes_the_key(report):
+    plan, placeholders = report
+    section = text_section(plan)
+    edited = dataclasses.replace(section, text=compile_template("Edited text for {project_name}."))
+
+    assert section_fingerprint(edited, placeholders) != section_fingerprint(section, placeholders)
+
+
+def test_changing_the_chart_style_changes_the_key(report, monkeypatch):
+    plan, placeholders = report
+    section = next(section for section in plan.sections if any(table.chart_type for table in section.tables))
+    key = section_fingerprint(section, placeholders)
+
+    monkeypatch.setattr(monitoringReport, "CHART_STYLE_VERSION", monitoringReport.CHART_STYLE_VERSION + 1)
+
+    assert section_fingerprint(section, placeholders) != key
+
+
+def normalised_body(doc):
+    """Body XML with each image relationship replaced by its image's hash (rIds are package-specific)."""
+    body = copy.deepcopy(doc.element.body)
+    for node in body.iter():
+        rel_id = node.get(_EMBED)
+        if rel_id:
+            node.set(_EMBED, hashlib.sha256(doc.part.related_parts[rel_id].blob).hexdigest())
+    return body.xml
+
+
+def test_restored_fragments_match_a_fresh_build(report):
+    plan, placeholders = report
+    template = get_report_template()
+
+    fresh = template.new_document()
+    restored = template.new_document()
+    for section in plan.sections:
+        emit_section(fresh, section, placeholders)
+        scratch = template.new_document()
+        start = body_end(scratch)
+        emit_section(scratch, section, placeholders)
+        load_fragment(restored, dump_fragment(scratch, start))
+
+    assert any(node.get(_EMBED) for node in fresh.element.body.iter())  # Charts and images are covered
+    assert normalised_body(restored) == normalised_body(fresh)
+    # Each image part is added once, however many sections place it
+    assert len(restored.inline_shapes) == len(fresh.inline_shapes)
+    assert {part.blob for part in restored.part.related_parts.values() if "image" in part.content_type} == \
+        {part.blob for part in fresh.part.related_parts.values() if "image" in part.content_type}
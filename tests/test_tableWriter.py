@@ -0,0 +1,49 @@
+from docx import Document
+
+from monitoring.tableWriter import ROW_CHUNK_SIZE, add_bulk_table
+
+
+def per_cell_table(rows, style="Table Grid"):
+    """The reference output: python-docx's own table built one `cell.text` at a time."""
+    doc = Document()
+    table = doc.add_table(rows=len(rows), cols=len(rows[0]))
+    table.style = style
+    for row, values in zip(table.rows, rows):  # table.cell() walks the whole grid on every call
+        for cell, text in zip(row.cells, values):
+            cell.text = text
+    return table
+
+
+def test_bulk_table_matches_per_cell_output():
+    rows = [["Location", "Time", "Note"],
+            ["ML-01", "01/01/2025 10:00", "tab\there"],
+            ["ML-02", "line one\nline two", "carriage\rreturn"],
+            ["  leading", "trailing  ", " both "],
+            ["&amp; <b>", "a < b > c", "\"quotes\" & 'apostrophes'"],
+            ["", "\t", "\n\n"],
+            ["short row"],
+            []]
+    rows += [[f"ML-{index:04d}", f"{index}.5", "x" * (index % 7)] for index in range(2 * ROW_CHUNK_SIZE + 37)]
+
+    bulk = add_bulk_table(Document(), iter(rows))
+
+    assert len(bulk.rows) == len(rows)
+    assert bulk._tbl.xml == per_cell_table(rows)._tbl.xml
+
+
+def test_transform_is_applied_to_every_cell():
+    table = add_bulk_table(Document(), [["Name", "Value"], ["{x}", "{x} and {y}"]],
+                           transform=lambda text: text.replace("{x}", "1").replace("{y}", "2"))
+
+    assert [[cell.text for cell in row.cells] for row in table.rows] == [["Name", "Value"], ["1", "1 and 2"]]
+
+
+def test_extra_cells_are_dropped_and_empty_input_adds_nothing(capsys):
+    doc = Document()
+
+    table = add_bulk_table(doc, [["A", "B"], ["1", "2", "3"]])
+
+    assert [cell.text for cell in table.rows[1].cells] == ["1", "2"]
+    assert "Extra cells dropped" in capsys.readouterr().out
+    assert add_bulk_table(doc, []) is None
+    assert len(doc.tables) == 1
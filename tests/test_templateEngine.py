@@ -0,0 +1,118 @@
+import re
+
+import pytest
+
+from monitoring.templateEngine import (FIGURE_NUMBER, FIGURE_RANGE, LITERAL, PLACEHOLDER, TABLE_NUMBER,
+                                       compile_template, render_template, render_text, reset_template_warnings,
+                                       template_placeholders)
+
+
+@pytest.fixture(autouse=True)
+def fresh_warnings():
+    reset_template_warnings()
+    yield
+    reset_template_warnings()
+
+
+def test_compile_segments():
+    template = compile_template("See Table {table_number}; Figures {figure_number} to {figure_number} "
+                                "and {figure_number} for {project_name}.")
+
+    assert template == ((LITERAL, "See Table "), (TABLE_NUMBER, None), (LITERAL, "; Figures "),
+                        (FIGURE_RANGE, None), (LITERAL, " and "), (FIGURE_NUMBER, None), (LITERAL, " for "),
+                        (PLACEHOLDER, "project_name"), (LITERAL, "."))
+    assert template_placeholders(template) == {"project_name"}
+
+
+def test_compile_plain_and_empty_text():
+    assert compile_template("No placeholders here.") == ((LITERAL, "No placeholders here."),)
+    assert compile_template("") == ()
+    assert compile_template("{not a placeholder} {1x}") == ((LITERAL, "{not a placeholder} {1x}"),)
+
+
+def test_substitution_is_single_pass():
+    # A value that looks like a placeholder is inserted as-is, never substituted again
+    text = render_text("{a} and {b}", {"a": "{b}", "b": "B"})
+
+    assert text == "{b} and B"
+
+
+def test_values_are_converted_to_text():
+    assert render_text("{count} readings", {"count": 12}) == "12 readings"
+
+
+def test_table_numbers_are_assigned_in_order_and_the_last_is_reused():
+    template = compile_template("Tables {table_number}, {table_number} and {table_number}")
+
+    assert render_template(template, {}, ["3.1", "3.2"]) == "Tables 3.1, 3.2 and 3.2"
+
+
+def test_figure_ranges_and_numbers():
+    template = compile_template("Figures {figure_number} to {figure_number} show the results.")
+    assert render_template(template, {}, figure_numbers=["4.1", "4.2", "4.3"]) == \
+        "Figures 4.1 to 4.3 show the results."
+    assert render_template(template, {}, figure_numbers=["4.1"]) == "Figures 4.1 show the results."
+
+    template = compile_template("Figure {figure_number} and Figure {figure_number}")
+    assert render_template(template, {}, figure_numbers=["5.1", "5.2"]) == "Figure 5.1 and Figure 5.2"
+
+
+def test_numbers_are_not_consumed_from_the_caller_lists():
+    numbers = ["2.1", "2.2"]
+    template = compile_template("{table_number} {figure_number}")
+
+    render_template(template, {}, numbers, numbers)
+
+    assert numbers == ["2.1", "2.2"]
+
+
+def test_numbering_is_left_for_a_later_stage_without_numbers():
+    text = "Table {table_number}, Figures {figure_number} to {figure_number}, Figure {figure_number}"
+
+    assert render_text(text, {}) == text
+
+
+def test_missing_numbers_keep_the_placeholder_with_a_warning(capsys):
+    assert render_text("Table {table_number}, Figure {figure_number}", {}, [], [], context="Results") == \
+        "Table {table_number}, Figure {figure_number}"
+
+    output = capsys.readouterr().out
+    assert "No table number available for section 'Results'" in output
+    assert "Not enough figure numbers" in output
+
+
+def test_unknown_placeholder_warns_once_per_report(capsys):
+    assert render_text("{missing} and {missing}", {}, context="Introduction") == "{missing} and {missing}"
+    render_text("{missing}", {}, context="Scope")
+
+    output = capsys.readouterr().out
+    assert output.count("Unknown placeholder '{missing}'") == 1
+    assert "section 'Introduction'" in output
+
+    reset_template_warnings()
+    render_text("{missing}", {})
+    assert "Unknown placeholder '{missing}'" in capsys.readouterr().out
+
+
+def test_table_and_figure_numbering_across_sections():
+    from monitoring.monitoringReport import CONSTANTS, PROJECT_DIR, SAMPLE_PLACEHOLDERS
+    from monitoring.reportPlan import get_report_plan
+
+    plan = get_report_plan(CONSTANTS["structure_file"], SAMPLE_PLACEHOLDERS, CONSTANTS, base_dir=PROJECT_DIR)
+
+    captions = {}
+    figures = {}
+    for section in plan.sections:
+        main = section.number.split(".")[0]
+        for table in section.tables:
+            caption = render_template(table.title, SAMPLE_PLACEHOLDERS, [table.number], context=section.title)
+            captions.setdefault(main, []).append(re.match(r"Table [\d.]+\d", caption).group())
+        for number in section.figure_numbers:
+            figures.setdefault(main, []).append(number)
+
+    # Numbers restart in each main section and run on across its subsections
+    assert captions and figures
+    for main, numbers in captions.items():
+        assert numbers == [f"Table {main}.{index}" for index in range(1, len(numbers) + 1)]
+    for main, numbers in figures.items():
+        assert numbers == [f"{main}.{index}" for index in range(1, len(numbers) + 1)]
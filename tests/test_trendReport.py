@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+import pytest
+from docx import Document
+
+from monitoring.dataStore import MonitoringStore
+from monitoring.exceedance import AirStandard, NoiseStandard
+from monitoring.trendReport import (decimate_minmax, generate_trend_report, period_statistics, rolling_mean,
+                                    trend_chart_specs)
+
+
+def long_readings(parameter, start, values, freq, location="ML-01"):
+    """Long readings frame as `load_trend_readings` returns it, for one location and parameter."""
+    timestamps = pd.date_range(start, periods=len(values), freq=freq)
+    return pd.DataFrame({
+        "location": pd.Categorical([location] * len(values)),
+        "parameter": pd.Categorical([parameter] * len(values)),
+        "timestamp": timestamps,
+        "value": np.asarray(values, dtype=np.float64),
+    })
+
+
+PM10_DAILY = {"air": {"PM10": AirStandard("PM10", "Daily", 340)}, "noise": {}}
+NOISE_LIMITS = {"air": {}, "noise": {"EQ": NoiseStandard("NCEC", "Industrial", 70, 45)}}
+
+
+def test_readings_above_the_limit_are_not_exceedances_when_the_daily_mean_is_below():
+    pm10 = np.full(96 * 3, 200.0)
+    pm10[::8] = 500.0  # Raw readings over the 340 daily limit; daily means stay around 238
+    statistics = period_statistics(long_readings("PM10", "2025-01-01", pm10, "15min"), "air", "monthly", [50],
+                                   PM10_DAILY)
+
+    assert statistics[["readings", "exceedances", "limit"]].values.tolist() == [[288, 0, 340.0]]
+
+
+def test_daily_means_above_the_limit_count_once_per_day():
+    pm10 = np.concatenate([np.full(96, 400.0), np.full(96, 100.0), np.full(96, 350.0)])
+    statistics = period_statistics(long_readings("PM10", "2025-01-30", pm10, "15min"), "air", "monthly", [50],
+                                   PM10_DAILY)
+
+    assert statistics["period"].astype(str).tolist() == ["2025-01", "2025-02"]
+    assert statistics["exceedances"].tolist() == [1, 1]
+
+
+def test_night_noise_is_checked_against_the_night_limit():
+    # 50 dB around the clock: below the 70 dB day limit, above the 45 dB night limit
+    readings = long_readings("EQ", "2025-01-01 07:00", np.full(48, 50.0), "1h")
+
+    statistics = period_statistics(readings, "noise", "monthly", [50], NOISE_LIMITS, day_hours=[7, 20])
+
+    assert statistics["exceedances"].tolist() == [2]  # The nights of 1 and 2 January
+    assert statistics["limit"].tolist() == [70.0]
+
+
+def test_parameters_without_a_standard_have_no_exceedances():
+    statistics = period_statistics(long_readings("CO", "2025-01-01", np.full(96, 1e6), "15min"), "air", "monthly",
+                                   [50], PM10_DAILY)
+
+    assert statistics["exceedances"].tolist() == [0]
+    assert np.isnan(statistics["limit"].iloc[0])
+
+
+def test_noise_means_are_energy_averages():
+    statistics = period_statistics(long_readings("EQ", "2025-01-01", [60.0, 70.0], "1h"), "noise", "monthly",
+                                   [50], NOISE_LIMITS)
+
+    assert statistics["mean"].iloc[0] == pytest.approx(10 * np.log10((10 ** 6 + 10 ** 7) / 2))  # Not 65
+    assert statistics["p50"].iloc[0] == pytest.approx(65.0)  # Percentiles are of the levels themselves
+    assert statistics["max"].iloc[0] == 70.0
+
+
+@pytest.mark.parametrize("period, expected", [
+    ("weekly", ["2024-12-30/2025-01-05", "2025-01-06/2025-01-12"]),
+    ("monthly", ["2024-12", "2025-01"]),
+    ("quarterly", ["2024Q4", "2025Q1"]),
+])
+def test_period_bucketing(period, expected):
+    readings = long_readings("CO", "2024-12-31", [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0], "1D")  # 31 Dec to 6 Jan
+
+    statistics = period_statistics(readings, "air", period, [50], PM10_DAILY)
+
+    assert [str(value) for value in statistics["period"]] == expected
+    assert statistics["readings"].sum() == 7
+
+
+def test_statistics_are_per_location_and_parameter():
+    readings = pd.concat([long_readings("CO", "2025-01-01", [1.0, 3.0], "1h", location="ML-01"),
+                          long_readings("CO", "2025-01-01", [5.0], "1h", location="ML-02")], ignore_index=True)
+    readings["location"] = readings["location"].astype("category")
+
+    statistics = period_statistics(readings, "air", "monthly", [50], PM10_DAILY)
+
+    assert statistics["location"].astype(str).tolist() == ["ML-01", "ML-02"]
+    assert statistics["mean"].tolist() == [2.0, 5.0]
+
+
+def test_decimate_minmax_keeps_every_bucket_extreme():
+    values = np.random.default_rng(7).normal(size=10_000)
+    values[1234] = 50.0
+    values[8765] = -50.0
+
+    keep = decimate_minmax(values, 200)
+
+    assert len(keep) <= 202  # 100 buckets x (min, max) plus the first and last points
+    assert np.all(np.diff(keep) > 0)  # In time order, no duplicates
+    assert {0, 1234, 8765, 9999} <= set(keep.tolist())
+    for bucket in np.array_split(np.arange(10_000), 100):
+        assert bucket[np.argmin(values[bucket])] in keep
+        assert bucket[np.argmax(values[bucket])] in keep
+
+
+def test_decimate_minmax_keeps_short_series_whole():
+    assert decimate_minmax(np.arange(10.0), 10).tolist() == list(range(10))
+
+
+def test_noise_rolling_mean_is_energy_average():
+    rolled = rolling_mean(pd.date_range("2025-01-01", periods=2, freq="1h").to_numpy(), np.array([60.0, 70.0]),
+                          "2h", "noise")
+
+    assert rolled == pytest.approx([60.0, 10 * np.log10((10 ** 6 + 10 ** 7) / 2)])
+
+
+def test_trend_chart_specs_are_decimated_with_the_standard():
+    readings = long_readings("PM10", "2025-01-01", np.arange(5000.0), "1min")
+    config = {"chart_parameters": {"air": ["PM10"]}, "rolling_window": "1h", "max_chart_points": 100}
+
+    specs = trend_chart_specs(readings, "air", "PR1", config, {"PM10": 340.0}, {"PM10": "Daily limit"})
+
+    assert len(specs) == 1
+    assert len(specs[0]["values"]) <= 102
+    assert (specs[0]["values"][0], specs[0]["values"][-1]) == (0.0, 4999.0)
+    assert (specs[0]["standard"], specs[0]["standard_label"]) == (340.0, "Daily limit")
+    assert trend_chart_specs(readings, "air", "PR1", {**config, "chart_parameters": {"air": ["CO"]}}, {}) == []
+
+
+def test_report_headings_and_captions_use_the_report_numbering(tmp_path):
+    store = MonitoringStore(str(tmp_path / "store.sqlite3"))
+    for kind, parameter, values in (("air", "PM10", [50.0, 60.0]), ("noise", "EQ", [50.0, 55.0])):
+        frame = pd.DataFrame({"location": "ML-01", "timestamp": pd.date_range("2025-01-01", periods=2, freq="1h"),
+                              parameter: values})
+        store.insert_readings("PR1", kind, frame)
+
+    path = generate_trend_report(["PR1"], report_path=str(tmp_path / "trend.docx"), store=store)
+
+    headings = [(paragraph.style.name, paragraph.text) for paragraph in Document(path).paragraphs
+                if paragraph.style.name.startswith("Heading")]
+    assert [text for style, text in headings if style in ("Heading 1", "Heading 2")] == [
+        "1. Trend Summary", "2. Air Quality Trends", "2.1. Project PR1", "3. Noise Quality Trends",
+        "3.1. Project PR1"]
+    captions = [text for style, text in headings if style in ("Heading 4", "Heading 5")]
+    assert captions[0] == "Table 1.1 - Data Coverage"
+    assert captions[1] == "Table 2.1 - Air Quality Monthly Statistics (PR1)"
+    assert captions[2] == "Figure 2.1 - Air Quality - ML-01 - PM10 Trend (PR1)"
+    assert "Table 3.1 - Noise Quality Monthly Statistics (PR1)" in captions
+    assert "Figure 3.1 - Noise Quality - ML-01 - EQ Trend (PR1)" in captions